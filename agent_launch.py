@@ -1,19 +1,24 @@
-from crewai import Crew
-
-from crew_agents.agents_and_task import (
-    inquisitive_information_analyst,
-    meeting_action_item_extractor,
-    meeting_email_composer,
-    meeting_orchestration_leader,
-    meeting_summary_specialist,
-    meeting_terminology_extractor,
-    task1,
-    task2,
+import queue
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterator, NamedTuple, Optional
+
+from crew_agents.checkpoints import (
+    checkpoint_key,
+    checkpoint_store,
+    task_config,
+    transcript_digest,
 )
-from scripts.utils import transcribe_gcs_video_with_cache
+
+# crewai, litellm and the Google Cloud SDKs take seconds to import, so they are
+# imported inside the functions that need them and the app can render its form
+# without them (see scripts/bench_import_time.py).
 
 
 def transcript_to_text(gcs_video_uri) -> str:
+    from scripts.utils import transcribe_gcs_video_with_cache
+
     full_transcript, _ = transcribe_gcs_video_with_cache(
         gcs_video_uri=gcs_video_uri,
         google_credentials_path="secrets/secret.json",
@@ -22,29 +27,568 @@ def transcript_to_text(gcs_video_uri) -> str:
     return full_transcript
 
 
-def crew_launch(meeting_transcript: str):
-    print("Instantiating MeetingMind Crew...")
+def submit_transcript_job(gcs_video_uri):
+    from scripts.utils import submit_gcs_video
+
+    return submit_gcs_video(
+        gcs_video_uri=gcs_video_uri,
+        google_credentials_path="secrets/secret.json",
+    )
+
+
+def transcript_stream(gcs_video_uri):
+    from scripts.utils import stream_transcribe_gcs_video
+
+    return stream_transcribe_gcs_video(
+        gcs_video_uri=gcs_video_uri,
+        google_credentials_path="secrets/secret.json",
+    )
 
-    # === Step 1: Initialize Crew ===
-    crew = Crew(
-        agents=[
-            meeting_summary_specialist,
-            meeting_action_item_extractor,
-            inquisitive_information_analyst,
-            meeting_terminology_extractor,
-            meeting_email_composer,
+
+def submit_local_transcript_job(video_path, bucket_name):
+    from scripts.utils import submit_local_video
+
+    return submit_local_video(
+        video_path=video_path,
+        bucket_name=bucket_name,
+        google_credentials_path="secrets/secret.json",
+    )
+
+
+def local_transcript_stream(video_path, bucket_name):
+    from scripts.utils import stream_transcribe_local_video
+
+    return stream_transcribe_local_video(
+        video_path=video_path,
+        bucket_name=bucket_name,
+        google_credentials_path="secrets/secret.json",
+    )
+
+
+def compact_transcript(meeting_transcript: str):
+    """
+    Strips fillers, false starts and repetitions before the transcript is
+    handed to crew_launch (see scripts.compaction); prints the token savings.
+    """
+    from crew_agents.agents_and_task import get_llm
+    from scripts.compaction import compact
+
+    compacted = compact(meeting_transcript, model=get_llm().model)
+    saved = compacted.tokens_before - compacted.tokens_after
+    print(
+        f"🧹 Compacted transcript: {compacted.tokens_before} → "
+        f"{compacted.tokens_after} tokens (-{saved / max(compacted.tokens_before, 1):.0%})"
+    )
+    return compacted
+
+
+SPECIALISTS = [
+    "meeting_summary_specialist",
+    "meeting_action_item_extractor",
+    "inquisitive_information_analyst",
+    "meeting_terminology_extractor",
+]
+
+# Per crew mode: the tasks producing the task1 meeting document, then the email task
+PIPELINES = {
+    "hierarchical": (["task1"], "task2"),
+    "map_reduce": ([], "email_task"),
+    "dag": (
+        [
+            "summary_task",
+            "action_items_task",
+            "clarification_task",
+            "glossary_task",
+            "consolidation_task",
         ],
-        tasks=[task1, task2],
-        manager_agent=meeting_orchestration_leader,
-        verbose=True,
+        "consolidated_email_task",
+    ),
+}
+CREW_MODES = tuple(PIPELINES)
+# Final task of each pipeline, plus the email_only one. In hierarchical mode
+# its agent (the orchestration leader) delegates the send, so these are known
+# by name rather than by their tools.
+EMAIL_TASKS = frozenset([final for _, final in PIPELINES.values()] + ["email_task"])
+
+# Section of the meeting report each task (or map_reduce stage) produces
+TASK_SECTIONS = {
+    "summary_task": "summary",
+    "action_items_task": "action_items",
+    "clarification_task": "clarifications",
+    "glossary_task": "glossary",
+    "task1": "meeting_document",
+    "consolidation_task": "meeting_document",
+    "map_reduce_summary": "meeting_document",
+    "task2": "email",
+    "email_task": "email",
+    "consolidated_email_task": "email",
+}
+
+# Headings of the task1 document, see its expected_output
+_DOCUMENT_SECTIONS = [
+    ("summary", re.compile(r"meeting summary", re.I)),
+    ("action_items", re.compile(r"action items", re.I)),
+    ("clarifications", re.compile(r"insights|clarifications", re.I)),
+    ("glossary", re.compile(r"glossary", re.I)),
+]
+_HEADING = re.compile(r"^\s*(#{1,6}\s+.+|(\d+\.\s*)?\*\*[^*]+\*\*:?\s*)$")
+
+
+class TaskUpdate(NamedTuple):
+    """One finished piece of a crew run, emitted as soon as it is available."""
+
+    task: str
+    section: str  # see TASK_SECTIONS
+    raw: str
+    from_checkpoint: bool = False
+
+
+OnTaskOutput = Optional[Callable[[TaskUpdate], None]]
+
+
+def _emit(on_task_output: OnTaskOutput, task: str, raw: str, from_checkpoint=False):
+    if on_task_output is not None:
+        on_task_output(TaskUpdate(task, TASK_SECTIONS[task], raw, from_checkpoint))
+
+
+def split_sections(document: str) -> Dict[str, str]:
+    """
+    Splits a task1 meeting document into the specialist sections of
+    TASK_SECTIONS (summary, action_items, clarifications, glossary), for modes
+    where no specialist runs as its own task.
+    """
+    sections: Dict[str, list] = {}
+    current = None
+    for line in document.splitlines():
+        if _HEADING.match(line):
+            current = next(
+                (name for name, pattern in _DOCUMENT_SECTIONS if pattern.search(line)),
+                None,
+            )
+            if current is not None:
+                sections.setdefault(current, [])
+            continue
+        if current is not None:
+            sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def _task_keys(
+    tasks, digest: str, extra_config: Optional[Dict[str, Dict]] = None
+) -> Dict[str, str]:
+    """
+    Checkpoint key per task name. Tasks depend on their explicit context, or
+    by default on every earlier synchronous task, as in crewai.
+    `extra_config` adds settings per task name that shape its output.
+    """
+    extra_config = extra_config or {}
+    keys = {}
+    for i, task in enumerate(tasks):
+        if isinstance(task.context, list):
+            upstream = task.context
+        else:
+            upstream = [t for t in tasks[:i] if not t.async_execution]
+        config = {**task_config(task), **extra_config.get(task.name, {})}
+        keys[task.name] = checkpoint_key(
+            digest, config, [keys[t.name] for t in upstream]
+        )
+    return keys
+
+
+# DAG tasks whose transcript input can be narrowed to mined candidates
+CANDIDATE_INPUTS = {
+    "action_items_task": "action_item_context",
+    "glossary_task": "term_context",
+}
+
+
+def candidate_inputs(meeting_transcript: str, enabled: bool = True) -> Dict[str, str]:
+    """
+    Values of {action_item_context} and {term_context}: the candidate
+    excerpts mined by crew_agents.candidates, or the full transcript when
+    `enabled` is False or nothing was mined for that task.
+    """
+    if not enabled:
+        return {name: meeting_transcript for name in CANDIDATE_INPUTS.values()}
+
+    from crew_agents.candidates import mine_candidates
+    from crew_agents.glossary import glossary_store
+
+    started = time.perf_counter()
+    mined = mine_candidates(meeting_transcript)
+    excerpts = {"action_item_context": mined.action_items, "term_context": mined.terms}
+    # Terms defined in past meetings need no search (see crew_agents.glossary)
+    known, _ = glossary_store.lookup_many(
+        (term for term, _ in mined.term_list), fuzzy=False
+    )
+    if known and excerpts["term_context"].strip():
+        definitions = "\n".join(
+            f"- **{match.query}**: {match.entry.definition}"
+            + (f" ({match.entry.sources[0]})" if match.entry.sources else "")
+            for match in known
+        )
+        excerpts["term_context"] = (
+            "Known terms, already defined in past meetings (do not search these):\n"
+            f"{definitions}\n\n{excerpts['term_context']}"
+        )
+    inputs = {}
+    for name, excerpt in excerpts.items():
+        if excerpt.strip():
+            inputs[name] = excerpt
+        else:
+            print(
+                f"⚠️ No {name.replace('_', ' ')} candidates, using the full transcript"
+            )
+            inputs[name] = meeting_transcript
+    print(
+        f"⛏️ Mined {mined.stats['action_item_sentences']} action item sentence(s) and "
+        f"{mined.stats['terms']} term(s) ({len(known)} known) "
+        f"in {time.perf_counter() - started:.2f}s: "
+        f"{len(meeting_transcript)} → {len(inputs['action_item_context'])} / "
+        f"{len(inputs['term_context'])} chars"
+    )
+    return inputs
+
+
+def _harvest_glossary(meeting_transcript: str, sections: Dict[str, str]) -> None:
+    """Adds the terms defined in a run's glossary to crew_agents.glossary."""
+    from crew_agents.glossary import glossary_store
+
+    glossary = sections.get("glossary")
+    if glossary is None and "meeting_document" in sections:
+        glossary = split_sections(sections["meeting_document"]).get("glossary")
+    if not glossary:
+        return
+    try:
+        added = glossary_store.harvest(
+            glossary, meeting=transcript_digest(meeting_transcript)
+        )
+    except Exception as e:
+        print(f"⚠️ Could not update the glossary: {e}")
+        return
+    print(f"📚 Glossary: {added} new term(s), {len(glossary_store)} known")
+
+
+def _attach_transcript_search(agents, tasks, meeting_transcript: str) -> None:
+    """Gives `agents` a search tool over this meeting's transcript index."""
+    from crew_agents.retrieval import build_index
+    from crew_tools.transcript_search import TranscriptSearchTool
+
+    started = time.perf_counter()
+    index = build_index(meeting_transcript)
+    print(
+        f"🔎 Indexed {len(index.chunks)} transcript chunk(s) "
+        f"in {time.perf_counter() - started:.2f}s"
     )
+    tool = TranscriptSearchTool(index=index)
+    for agent in agents:
+        agent.tools = [*agent.tools, tool]
+    for task in tasks:
+        # crewai copies the agent's tools into the task when it is created
+        if task.tools and any(task.agent is agent for agent in agents):
+            task.tools = [*task.tools, tool]
+
+
+def _email_sent(recorder) -> bool:
+    """Whether the email tool delivered an email during this run."""
+    from crew_tools.email import EMAIL_SENT, email_tool
+
+    return EMAIL_SENT in recorder.tool_outputs(email_tool.name)
 
-    inputs = {
-        "meeting_transcript": meeting_transcript,
-    }
 
-    # === Step 3: Kick Off the Crew ===
+def _run_crew(
+    tasks,
+    keys: Dict[str, str],
+    inputs: Dict,
+    resume: bool = False,
+    on_task_output: OnTaskOutput = None,
+    recorder=None,
+    **crew_kwargs,
+):
+    """
+    Kicks off a crew over `tasks` and checkpoints the output of every task
+    that finished, even when a later task fails. With `resume`, tasks with a
+    checkpoint are not run; their stored output is handed to downstream tasks
+    as context. Every task output is passed to `on_task_output` as soon as the
+    task completes. An email task (EMAIL_TASKS) is only checkpointed once
+    `recorder` saw the email tool deliver, whichever agent called it, so
+    resuming after a failed send sends it again.
+    """
+    from crewai import Crew
+    from crewai.crews.crew_output import CrewOutput
+    from crewai.tasks.task_output import TaskOutput
+
+    pending = []
+    for task in tasks:
+        raw = checkpoint_store.get(keys[task.name]) if resume else None
+        if raw is None:
+            pending.append(task)
+        else:
+            print(f"⏭️ Reusing checkpoint for {task.agent.role.strip()}")
+            task.output = TaskOutput(
+                description=task.description, raw=raw, agent=task.agent.role.strip()
+            )
+            _emit(on_task_output, task.name, raw, from_checkpoint=True)
+    if not pending:
+        return CrewOutput(
+            raw=tasks[-1].output.raw, tasks_output=[task.output for task in tasks]
+        )
+
+    for task in pending:
+        # Tasks are fresh per run (crew_agents.factory), so this never leaks
+        task.callback = lambda output, name=task.name: _emit(
+            on_task_output, name, output.raw
+        )
+
+    print("Instantiating MeetingMind Crew...")
+    crew = Crew(tasks=pending, verbose=True, **crew_kwargs)
+
     print("Launching Crew with inputs...")
-    result = crew.kickoff(inputs=inputs)
+    try:
+        return crew.kickoff(inputs=inputs)
+    finally:
+        for task in pending:
+            if task.output is None:
+                continue
+            if (
+                recorder is not None
+                and task.name in EMAIL_TASKS
+                and not _email_sent(recorder)
+            ):
+                print("⚠️ Meeting email was not sent, rerun with resume to retry")
+                continue
+            checkpoint_store.put(
+                keys[task.name], task.output.raw, task.agent.role.strip()
+            )
+
+
+def crew_launch(
+    meeting_transcript: str,
+    mode: str = "hierarchical",
+    resume: bool = False,
+    email_only: bool = False,
+    with_report: bool = False,
+    on_task_output: OnTaskOutput = None,
+    transcript_search: bool = False,
+    candidate_context: bool = True,
+):
+    """
+    Runs the MeetingMind crew on a transcript.
+    - hierarchical: the orchestration leader delegates to every specialist over
+      the full transcript, then composes the email.
+    - map_reduce: the task1 document is built by crew_agents.map_reduce from
+      concurrent per-chunk extractions, and only the email task runs as a crew.
+    - dag: the four specialists run concurrently on the transcript, one
+      consolidation task merges their outputs into the task1 document, then the
+      email is composed. No manager round trips.
+    Every task output is checkpointed (see crew_agents.checkpoints). With
+    `resume`, tasks whose checkpoint is still valid are skipped, so e.g. a
+    failed send only recomposes the email. `email_only` regenerates just the
+    email from the checkpointed meeting document.
+    Each call runs on its own agents and tasks from crew_agents.factory, so
+    concurrent calls are safe; at most crew_pool.size run at once.
+    Every run is instrumented (see crew_agents.instrumentation); with
+    `with_report` the call returns `(result, run_report)`, whose `email_sent`
+    tells whether the meeting email was delivered. Totals over all runs
+    are exported by `crew_agents.instrumentation.metrics.to_prometheus()`.
+    `on_task_output` receives a TaskUpdate per finished task (and for reused
+    checkpoints) while the run is still going; see crew_launch_stream.
+    With `transcript_search`, the specialists also get a retrieval tool over
+    the transcript (see crew_agents.retrieval) to look up passages on demand.
+    In dag mode the action item and terminology specialists read only the
+    candidate passages mined by crew_agents.candidates; `candidate_context=False`
+    gives them the full transcript instead.
+    Terms defined by the run are added to the cross-meeting glossary
+    (crew_agents.glossary), so later meetings only search for unknown terms.
+    """
+    if mode not in CREW_MODES:
+        raise ValueError(f"Unknown crew mode {mode!r}, expected one of {CREW_MODES}")
+
+    from crew_agents.instrumentation import RunRecorder
+
+    recorder = RunRecorder(mode)
+    sections: Dict[str, str] = {}
+    email_checkpointed = []
+
+    def collect(update: TaskUpdate) -> None:
+        sections[update.section] = update.raw
+        if update.section == "email" and update.from_checkpoint:
+            email_checkpointed.append(update.task)
+        if on_task_output is not None:
+            on_task_output(update)
+
+    status = "failed"
+    try:
+        result = _crew_launch(
+            meeting_transcript,
+            mode,
+            resume,
+            email_only,
+            recorder,
+            collect,
+            transcript_search,
+            candidate_context,
+        )
+        status = "completed"
+    finally:
+        report = recorder.finish(status)
+        # Email checkpoints only exist for emails that were delivered
+        report["email_sent"] = bool(email_checkpointed) or _email_sent(recorder)
+        # Also after a failed send: the glossary itself was produced
+        _harvest_glossary(meeting_transcript, sections)
+    return (result, report) if with_report else result
+
+
+def _crew_launch(
+    meeting_transcript: str,
+    mode: str,
+    resume: bool,
+    email_only: bool,
+    recorder,
+    on_task_output: OnTaskOutput,
+    transcript_search: bool,
+    candidate_context: bool,
+):
+    from crewai.crews.crew_output import CrewOutput
+
+    from crew_agents.agents_and_task import get_llm
+    from crew_agents.factory import crew_pool
+    from crew_agents.map_reduce import map_reduce_config, map_reduce_summary
+
+    llm = get_llm()
+    waiting_since = time.perf_counter()
+    with crew_pool.acquire() as meeting_crew:
+        recorder.queue_seconds = time.perf_counter() - waiting_since
+        agents, all_tasks = meeting_crew.agents, meeting_crew.tasks
+        recorder.attach(agents.values(), all_tasks.values())
+        if transcript_search and mode != "map_reduce":
+            # Before the checkpoint keys, which cover each task's tools; also
+            # for email_only, whose summary key must match the full run's
+            _attach_transcript_search(
+                [agents[name] for name in SPECIALISTS],
+                all_tasks.values(),
+                meeting_transcript,
+            )
+        summary_names, final_name = PIPELINES[mode]
+        summary_name = summary_names[-1] if summary_names else "map_reduce_summary"
+        tasks = [all_tasks[name] for name in summary_names + [final_name]]
+        email_task = all_tasks["email_task"]
+
+        inputs = {"meeting_transcript": meeting_transcript}
+        extra_config = {}
+        if mode == "dag":
+            # Also for email_only: the markers below are part of the summary key
+            inputs.update(candidate_inputs(meeting_transcript, candidate_context))
+            extra_config = {
+                task_name: {"input": "candidates"}
+                for task_name, name in CANDIDATE_INPUTS.items()
+                if inputs[name] != meeting_transcript
+            }
+
+        digest = transcript_digest(meeting_transcript)
+        keys = _task_keys(tasks, digest, extra_config)
+        if mode == "map_reduce":
+            summary_key = checkpoint_key(digest, map_reduce_config(llm))
+            keys[final_name] = checkpoint_key(
+                digest, task_config(tasks[-1]), [summary_key]
+            )
+        else:
+            summary_key = keys[summary_names[-1]]
+        email_keys = {
+            "email_task": checkpoint_key(digest, task_config(email_task), [summary_key])
+        }
+
+        if resume or email_only:
+            meeting_summary = checkpoint_store.get(summary_key)
+            if meeting_summary is None and email_only:
+                raise ValueError(
+                    "No checkpointed meeting summary for this transcript, run the full crew first"
+                )
+            if meeting_summary is not None:
+                if not email_only:
+                    for key in (keys[final_name], email_keys["email_task"]):
+                        raw = checkpoint_store.get(key)
+                        if raw is not None:
+                            print(
+                                "✅ Meeting email already completed, nothing to resume"
+                            )
+                            _emit(on_task_output, summary_name, meeting_summary, True)
+                            _emit(on_task_output, final_name, raw, True)
+                            return CrewOutput(raw=raw)
+
+                print("⏭️ Reusing checkpointed meeting summary...")
+                _emit(on_task_output, summary_name, meeting_summary, True)
+                return _run_crew(
+                    [email_task],
+                    email_keys,
+                    {"meeting_summary": meeting_summary},
+                    on_task_output=on_task_output,
+                    recorder=recorder,
+                    agents=[agents["meeting_email_composer"]],
+                )
+
+        if mode == "map_reduce":
+            meeting_summary = map_reduce_summary(
+                meeting_transcript, llm, recorder=recorder
+            )
+            checkpoint_store.put(summary_key, meeting_summary, "map_reduce_summary")
+            _emit(on_task_output, summary_name, meeting_summary)
+            return _run_crew(
+                tasks,
+                keys,
+                {"meeting_summary": meeting_summary},
+                on_task_output=on_task_output,
+                recorder=recorder,
+                agents=[agents["meeting_email_composer"]],
+            )
+
+        run_agents = [agents[name] for name in SPECIALISTS + ["meeting_email_composer"]]
+
+        if mode == "dag":
+            return _run_crew(
+                tasks,
+                keys,
+                inputs,
+                resume=resume,
+                on_task_output=on_task_output,
+                recorder=recorder,
+                agents=run_agents,
+            )
+
+        return _run_crew(
+            tasks,
+            keys,
+            inputs,
+            on_task_output=on_task_output,
+            recorder=recorder,
+            agents=run_agents,
+            manager_agent=agents["meeting_orchestration_leader"],
+        )
+
+
+def crew_launch_stream(meeting_transcript: str, **kwargs) -> Iterator[TaskUpdate]:
+    """
+    Runs crew_launch on a background thread and yields its TaskUpdates as
+    they arrive, so callers like the Streamlit app can render each section
+    while later tasks are still running. Errors of the run are re-raised once
+    the finished updates have been yielded.
+    """
+    updates: "queue.Queue[Optional[TaskUpdate]]" = queue.Queue()
+    failure = []
+
+    def run():
+        try:
+            crew_launch(meeting_transcript, on_task_output=updates.put, **kwargs)
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            updates.put(None)
 
-    return result
+    threading.Thread(target=run, name="crew-launch", daemon=True).start()
+    while True:
+        update = updates.get()
+        if update is None:
+            break
+        yield update
+    if failure:
+        raise failure[0]
@@ -1,12 +1,30 @@
 import os
 import tempfile
+import time
 
 import streamlit as st
 
-from agent_launch import crew_launch, transcript_to_text
-from scripts.utils import upload_to_gcs  # assumes this exists and works
+from agent_launch import (
+    CREW_MODES,
+    compact_transcript,
+    crew_launch_stream,
+    local_transcript_stream,
+    split_sections,
+    submit_local_transcript_job,
+    submit_transcript_job,
+    transcript_stream,
+)
 
 st.set_page_config(page_title="MeetingMind Crew", layout="wide")
+
+# Report sections in display order, keyed like agent_launch.TASK_SECTIONS
+SECTION_TITLES = {
+    "summary": "📝 Meeting Summary",
+    "action_items": "✅ Action Items",
+    "clarifications": "💡 Insights and Clarifications",
+    "glossary": "📚 Glossary of Terms",
+    "email": "✉️ Email Preview",
+}
 st.title("🤖📋 MeetingMind AI Assistant")
 
 st.markdown(
@@ -26,9 +44,91 @@ uploaded_file = st.file_uploader(
     "Or upload a local video", type=["mp4", "mov", "mkv"], label_visibility="visible"
 )
 
+live_transcript = st.checkbox("Show live transcript while transcribing", value=True)
+archive_video = st.checkbox("Archive uploaded video to GCS", value=False)
+crew_mode = st.selectbox(
+    "Crew mode",
+    CREW_MODES,
+    help="map_reduce summarizes transcript chunks in parallel; faster for long meetings.",
+)
+resume_crew = st.checkbox(
+    "Reuse checkpointed task results",
+    value=True,
+    help="Skip crew tasks already completed for this transcript, e.g. after a failed send.",
+)
+email_only = st.checkbox("Only regenerate the meeting email", value=False)
+transcript_search = st.checkbox(
+    "Let specialists search the transcript",
+    value=False,
+    help="Adds a retrieval tool over transcript passages to the specialist agents.",
+)
+candidate_context = st.checkbox(
+    "Pre-select action item and term passages",
+    value=True,
+    help="In dag mode, the action item and terminology specialists read only "
+    "rule-based candidate passages instead of the full transcript.",
+)
+compact = st.checkbox(
+    "Compact transcript before analysis",
+    value=True,
+    help="Removes fillers, false starts and repeated words to cut prompt tokens.",
+)
 
 start_button = st.button("🚀 Start Meeting Analysis")
 
+
+def analyze(transcript: str) -> None:
+    """Compacts the transcript and renders each report section as its task finishes."""
+    with st.spinner("🔄 Analyzing meeting..."):
+        st.text_area("📄 Transcript Preview", transcript, height=200)
+
+        if compact:
+            compacted = compact_transcript(transcript)
+            st.caption(
+                f"🧹 Compacted transcript: {compacted.tokens_before} → "
+                f"{compacted.tokens_after} tokens, removed {compacted.removed}"
+            )
+            transcript = compacted.text
+
+        # Step 2: Launch Crew, rendering each section as soon as its task is done
+        st.info("Running CrewAI agents...")
+        placeholders = {}
+        for section, title in SECTION_TITLES.items():
+            st.subheader(title)
+            placeholders[section] = st.empty()
+            placeholders[section].caption("⏳ Waiting for the crew...")
+        document_expander = st.expander("📄 Full meeting document", expanded=False)
+        document_preview = document_expander.empty()
+
+        rendered = set()
+        updates = crew_launch_stream(
+            transcript,
+            mode=crew_mode,
+            resume=resume_crew,
+            email_only=email_only,
+            transcript_search=transcript_search,
+            candidate_context=candidate_context,
+        )
+        for update in updates:
+            if update.section == "meeting_document":
+                document_preview.markdown(update.raw)
+                # Modes without per-specialist tasks only produce the whole document
+                for section, text in split_sections(update.raw).items():
+                    if section not in rendered and text:
+                        placeholders[section].markdown(text)
+                        rendered.add(section)
+            else:
+                placeholders[update.section].markdown(update.raw)
+                rendered.add(update.section)
+
+        for section in SECTION_TITLES:
+            if section not in rendered:
+                placeholders[section].caption("Not produced in this run.")
+
+    # --- Output ---
+    st.success("✅ Crew execution completed!")
+
+
 # --- Processing ---
 if start_button:
 
@@ -36,33 +136,68 @@ if start_button:
         st.error("❌ Please provide either a GCS URI or upload a video file.")
         st.stop()
 
+    transcript = None
     with st.spinner("🔄 Processing input..."):
 
-        # If local file uploaded, upload to GCS first
+        # Local uploads are transcribed on this host; only the audio goes to GCS
         if uploaded_file:
             tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
             tmp_file.write(uploaded_file.read())
             tmp_file.flush()
 
             bucket_name = "tes-cloudera"
-            blob_name = f"video/{os.path.basename(tmp_file.name)}"
 
-            st.info("Uploading video to GCS...")
-            gcs_uri = upload_to_gcs(tmp_file.name, bucket_name, blob_name)
-            st.success(f"✅ Uploaded to GCS: `{gcs_uri}`")
+            if archive_video:
+                from scripts.utils import archive_video_async
+
+                blob_name = f"video/{os.path.basename(tmp_file.name)}"
+                archive_video_async(tmp_file.name, bucket_name, blob_name)
+                st.info(f"Archiving video to `gs://{bucket_name}/{blob_name}`...")
 
         # Step 1: Transcribe
         st.info("Transcribing video...")
-        transcript = transcript_to_text(gcs_uri)
-
-        st.text_area("📄 Transcript Preview", transcript, height=200)
-
-        # Step 2: Launch Crew
-        st.info("Running CrewAI agents...")
-        result = crew_launch(transcript)
-
-    # --- Output ---
-    st.success("✅ Crew execution completed!")
+        if live_transcript:
+            live_preview = st.empty()
+            final_segments = []
+            segments = (
+                local_transcript_stream(tmp_file.name, bucket_name)
+                if uploaded_file
+                else transcript_stream(gcs_uri)
+            )
+            for segment in segments:
+                if segment.is_final:
+                    final_segments.append(segment.text)
+                    live_preview.markdown(" ".join(final_segments))
+                else:
+                    live_preview.markdown(
+                        " ".join(final_segments + [f"_{segment.text}_"])
+                    )
+            live_preview.empty()
+            transcript = " ".join(final_segments)
+        else:
+            # Checked on every rerun below instead of blocking this session
+            st.session_state["transcription_job"] = (
+                submit_local_transcript_job(tmp_file.name, bucket_name)
+                if uploaded_file
+                else submit_transcript_job(gcs_uri)
+            )
+
+    if transcript is not None:
+        analyze(transcript)
+
+# A submitted transcription job is polled across reruns until it finishes
+job = st.session_state.get("transcription_job")
+if job is not None:
+    if not job.done:
+        stage = "Preparing audio" if job.operation_name is None else "Recognition"
+        st.info(f"⏳ {stage} running for {time.time() - job.submitted_at:.0f}s...")
+        time.sleep(2)
+        st.rerun()
+    del st.session_state["transcription_job"]
+    if job.status != "done":
+        st.error(f"❌ Transcription failed: {job.error}")
+        st.stop()
+    analyze(job.result.text)
 
 
 if __name__ == "__main__":
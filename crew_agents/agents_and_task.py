@@ -1,23 +1,80 @@
+import importlib
 import os
+import threading
 from textwrap import dedent
+from typing import NamedTuple, Tuple
 
-import litellm
-from crewai import LLM, Agent, Task
+# The LLM client and tool instances are shared by every crew. Agents and tasks
+# hold per-run state, so they are only described here (as immutable specs) and
+# built fresh for each run by crew_agents.factory.
+# The LLM and tools pull in crewai/litellm and read credentials, so they are
+# created on first use; importing the specs stays cheap.
 
-from crew_tools.email import email_tool
-from crew_tools.employee import employee_tool
-from crew_tools.web_search import search_tool
+_llm = None
+_llm_lock = threading.Lock()
 
-litellm.set_verbose = False
+# Tool instances by name, as (module, attribute), imported on first use
+TOOLS = {
+    "email": ("crew_tools.email", "email_tool"),
+    "employee": ("crew_tools.employee", "employee_tool"),
+    "glossary": ("crew_tools.glossary", "glossary_tool"),
+    "search": ("crew_tools.web_search", "search_tool"),
+}
+# Tools backed by the cross-meeting glossary, and the field that takes the
+# store; crew_tools does not import crew_agents, so it is passed in here
+GLOSSARY_TOOLS = {"glossary": "store", "search": "glossary"}
 
 
-llm = LLM(
-    model="gemini/gemini-2.5-flash",
-    api_key=os.environ["GEMINI_API_KEY"],
-    temperature=0.1,
-)
+def get_llm():
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                import litellm
+
+                from crew_agents.llm_cache import CachedLLM
+
+                litellm.set_verbose = False
+
+                # Identical prompts (e.g. reruns of the same meeting) are answered from disk;
+                # model requests are rate limited and optionally hedged (see llm_cache)
+                _llm = CachedLLM(
+                    model="gemini/gemini-2.5-flash",
+                    api_key=os.environ["GEMINI_API_KEY"],
+                    temperature=0.1,
+                )
+    return _llm
+
+
+def get_tool(name: str):
+    module, attribute = TOOLS[name]
+    tool = getattr(importlib.import_module(module), attribute)
+    field = GLOSSARY_TOOLS.get(name)
+    if field is not None and getattr(tool, field) is None:
+        from crew_agents.glossary import glossary_store
+
+        setattr(tool, field, glossary_store)
+    return tool
 
-meeting_summary_specialist = Agent(
+
+class AgentSpec(NamedTuple):
+    role: str
+    backstory: str
+    goal: str
+    tools: Tuple[str, ...] = ()  # keys of TOOLS
+    allow_delegation: bool = False
+
+
+class TaskSpec(NamedTuple):
+    description: str
+    expected_output: str
+    agent: str  # key of AGENT_SPECS
+    async_execution: bool = False
+    # Keys of TASK_SPECS; empty means crewai's default (earlier task outputs)
+    context: Tuple[str, ...] = ()
+
+
+meeting_summary_specialist = AgentSpec(
     role=dedent(
         (
             """
@@ -42,15 +99,9 @@ meeting_summary_specialist = Agent(
         """
         )
     ),
-    tools=[],
-    allow_delegation=False,
-    max_iter=2,
-    max_retry_limit=3,
-    llm=llm,
-    verbose=True,
 )
 
-meeting_action_item_extractor = Agent(
+meeting_action_item_extractor = AgentSpec(
     role=dedent(
         (
             """
@@ -75,15 +126,10 @@ meeting_action_item_extractor = Agent(
         """
         )
     ),
-    tools=[employee_tool],
-    allow_delegation=False,
-    max_iter=2,
-    max_retry_limit=3,
-    llm=llm,
-    verbose=True,
+    tools=("employee",),
 )
 
-inquisitive_information_analyst = Agent(
+inquisitive_information_analyst = AgentSpec(
     role=dedent(
         (
             """
@@ -107,15 +153,10 @@ inquisitive_information_analyst = Agent(
         """
         )
     ),
-    tools=[search_tool],
-    allow_delegation=False,
-    max_iter=2,
-    max_retry_limit=3,
-    llm=llm,
-    verbose=True,
+    tools=("glossary", "search"),
 )
 
-meeting_terminology_extractor = Agent(
+meeting_terminology_extractor = AgentSpec(
     role=dedent(
         (
             """
@@ -139,15 +180,10 @@ meeting_terminology_extractor = Agent(
         """
         )
     ),  # This is the goal that the agent is trying to achieve
-    tools=[search_tool],
-    allow_delegation=False,
-    max_iter=2,
-    max_retry_limit=3,
-    llm=llm,
-    verbose=True,
+    tools=("glossary", "search"),
 )
 
-meeting_email_composer = Agent(
+meeting_email_composer = AgentSpec(
     role=dedent(
         (
             """
@@ -173,15 +209,10 @@ meeting_email_composer = Agent(
         """
         )
     ),
-    tools=[email_tool],
-    allow_delegation=False,
-    max_iter=2,
-    max_retry_limit=3,
-    llm=llm,
-    verbose=True,
+    tools=("email",),
 )
 
-meeting_orchestration_leader = Agent(
+meeting_orchestration_leader = AgentSpec(
     role=dedent(
         (
             """
@@ -205,15 +236,10 @@ meeting_orchestration_leader = Agent(
         """
         )
     ),
-    tools=[],
     allow_delegation=True,
-    max_iter=2,
-    max_retry_limit=3,
-    llm=llm,
-    verbose=True,
 )
 
-task1 = Task(
+task1 = TaskSpec(
     description=dedent(
         (
             """
@@ -254,10 +280,10 @@ task1 = Task(
         """
         )
     ),
-    agent=meeting_orchestration_leader,
+    agent="meeting_orchestration_leader",
 )
 
-task2 = Task(
+task2 = TaskSpec(
     description=dedent(
         (
             """
@@ -297,5 +323,177 @@ task2 = Task(
         """
         )
     ),
-    agent=meeting_orchestration_leader,
+    agent="meeting_orchestration_leader",
+)
+
+email_task = TaskSpec(
+    description=dedent(
+        (
+            """
+        Using the structured meeting summary below (available as {meeting_summary}),
+        compose a polished, professional meeting recap email and send it with the Email Tool.
+
+        The summary contains:
+        1. Meeting Title
+        2. Date and Attendance
+        3. Meeting Summary
+        4. Key Takeaways
+        5. Action Items
+        6. Insights and Clarifications (MeetingMind Notes)
+        7. Glossary of Terms
+        8. Helpful Links
+
+        The email should:
+        - Use a professional tone and formatting (in HTML)
+        - Follow a well-structured layout with clearly labeled sections
+        - Be complete and ready for sending through the Email Tool
+        - Avoid duplicate sending attempts
+        """
+        )
+    ),
+    expected_output=task2.expected_output,
+    agent="meeting_email_composer",
+)
+
+# DAG mode: the four specialists work on the transcript concurrently and a single
+# consolidation step merges their outputs, instead of one manager delegating
+# to them in turn.
+summary_task = TaskSpec(
+    description=dedent(
+        (
+            """
+        Given Raw meeting transcript in plain text format (available as {meeting_transcript}),
+        summarize the meeting: main discussion points, decisions, and a general overview.
+        Also note the meeting title, date and attendees if they are mentioned.
+        """
+        )
+    ),
+    expected_output=dedent(
+        (
+            """
+        Markdown with a meeting title, date and attendance, a concise meeting summary
+        and a bulleted list of key takeaways.
+        """
+        )
+    ),
+    agent="meeting_summary_specialist",
+    async_execution=True,
+)
+
+action_items_task = TaskSpec(
+    description=dedent(
+        (
+            """
+        Given the parts of the meeting transcript that mention commitments, owners and
+        deadlines (available as {action_item_context}; "[...]" marks skipped parts),
+        extract every clearly stated and inferred action item with its assignee and deadline.
+        Look up assignees with the employee tool where it helps identify them.
+        """
+        )
+    ),
+    expected_output=dedent(
+        (
+            """
+        A markdown list of action items, each with owner (and email if known), task and deadline.
+        """
+        )
+    ),
+    agent="meeting_action_item_extractor",
+    async_execution=True,
 )
+
+clarification_task = TaskSpec(
+    description=dedent(
+        (
+            """
+        Given Raw meeting transcript in plain text format (available as {meeting_transcript}),
+        find unclear or open-ended statements and clarify them with research.
+        Check terms with the glossary tool first and only search the web for what it does not know.
+        """
+        )
+    ),
+    expected_output=dedent(
+        (
+            """
+        A markdown list of clarifications, each with the statement, an explanation
+        and helpful links (title, URL, and short description).
+        """
+        )
+    ),
+    agent="inquisitive_information_analyst",
+    async_execution=True,
+)
+
+glossary_task = TaskSpec(
+    description=dedent(
+        (
+            """
+        Given candidate terms and the parts of the meeting transcript where they appear
+        (available as {term_context}; "[...]" marks skipped parts),
+        extract technical or domain-specific terms, acronyms and jargon and define them.
+        Reuse the definitions of known terms given above or found with the glossary tool;
+        only search the web for terms the glossary reports as unknown.
+        """
+        )
+    ),
+    expected_output=dedent(
+        (
+            """
+        A markdown glossary with one bullet per term, "**Term**: short definition",
+        followed by its source link when one was used.
+        """
+        )
+    ),
+    agent="meeting_terminology_extractor",
+    async_execution=True,
+)
+
+consolidation_task = TaskSpec(
+    description=dedent(
+        (
+            """
+        Consolidate the outputs of the Meeting Summary Specialist, Meeting Action Item Extractor,
+        Inquisitive Information Analyst and Meeting Terminology Extractor (given as context)
+        into one unified, detailed meeting summary. Remove duplicates and do not add
+        information that is not in their outputs.
+        """
+        )
+    ),
+    expected_output=task1.expected_output,
+    agent="meeting_summary_specialist",
+    context=(
+        "summary_task",
+        "action_items_task",
+        "clarification_task",
+        "glossary_task",
+    ),
+)
+
+consolidated_email_task = TaskSpec(
+    description=task2.description,
+    expected_output=task2.expected_output,
+    agent="meeting_email_composer",
+    context=("consolidation_task",),
+)
+
+AGENT_SPECS = {
+    "meeting_summary_specialist": meeting_summary_specialist,
+    "meeting_action_item_extractor": meeting_action_item_extractor,
+    "inquisitive_information_analyst": inquisitive_information_analyst,
+    "meeting_terminology_extractor": meeting_terminology_extractor,
+    "meeting_email_composer": meeting_email_composer,
+    "meeting_orchestration_leader": meeting_orchestration_leader,
+}
+
+# Ordered so that context tasks come before the tasks that depend on them
+TASK_SPECS = {
+    "task1": task1,
+    "task2": task2,
+    "email_task": email_task,
+    "summary_task": summary_task,
+    "action_items_task": action_items_task,
+    "clarification_task": clarification_task,
+    "glossary_task": glossary_task,
+    "consolidation_task": consolidation_task,
+    "consolidated_email_task": consolidated_email_task,
+}
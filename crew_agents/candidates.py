@@ -0,0 +1,187 @@
+"""
+Rule-based pre-extraction of action-item and term candidates.
+
+mine_candidates() makes one pass over the transcript's sentences and marks
+- action-item candidates: a commitment ("I'll", "follow up", "action
+  item", ...), or a weaker one ("will", "need to", "send") together with a
+  name or a date/deadline;
+- term candidates: acronyms (SLA, ARR), CamelCase and alphanumeric tokens
+  (PowerBI, GPT-4), capitalized multi-word names (Customer Health Score) and
+  rare long words.
+The action-item and terminology agents then read only the candidate
+sentences with their neighbours instead of the whole transcript. Sentences
+longer than UNPUNCTUATED_SENTENCE_WORDS (unpunctuated Speech-to-Text output)
+are windowed by word ranges of PIECE_WORDS instead.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+from crew_agents.retrieval import sentence_spans
+
+# Longer "sentences" are taken to be unpunctuated text and split into pieces
+# of at most PIECE_WORDS words; punctuated sentences are kept whole
+UNPUNCTUATED_SENTENCE_WORDS = 60
+PIECE_WORDS = 12
+_WORD = re.compile(r"[A-Za-z][\w'-]*|\d[\w-]*")
+
+# A sentence with a strong commitment is a candidate on its own; one with a
+# weak commitment also needs a name or a date
+_STRONG_COMMITMENT = re.compile(
+    r"\b(i'll|i will|we'll|we will|let me|i can take|follow(?:ing)? up"
+    r"|(?:will|going to) (?:own|handle|take)|take care of|in charge of"
+    r"|responsible for|assign(?:ed)?|volunteer(?:ed)?|action items?|to-?do"
+    r"|next steps?|deadline)\b",
+    re.I,
+)
+_WEAK_COMMITMENT = re.compile(
+    r"\b(will|you'll|he'll|she'll|they'll|going to|gonna|need to|needs to|have to"
+    r"|has to|must|should|let's|owns?|send|share|schedule|review|prepare)\b",
+    re.I,
+)
+_DATE = re.compile(
+    r"\b(today|tonight|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday"
+    r"|sunday|weekend|next (?:week|month|quarter|sprint|meeting)|end of (?:the )?"
+    r"(?:day|week|month|quarter|year|sprint)|eod|eow|asap|deadline|due|by \d"
+    r"|january|february|march|april|may|june|july|august|september|october"
+    r"|november|december|q[1-4]|\d{1,2}/\d{1,2}|\d{1,2}(?:st|nd|rd|th))\b",
+    re.I,
+)
+
+_ACRONYM = re.compile(r"^[A-Z][A-Z0-9&]{1,7}s?$")
+_CAMEL = re.compile(r"^[A-Z]?[a-z]+[A-Z][A-Za-z]*$")
+_ALNUM = re.compile(r"^(?=.*[A-Za-z])(?=.*\d)[\w-]+$")
+RARE_WORD_LENGTH = 11
+# Capitalized words that are not names or terms on their own
+COMMON_CAPITALIZED = frozenset(
+    """I I'm I'll I've I'd OK Okay So And But Yeah Yes No The This That We You
+    They It Well Also Then Now Thanks Thank Right Sure Great""".split()
+)
+
+
+class CandidateContext(NamedTuple):
+    action_items: str  # candidate sentences with neighbours, or the transcript
+    terms: str
+    term_list: List[Tuple[str, int]]  # (term, occurrences), most frequent first
+    stats: Dict[str, int]
+
+
+def _windows(spans: List[Tuple[int, int, int]], marked: Set[int], radius: int):
+    """Merged [first, last] sentence ranges around the marked sentences."""
+    ranges: List[List[int]] = []
+    for i in sorted(marked):
+        first, last = max(0, i - radius), min(len(spans) - 1, i + radius)
+        if ranges and first <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], last)
+        else:
+            ranges.append([first, last])
+    return ranges
+
+
+def _excerpt(text: str, spans, ranges) -> str:
+    return "\n[...]\n".join(
+        text[spans[first][0] : spans[last][1]].strip() for first, last in ranges
+    )
+
+
+def mine_candidates(
+    meeting_transcript: str, radius: int = 1, max_terms: int = 80
+) -> CandidateContext:
+    """
+    Candidate sentences for the action-item and terminology agents, each with
+    `radius` neighbouring sentences on both sides. Excerpts are empty when
+    nothing was found.
+    """
+    text = meeting_transcript
+    spans = sentence_spans(text, UNPUNCTUATED_SENTENCE_WORDS, PIECE_WORDS)
+    action_sentences: Set[int] = set()
+    term_sentences: Dict[str, int] = {}  # term -> first sentence index
+    term_counts: Counter = Counter()
+    long_words: Counter = Counter()
+    long_word_sentences: Dict[str, int] = {}
+    lowercase_words: Set[str] = set()
+    # Sentences with a weak commitment and capitalized words only, settled once
+    # it is known which of those words are names
+    maybe_action: Dict[int, List[str]] = {}
+
+    for i, (start, end, _) in enumerate(spans):
+        sentence = text[start:end]
+        words = _WORD.findall(sentence)
+
+        lowercase_words.update(w for w in words if w[0].islower())
+        # Possible names: capitalized words, including the first one ("Sarah
+        # will send the deck"); checked against lowercase use below
+        names = [
+            w
+            for w in words
+            if w[0].isupper() and w not in COMMON_CAPITALIZED and not _ACRONYM.match(w)
+        ]
+        if _STRONG_COMMITMENT.search(sentence):
+            action_sentences.add(i)
+        elif _WEAK_COMMITMENT.search(sentence):
+            if _DATE.search(sentence):
+                action_sentences.add(i)
+            elif names:
+                maybe_action[i] = names
+
+        found = []
+        run: List[str] = []
+        for position, word in enumerate(words + [""]):
+            if _ACRONYM.match(word) and word not in COMMON_CAPITALIZED:
+                found.append(word)
+            elif _CAMEL.match(word) or _ALNUM.match(word):
+                found.append(word)
+            elif len(word) >= RARE_WORD_LENGTH and word.isalpha():
+                long_words[word.lower()] += 1
+                long_word_sentences.setdefault(word.lower(), i)
+            # Product-like n-grams: 2-4 title-case words inside a sentence; the
+            # empty sentinel word closes the last one
+            if (
+                position > 0
+                and word[:1].isupper()
+                and not word.isupper()
+                and word not in COMMON_CAPITALIZED
+            ):
+                run.append(word)
+            else:
+                if 2 <= len(run) <= 4:
+                    found.append(" ".join(run))
+                run = []
+        for term in found:
+            term_counts[term] += 1
+            term_sentences.setdefault(term, i)
+
+    # A capitalized word that also occurs in lower case is not a name (e.g. a
+    # sentence start inside an unpunctuated transcript)
+    for i, names in maybe_action.items():
+        if any(name.lower() not in lowercase_words for name in names):
+            action_sentences.add(i)
+
+    # Long words are rare only once the whole transcript has been seen
+    for word, count in long_words.items():
+        if count <= 2:
+            term_counts[word] += count
+            term_sentences.setdefault(word, long_word_sentences[word])
+
+    term_list = term_counts.most_common(max_terms)
+    ranges = _windows(spans, {term_sentences[t] for t, _ in term_list}, radius)
+    terms = _excerpt(text, spans, ranges)
+    if term_list:
+        listing = ", ".join(f"{term} ({count}x)" for term, count in term_list)
+        terms = f"Candidate terms: {listing}\n\n{terms}"
+
+    action_items = _excerpt(text, spans, _windows(spans, action_sentences, radius))
+    return CandidateContext(
+        action_items=action_items,
+        terms=terms,
+        term_list=term_list,
+        stats={
+            "sentences": len(spans),
+            "action_item_sentences": len(action_sentences),
+            "terms": len(term_list),
+            "transcript_chars": len(text),
+            "action_item_chars": len(action_items),
+            "term_chars": len(terms),
+        },
+    )
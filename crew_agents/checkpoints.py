@@ -0,0 +1,92 @@
+"""
+Per-task output checkpoints for crew runs.
+
+Every task output is stored under a key derived from the transcript hash, the
+task's own configuration (description, expected output, agent, tools, model)
+and the keys of the tasks it depends on, so a checkpoint is only reused while
+the transcript, the task and everything upstream of it are unchanged.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "meetingmind", "checkpoints"
+)
+
+# Bump when the checkpoint key or payload layout changes
+CHECKPOINT_VERSION = 1
+
+
+def transcript_digest(meeting_transcript: str) -> str:
+    return hashlib.sha256(meeting_transcript.encode("utf-8")).hexdigest()
+
+
+def task_config(task) -> Dict:
+    """The parts of a crewai Task that shape its output."""
+    agent = task.agent
+    llm = getattr(agent, "llm", None)
+    return {
+        "task": task.key,
+        "agent": agent.key if agent is not None else None,
+        "tools": sorted(tool.name for tool in (task.tools or agent.tools or [])),
+        "model": getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+    }
+
+
+def checkpoint_key(digest: str, config: Dict, upstream_keys: Iterable[str] = ()) -> str:
+    payload = json.dumps(
+        {
+            "version": CHECKPOINT_VERSION,
+            "transcript": digest,
+            "config": config,
+            "upstream": list(upstream_keys),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """
+    Directory of `{key}.json` files holding raw task outputs. Writes are
+    atomic, so an interrupted run never leaves a partial checkpoint.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CHECKPOINT_DIR):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)["raw"]
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, raw: str, name: str = "") -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"name": name, "raw": raw, "created_at": time.time()}, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+checkpoint_store = CheckpointStore(
+    directory=os.getenv("MEETINGMIND_CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR)
+)
@@ -0,0 +1,108 @@
+"""
+Per-run crews built from the immutable specs in crew_agents.agents_and_task.
+
+crewai Agents and Tasks carry run state (interpolated prompts, task outputs,
+delegation tools added by a hierarchical manager), so concurrent kickoffs must
+not share them. build_meeting_crew creates fresh instances, which costs about
+a millisecond per agent/task, while the LLM client and tool instances stay
+shared. CrewPool bounds how many crews run at once and keeps ready-built
+crews on hand.
+"""
+
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from crewai import Agent, Task
+
+from crew_agents.agents_and_task import AGENT_SPECS, TASK_SPECS, get_llm, get_tool
+
+
+class MeetingCrew:
+    """Fresh agents and tasks for one run, by spec name."""
+
+    def __init__(self, agents: Dict[str, Agent], tasks: Dict[str, Task]):
+        self.agents = agents
+        self.tasks = tasks
+
+
+def build_agent(name: str) -> Agent:
+    spec = AGENT_SPECS[name]
+    return Agent(
+        role=spec.role,
+        backstory=spec.backstory,
+        goal=spec.goal,
+        tools=[get_tool(tool) for tool in spec.tools],
+        allow_delegation=spec.allow_delegation,
+        max_iter=2,
+        max_retry_limit=3,
+        llm=get_llm(),
+        verbose=True,
+    )
+
+
+def build_meeting_crew() -> MeetingCrew:
+    agents = {name: build_agent(name) for name in AGENT_SPECS}
+    tasks = {}
+    for name, spec in TASK_SPECS.items():
+        kwargs = {}
+        if spec.context:
+            kwargs["context"] = [tasks[context] for context in spec.context]
+        tasks[name] = Task(
+            name=name,
+            description=spec.description,
+            expected_output=spec.expected_output,
+            agent=agents[spec.agent],
+            async_execution=spec.async_execution,
+            **kwargs,
+        )
+    return MeetingCrew(agents, tasks)
+
+
+class CrewPool:
+    """
+    Hands out MeetingCrews to at most `size` concurrent runs; further callers
+    wait for a free slot. Up to `size` crews are kept prebuilt. A crew is used
+    for exactly one run and then discarded, so no state leaks between runs.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        factory: Callable[[], MeetingCrew] = build_meeting_crew,
+        prebuild: bool = False,
+    ):
+        self.size = size
+        self.factory = factory
+        self._slots = threading.BoundedSemaphore(size)
+        self._ready = deque()
+        self._lock = threading.Lock()
+        if prebuild:
+            for _ in range(size):
+                self._ready.append(factory())
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[MeetingCrew]:
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"All {self.size} crews are busy")
+        try:
+            with self._lock:
+                crew = self._ready.popleft() if self._ready else None
+            yield crew or self.factory()
+        finally:
+            self._slots.release()
+            self._refill()
+
+    def _refill(self) -> None:
+        with self._lock:
+            if len(self._ready) >= self.size:
+                return
+        crew = self.factory()
+        with self._lock:
+            if len(self._ready) < self.size:
+                self._ready.append(crew)
+
+
+crew_pool = CrewPool(size=int(os.getenv("MEETINGMIND_CREW_POOL_SIZE", "4")))
@@ -0,0 +1,382 @@
+"""
+Cross-meeting glossary of term definitions.
+
+The terminology extractor and the information analyst used to search the web
+for the same company acronyms and products in every meeting. GlossaryStore
+keeps every definition (with its source links) harvested from finished runs
+in one JSON file, indexed for exact lookup on a normalized key and for fuzzy
+lookup through a character trigram index. Agents query it with
+crew_tools.glossary before searching; the search tool itself answers queries
+for a known term from the store (see crew_tools.web_search).
+"""
+
+import difflib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: glossary file updates are not locked
+    fcntl = None
+
+DEFAULT_GLOSSARY_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "meetingmind", "glossary.json"
+)
+FUZZY_THRESHOLD = 0.85
+MIN_FUZZY_KEY_LENGTH = 5  # "SLA" and "SLO" are different terms
+
+_NON_WORD = re.compile(r"[^\w]+")
+_PLURAL_ACRONYM = re.compile(r"^[A-Z0-9]{2,}s$")
+_URL = re.compile(r"https?://[^\s)>\]|]+")
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\((https?://[^)\s]+)\)")
+_LINK_OR_URL = r"(?:\[[^\]]*\]\(https?://[^)\s]+\)|https?://[^\s)>\]|]+)"
+# A trailing "Source: [Wikipedia](https://...)", removed before links become text
+_SOURCE_TAIL = re.compile(
+    rf"[\s(\[]*\b(?:sources?|links?|references?)\b\s*:?\s*"
+    rf"(?:{_LINK_OR_URL}[\s,;)\]]*)+$",
+    re.I,
+)
+# Markdown headings, or a line that is only bold text ("7. **Glossary of Terms**")
+_HEADING = re.compile(
+    r"^\s*(?:#{1,6}\s+(?P<title>.+)|(?:\d+\.\s*)?\*\*(?P<bold>[^*]+)\*\*:?\s*)$"
+)
+_GLOSSARY_HEADING = re.compile(r"glossary|terms|terminology", re.I)
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+")
+# Glossary lines: "- **SLA** (Service Level Agreement): definition", "SLA - definition"
+_ENTRY = re.compile(
+    r"^\s*(?:[-*+]|\d+\.)?\s*(?:\*\*|__)?(?P<term>[^*_:|()\n]{1,60}?)(?:\*\*|__)?"
+    r"\s*(?:\((?P<alias>[^)\n]{1,80})\))?\s*(?:\*\*|__)?\s*(?::|\s[-–—]\s)\s*"
+    r"(?P<definition>.+)$"
+)
+_SOURCE_LABEL = re.compile(r"[\s(\[]*\b(sources?|links?|references?)\b\W*$", re.I)
+_TABLE_ROW = re.compile(r"^\s*\|(?P<term>[^|]+)\|(?P<definition>[^|]+)\|")
+# Labels of notes and table headers, not terms
+_NOT_TERMS = frozenset(
+    """term terms definition definitions meaning source sources link links
+    reference references note notes summary overview disclaimer context example
+    examples""".split()
+)
+# Words around a term in a search query, e.g. "what does SLA stand for"
+_QUERY_NOISE = re.compile(
+    r"^(what (?:is|are|does)( an?| the)?|define|definition of|meaning of)\s+"
+    r"|\s+(meaning|definition|stands? for|acronym|abbreviation)\??$|\?$",
+    re.I,
+)
+
+
+class GlossaryEntry(NamedTuple):
+    term: str
+    definition: str
+    sources: List[str]
+    aliases: List[str]
+    meetings: int  # number of meetings the term was defined in
+
+
+class GlossaryMatch(NamedTuple):
+    query: str
+    entry: GlossaryEntry
+    score: float  # 1.0 for an exact match
+
+
+def normalize(term: str) -> str:
+    """Lookup key: case-folded words, without punctuation or an acronym's plural s."""
+    term = term.strip()
+    if _PLURAL_ACRONYM.match(term):
+        term = term[:-1]
+    return _NON_WORD.sub(" ", term.casefold()).strip()
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def parse_glossary(markdown: str) -> List[Tuple[str, List[str], str, List[str]]]:
+    """
+    (term, aliases, definition, sources) per entry of a markdown glossary as
+    written by the terminology extractor. Only list items and table rows are
+    entries, and only under a glossary heading when the text has headings, so
+    notes like "Note: ..." around the glossary are not taken for terms.
+    Links on a line, or on indented lines right below an entry, are its
+    sources.
+    """
+    entries: List[Tuple[str, List[str], str, List[str]]] = []
+    in_glossary = not any(_HEADING.match(line) for line in markdown.splitlines())
+    for line in markdown.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            title = heading.group("title") or heading.group("bold")
+            in_glossary = bool(_GLOSSARY_HEADING.search(title))
+            continue
+        if not in_glossary or not line.strip() or re.match(r"^\s*\|?\s*:?-{3,}", line):
+            continue
+        links = [url for _, url in _MARKDOWN_LINK.findall(line)] or [
+            url.rstrip(".,;") for url in _URL.findall(line)
+        ]
+        text = _MARKDOWN_LINK.sub(r"\1", _SOURCE_TAIL.sub("", line))
+        match = _TABLE_ROW.match(text) or (
+            _LIST_ITEM.match(text) and _ENTRY.match(text)
+        )
+        term = match and match.group("term").strip(" *_`")
+        if not term or len(term.split()) > 6 or normalize(term) in _NOT_TERMS:
+            if entries and line[:1].isspace() and links:
+                entries[-1][3].extend(links)  # sources listed below the entry
+            continue
+        definition = _URL.sub("", match.group("definition"))
+        definition = _SOURCE_LABEL.sub("", definition).strip(" *_|()-–—")
+        if not definition:
+            continue
+        groups = match.groupdict()
+        aliases = [groups["alias"].strip()] if groups.get("alias") else []
+        entries.append((term, aliases, definition, links))
+    return entries
+
+
+class GlossaryStore:
+    """
+    Term definitions shared by every run, persisted to one JSON file.
+    Writes are atomic and, under a file lock, merge entries other processes
+    wrote since the last load, so concurrent batch workers do not lose each
+    other's terms.
+    """
+
+    def __init__(self, path: str = DEFAULT_GLOSSARY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None  # key -> entry, on first use
+        self._loaded_mtime = 0.0
+        self._stats = {
+            "exact_hits": 0,
+            "fuzzy_hits": 0,
+            "misses": 0,
+            "searches_avoided": 0,
+            "harvested": 0,
+        }
+
+    # --- storage ---
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)["entries"]
+        except FileNotFoundError:
+            return {}
+
+    def _ensure_loaded(self) -> None:
+        if self._entries is None:
+            self._entries = self._read()
+            self._loaded_mtime = self._mtime()
+            self._build_index()
+
+    def _mtime(self) -> float:
+        try:
+            return os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return 0.0
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            if self._mtime() != self._loaded_mtime:
+                for key, entry in self._read().items():
+                    if key in self._entries:
+                        self._merge(self._entries[key], entry)
+                    else:
+                        self._entries[key] = entry
+                self._build_index()
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"entries": self._entries}, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = self._mtime()
+
+    @staticmethod
+    def _merge(entry: Dict, other: Dict) -> None:
+        entry["sources"] = list(dict.fromkeys(entry["sources"] + other["sources"]))
+        entry["aliases"] = list(dict.fromkeys(entry["aliases"] + other["aliases"]))
+        entry["meetings"] = max(entry["meetings"], other["meetings"])
+
+    # --- index ---
+
+    def _build_index(self) -> None:
+        self._keys: Dict[str, str] = {}  # normalized term or alias -> entry key
+        self._trigram_index: Dict[str, Set[str]] = defaultdict(set)
+        for key, entry in self._entries.items():
+            for name in [entry["term"], *entry["aliases"]]:
+                self._index_name(normalize(name), key)
+
+    def _index_name(self, name_key: str, key: str) -> None:
+        if not name_key or name_key in self._keys:
+            return
+        self._keys[name_key] = key
+        for trigram in _trigrams(name_key):
+            self._trigram_index[trigram].add(name_key)
+
+    def _find(self, term: str, fuzzy: bool) -> Optional[Tuple[str, float]]:
+        name_key = normalize(term)
+        if name_key in self._keys:
+            return self._keys[name_key], 1.0
+        if not fuzzy or len(name_key) < MIN_FUZZY_KEY_LENGTH:
+            return None
+        shared: Dict[str, int] = defaultdict(int)
+        trigrams = _trigrams(name_key)
+        for trigram in trigrams:
+            for candidate in self._trigram_index.get(trigram, ()):
+                shared[candidate] += 1
+        best, best_score = None, 0.0
+        # Only candidates sharing enough trigrams are compared in full
+        for candidate, count in shared.items():
+            if count < len(trigrams) * FUZZY_THRESHOLD / 2:
+                continue
+            score = difflib.SequenceMatcher(None, name_key, candidate).ratio()
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is None or best_score < FUZZY_THRESHOLD:
+            return None
+        return self._keys[best], best_score
+
+    # --- public API ---
+
+    def lookup(self, term: str, fuzzy: bool = True) -> Optional[GlossaryMatch]:
+        with self._lock:
+            self._ensure_loaded()
+            found = self._find(term, fuzzy)
+            if found is None:
+                self._stats["misses"] += 1
+                return None
+            key, score = found
+            self._stats["exact_hits" if score == 1.0 else "fuzzy_hits"] += 1
+            entry = self._entries[key]
+            return GlossaryMatch(
+                term,
+                GlossaryEntry(*(entry[field] for field in GlossaryEntry._fields)),
+                score,
+            )
+
+    def lookup_many(
+        self, terms: Iterable[str], fuzzy: bool = True
+    ) -> Tuple[List[GlossaryMatch], List[str]]:
+        """(matches, unknown terms) for `terms`."""
+        known, unknown = [], []
+        for term in dict.fromkeys(t.strip() for t in terms if t.strip()):
+            match = self.lookup(term, fuzzy)
+            if match is None:
+                unknown.append(term)
+            else:
+                known.append(match)
+        return known, unknown
+
+    def lookup_query(self, query: str) -> Optional[GlossaryMatch]:
+        """
+        Exact match for a web search query that only asks about one term
+        ("SLA", "what is PowerBI", "ARR meaning"), counted as an avoided search.
+        """
+        term = _QUERY_NOISE.sub("", query.strip()).strip()
+        if not term or len(term.split()) > 6:
+            return None
+        match = self.lookup(term, fuzzy=False)
+        if match is not None:
+            with self._lock:
+                self._stats["searches_avoided"] += 1
+        return match
+
+    def add(
+        self,
+        term: str,
+        definition: str,
+        sources: Iterable[str] = (),
+        aliases: Iterable[str] = (),
+        meeting: Optional[str] = None,
+    ) -> bool:
+        """
+        Records a definition; returns True if the term was new. A known term
+        keeps its definition but gains new sources and aliases, and counts
+        `meeting` (e.g. a transcript digest) once.
+        """
+        with self._lock:
+            added = self._add(term, definition, sources, aliases, meeting)
+            self._save()
+        return added
+
+    def _add(self, term, definition, sources, aliases, meeting) -> bool:
+        self._ensure_loaded()
+        found = self._find(term, fuzzy=False)
+        new = {
+            "term": term,
+            "definition": definition,
+            "sources": list(dict.fromkeys(sources)),
+            "aliases": [a for a in dict.fromkeys(aliases) if normalize(a)],
+            "meetings": 1,
+            "last_meeting": meeting,
+            "updated_at": time.time(),
+        }
+        if found is not None:
+            entry = self._entries[found[0]]
+            seen = meeting is not None and entry.get("last_meeting") == meeting
+            self._merge(entry, new)
+            if not seen:
+                entry["meetings"] += 1
+                entry["last_meeting"] = meeting
+            entry["updated_at"] = new["updated_at"]
+            key = found[0]
+        else:
+            key = normalize(term)
+            if not key:
+                return False
+            self._entries[key] = new
+        for name in [term, *new["aliases"]]:
+            self._index_name(normalize(name), key)
+        return found is None
+
+    def harvest(self, glossary_markdown: str, meeting: Optional[str] = None) -> int:
+        """Adds every entry of a run's glossary output; returns the new terms."""
+        entries = parse_glossary(glossary_markdown)
+        if not entries:
+            return 0
+        with self._lock:
+            added = sum(
+                self._add(term, definition, sources, aliases, meeting)
+                for term, aliases, definition, sources in entries
+            )
+            self._save()
+            self._stats["harvested"] += added
+        return added
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def samples(self) -> Iterable[Tuple[str, str, Dict[str, str], float]]:
+        """(name, type, labels, value) samples for MetricsRegistry.to_prometheus."""
+        stats = self.stats()
+        for result, stat in (
+            ("exact", "exact_hits"),
+            ("fuzzy", "fuzzy_hits"),
+            ("miss", "misses"),
+        ):
+            yield "meetingmind_glossary_lookups_total", "counter", {
+                "result": result
+            }, stats[stat]
+        yield "meetingmind_glossary_searches_avoided_total", "counter", {}, stats[
+            "searches_avoided"
+        ]
+        yield "meetingmind_glossary_harvested_total", "counter", {}, stats["harvested"]
+        if self._entries is not None:
+            yield "meetingmind_glossary_terms", "gauge", {}, len(self._entries)
+
+
+glossary_store = GlossaryStore(
+    path=os.getenv("MEETINGMIND_GLOSSARY_PATH", DEFAULT_GLOSSARY_PATH)
+)
@@ -0,0 +1,154 @@
+"""
+Hedged LLM requests to cut tail latency.
+
+When a model request is still running after the configured percentile of
+recent model latencies (reported with observe(), without rate-limiter waits),
+CachedLLM sends one duplicate and returns whichever succeeds first. Hedges
+are capped at a fraction of all requests, so a slow provider cannot double
+the load. Python cannot interrupt a blocking HTTP call, so a losing request
+is cancelled only if it has not been sent yet (e.g. it is still waiting in
+the rate limiter); otherwise its response is discarded when it arrives.
+
+Hedging is off by default; enable it with MEETINGMIND_LLM_HEDGE_PERCENTILE
+(e.g. 0.95) and cap it with MEETINGMIND_LLM_HEDGE_BUDGET (default 0.1).
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+class HedgeCancelled(Exception):
+    """Raised inside a hedged attempt that lost before it was sent."""
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        percentile: Optional[float] = None,
+        budget: float = 0.1,
+        min_samples: int = 20,
+        window: int = 500,
+        min_delay: float = 0.5,
+    ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "budget_denied": 0,
+            "cancelled": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile is not None
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        percentile = os.getenv("MEETINGMIND_LLM_HEDGE_PERCENTILE")
+        return cls(
+            percentile=float(percentile) if percentile else None,
+            budget=float(os.getenv("MEETINGMIND_LLM_HEDGE_BUDGET", "0.1")),
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough latencies are seen."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _try_spend(self) -> bool:
+        with self._lock:
+            if self._stats["hedges"] + 1 > self.budget * self._stats["requests"]:
+                self._stats["budget_denied"] += 1
+                return False
+            self._stats["hedges"] += 1
+            return True
+
+    def run(self, attempt: Callable[[threading.Event], object]):
+        """
+        Runs `attempt(cancelled)` and, past the hedge delay, a duplicate; returns
+        the first successful result, or raises once both attempts failed. An
+        attempt should raise HedgeCancelled if `cancelled` is set before it
+        sends its request, and report its model latency with observe().
+        """
+        self._count("requests")
+        delay = self.hedge_delay() if self.enabled else None
+        if delay is None:
+            return attempt(threading.Event())
+
+        primary = _spawn(attempt, threading.Event())
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._try_spend():
+            return primary.result()
+
+        hedge = _spawn(attempt, threading.Event())
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if not succeeded and pending:
+                continue  # an error only wins once both attempts failed
+            winner = succeeded[0] if succeeded else next(iter(done))
+            loser = hedge if winner is primary else primary
+            if not loser.done():
+                loser.cancelled_event.set()
+                self._count("cancelled")
+            if winner is hedge and succeeded:
+                self._count("hedge_wins")
+            return winner.result()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        requests = stats["requests"]
+        stats["hedge_rate"] = stats["hedges"] / requests if requests else 0.0
+        stats["hedge_win_rate"] = (
+            stats["hedge_wins"] / stats["hedges"] if stats["hedges"] else 0.0
+        )
+        return stats
+
+    def samples(self) -> Iterable[Tuple[str, str, Dict[str, str], float]]:
+        """(name, type, labels, value) samples for MetricsRegistry.to_prometheus."""
+        stats = self.stats()
+        for stat in ("requests", "hedges", "hedge_wins", "budget_denied", "cancelled"):
+            yield f"meetingmind_llm_hedge_{stat}_total", "counter", {}, stats[stat]
+        delay = self.hedge_delay() if self.enabled else None
+        yield "meetingmind_llm_hedge_delay_seconds", "gauge", {}, delay or 0.0
+
+
+def _spawn(attempt, cancelled: threading.Event) -> Future:
+    """Runs an attempt on its own daemon thread; unlike a pool, no call ever queues."""
+    future = Future()
+    future.cancelled_event = cancelled
+
+    def run():
+        try:
+            future.set_result(attempt(cancelled))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-hedge", daemon=True).start()
+    return future
+
+
+llm_hedge_policy = HedgePolicy.from_env()
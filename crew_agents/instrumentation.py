@@ -0,0 +1,437 @@
+"""
+Per-run performance instrumentation for crew runs.
+
+A RunRecorder is attached to the agents and tasks of one run (which are never
+shared between runs, see crew_agents.factory) and listens to crewai's event
+bus for LLM calls, tool calls and task boundaries. It records wall time,
+queue time, tokens, retries and iterations per agent and per task, and
+produces a JSON-serializable run report. Finished reports are also added to
+the process-wide `metrics` registry, which renders Prometheus text format.
+"""
+
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from crewai.utilities.events import (
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    LLMCallStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    TaskStartedEvent,
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+    crewai_event_bus,
+)
+
+from crew_agents.glossary import glossary_store
+from crew_agents.hedging import llm_hedge_policy
+from crew_agents.llm_cache import LLMRetryEvent
+from crew_agents.rate_limit import gemini_rate_limiter
+
+
+def _agent_stats() -> Dict:
+    return {
+        "llm_calls": 0,
+        "llm_seconds": 0.0,
+        "llm_failures": 0,
+        "llm_retries": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_prompt_tokens": 0,
+        "tool_calls": 0,
+        "tool_seconds": 0.0,
+        "tool_errors": 0,
+    }
+
+
+def _tool_stats() -> Dict:
+    return {"calls": 0, "seconds": 0.0, "errors": 0}
+
+
+class LLMCallRecord:
+    """Token counts for an LLM call made outside an agent (see RunRecorder.llm_call)."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+class RunRecorder:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.status = "running"
+        self.queue_seconds = 0.0
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        # When the run got its crew, and when its last task or stage finished
+        self._attached_at = self._started
+        self._last_finished: Optional[float] = None
+        self._task_finished: Dict[str, float] = {}  # task id -> finish time
+        self._lock = threading.Lock()
+        self._agents = {}  # agent id -> Agent
+        self._tasks = {}  # task id -> Task
+        self._call_labels: Dict[str, str] = {}  # fairness key -> llm_call label
+        self._llm_started: Dict[Tuple[str, int], float] = {}
+        self.agents: Dict[str, Dict] = defaultdict(_agent_stats)
+        self.tools: Dict[str, Dict] = defaultdict(_tool_stats)
+        self.tasks: Dict[str, Dict] = {}
+        self._tool_outputs: Dict[str, List[str]] = defaultdict(list)
+
+    def attach(self, agents, tasks) -> None:
+        """Routes events of these agents and tasks to this recorder."""
+        _install_listeners()
+        with self._lock:
+            if not self._agents and not self._tasks:
+                self._attached_at = time.perf_counter()
+            self._agents.update((str(agent.id), agent) for agent in agents)
+            self._tasks.update((str(task.id), task) for task in tasks)
+        with _recorders_lock:
+            for key in list(self._agents) + list(self._tasks):
+                _recorders[key] = self
+
+    def finish(self, status: str = "completed") -> Dict:
+        """Detaches the recorder, collects token usage and publishes the report."""
+        with _recorders_lock:
+            for key in list(self._agents) + list(self._tasks) + list(self._call_labels):
+                _recorders.pop(key, None)
+        with self._lock:
+            self.status = status
+            self._finished = time.perf_counter()
+            for agent in self._agents.values():
+                # Fed by crewai's TokenCalcHandler on every agent LLM call
+                usage = agent._token_process.get_summary()
+                if not usage.successful_requests and _role(agent) not in self.agents:
+                    continue  # not part of this run's pipeline
+                stats = self.agents[_role(agent)]
+                stats["prompt_tokens"] += usage.prompt_tokens
+                stats["completion_tokens"] += usage.completion_tokens
+                stats["cached_prompt_tokens"] += usage.cached_prompt_tokens
+        report = self.report()
+        metrics.observe(report)
+        return report
+
+    @contextmanager
+    def llm_call(
+        self, label: str, fairness_key: Optional[str] = None
+    ) -> Iterator[LLMCallRecord]:
+        """
+        Times an LLM call made outside any agent, e.g. by map_reduce. Its 429
+        retries are counted when the call passes `fairness_key` to CachedLLM.
+        """
+        if fairness_key is not None:
+            _install_listeners()
+            with self._lock:
+                self._call_labels[fairness_key] = label
+            with _recorders_lock:
+                _recorders[fairness_key] = self
+        record = LLMCallRecord()
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception:
+            with self._lock:
+                self.agents[label]["llm_failures"] += 1
+            raise
+        finally:
+            end = time.perf_counter()
+            elapsed = end - start
+            with self._lock:
+                self._last_finished = max(self._last_finished or end, end)
+                stats = self.agents[label]
+                stats["llm_calls"] += 1
+                stats["llm_seconds"] += elapsed
+                stats["prompt_tokens"] += record.prompt_tokens
+                stats["completion_tokens"] += record.completion_tokens
+
+    def report(self) -> Dict:
+        with self._lock:
+            end = self._finished or time.perf_counter()
+            return {
+                "mode": self.mode,
+                "status": self.status,
+                "wall_seconds": end - self._started,
+                "queue_seconds": self.queue_seconds,
+                "agents": {role: dict(stats) for role, stats in self.agents.items()},
+                "tools": {name: dict(stats) for name, stats in self.tools.items()},
+                "tasks": {name: dict(stats) for name, stats in self.tasks.items()},
+            }
+
+    def tool_outputs(self, tool_name: str) -> List[str]:
+        """Outputs of every finished call of `tool_name` in this run."""
+        with self._lock:
+            return list(self._tool_outputs[tool_name])
+
+    # Event handlers, called on the thread that emitted the event
+
+    def _ready_at(self, task) -> float:
+        """
+        When `task` could have started: once its context tasks finished, or
+        without an explicit context (sequential crews), once the previous task
+        or stage did; never before the run got its crew.
+        """
+        context = task.context if isinstance(task.context, list) else None
+        if context:
+            finished = [self._task_finished.get(str(dep.id)) for dep in context]
+            ready = max((at for at in finished if at is not None), default=None)
+        else:
+            ready = self._last_finished
+        return max(self._attached_at, ready or self._attached_at)
+
+    def _on_task_started(self, task) -> None:
+        with self._lock:
+            now = time.perf_counter()
+            self.tasks[task.name] = {
+                "agent": _role(task.agent),
+                "status": "running",
+                "queue_seconds": now - self._ready_at(task),
+                "wall_seconds": 0.0,
+                "iterations": 0,
+                "_started": now,
+            }
+
+    def _on_task_finished(self, task, status: str) -> None:
+        with self._lock:
+            now = time.perf_counter()
+            self._task_finished[str(task.id)] = now
+            self._last_finished = now
+            stats = self.tasks.get(task.name)
+            if stats is not None:
+                stats["status"] = status
+                stats["wall_seconds"] = now - stats.pop("_started")
+
+    def _on_llm_started(self, agent_id: str, task_id: Optional[str]) -> None:
+        with self._lock:
+            self._llm_started[(agent_id, threading.get_ident())] = time.perf_counter()
+            task = self._tasks.get(str(task_id))
+            if task is not None and task.name in self.tasks:
+                self.tasks[task.name]["iterations"] += 1
+
+    def _on_llm_finished(self, agent_id: str, failed: bool) -> None:
+        with self._lock:
+            start = self._llm_started.pop((agent_id, threading.get_ident()), None)
+            stats = self.agents[_role(self._agents[agent_id])]
+            stats["llm_calls"] += 1
+            if start is not None:
+                stats["llm_seconds"] += time.perf_counter() - start
+            if failed:
+                stats["llm_failures"] += 1
+
+    def _on_llm_retry(self, agent_id: Optional[str], fairness_key: Optional[str]):
+        with self._lock:
+            if agent_id in self._agents:
+                label = _role(self._agents[agent_id])
+            else:
+                label = self._call_labels.get(fairness_key)
+            if label is not None:
+                self.agents[label]["llm_retries"] += 1
+
+    def _on_tool_finished(
+        self, agent, tool_name: str, seconds: float, failed: bool, output=None
+    ):
+        with self._lock:
+            if output is not None:
+                self._tool_outputs[tool_name].append(str(output))
+            stats = self.agents[_role(agent)]
+            stats["tool_calls"] += 1
+            stats["tool_seconds"] += seconds
+            tool = self.tools[tool_name]
+            tool["calls"] += 1
+            tool["seconds"] += seconds
+            if failed:
+                stats["tool_errors"] += 1
+                tool["errors"] += 1
+
+
+def _role(agent) -> str:
+    return agent.role.strip() if agent is not None else "unknown"
+
+
+_recorders: Dict[str, RunRecorder] = {}  # agent/task id -> recorder of its run
+_recorders_lock = threading.Lock()
+_listeners_installed = False
+
+
+def _recorder(key) -> Optional[RunRecorder]:
+    if key is None:
+        return None
+    with _recorders_lock:
+        return _recorders.get(str(key))
+
+
+def _install_listeners() -> None:
+    global _listeners_installed
+    with _recorders_lock:
+        if _listeners_installed:
+            return
+        _listeners_installed = True
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def on_task_started(source, event):
+        recorder = _recorder(event.task.id if event.task else None)
+        if recorder:
+            recorder._on_task_started(event.task)
+
+    @crewai_event_bus.on(TaskCompletedEvent)
+    def on_task_completed(source, event):
+        recorder = _recorder(event.task.id if event.task else None)
+        if recorder:
+            recorder._on_task_finished(event.task, "completed")
+
+    @crewai_event_bus.on(TaskFailedEvent)
+    def on_task_failed(source, event):
+        recorder = _recorder(event.task.id if event.task else None)
+        if recorder:
+            recorder._on_task_finished(event.task, "failed")
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def on_llm_started(source, event):
+        recorder = _recorder(event.agent_id)
+        if recorder:
+            recorder._on_llm_started(str(event.agent_id), event.task_id)
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def on_llm_completed(source, event):
+        recorder = _recorder(event.agent_id)
+        if recorder:
+            recorder._on_llm_finished(str(event.agent_id), failed=False)
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def on_llm_failed(source, event):
+        recorder = _recorder(event.agent_id)
+        if recorder:
+            recorder._on_llm_finished(str(event.agent_id), failed=True)
+
+    # 429 retries inside CachedLLM, of an agent's call or a keyed llm_call
+    @crewai_event_bus.on(LLMRetryEvent)
+    def on_llm_retry(source, event):
+        agent_id = str(event.agent_id) if event.agent_id else None
+        recorder = _recorder(agent_id) or _recorder(event.fairness_key)
+        if recorder:
+            recorder._on_llm_retry(agent_id, event.fairness_key)
+
+    # Finished and error events leave `agent` unset; their source, the
+    # ToolUsage that ran the tool, holds it
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def on_tool_finished(source, event):
+        agent = event.agent or getattr(source, "agent", None)
+        recorder = _recorder(agent.id if agent else None)
+        if recorder:
+            seconds = (event.finished_at - event.started_at).total_seconds()
+            recorder._on_tool_finished(
+                agent, event.tool_name, seconds, False, event.output
+            )
+
+    @crewai_event_bus.on(ToolUsageErrorEvent)
+    def on_tool_error(source, event):
+        agent = event.agent or getattr(source, "agent", None)
+        recorder = _recorder(agent.id if agent else None)
+        if recorder:
+            recorder._on_tool_finished(agent, event.tool_name, 0.0, True)
+
+
+class MetricsRegistry:
+    """Process-wide totals over every finished run report."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple], float] = defaultdict(float)
+        self._collectors: List[Callable[[], Iterable[Tuple]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple]]) -> None:
+        """
+        Adds live samples to the export: `collector()` yields
+        (name, type, labels, value), e.g. RateLimiter.samples.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _add(self, name: str, value: float, **labels) -> None:
+        self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe(self, report: Dict) -> None:
+        with self._lock:
+            mode, status = report["mode"], report["status"]
+            self._add("meetingmind_crew_runs_total", 1, mode=mode, status=status)
+            self._add(
+                "meetingmind_crew_seconds_total", report["wall_seconds"], mode=mode
+            )
+            self._add(
+                "meetingmind_crew_queue_seconds_total",
+                report["queue_seconds"],
+                mode=mode,
+            )
+            for agent, stats in report["agents"].items():
+                self._add(
+                    "meetingmind_llm_calls_total", stats["llm_calls"], agent=agent
+                )
+                self._add(
+                    "meetingmind_llm_seconds_total", stats["llm_seconds"], agent=agent
+                )
+                self._add(
+                    "meetingmind_llm_failures_total", stats["llm_failures"], agent=agent
+                )
+                self._add(
+                    "meetingmind_llm_retries_total", stats["llm_retries"], agent=agent
+                )
+                for kind in ("prompt", "completion", "cached_prompt"):
+                    self._add(
+                        "meetingmind_llm_tokens_total",
+                        stats[f"{kind}_tokens"],
+                        agent=agent,
+                        kind=kind,
+                    )
+            for tool, stats in report["tools"].items():
+                self._add("meetingmind_tool_calls_total", stats["calls"], tool=tool)
+                self._add("meetingmind_tool_seconds_total", stats["seconds"], tool=tool)
+                self._add("meetingmind_tool_errors_total", stats["errors"], tool=tool)
+            for task, stats in report["tasks"].items():
+                self._add(
+                    "meetingmind_task_runs_total", 1, task=task, status=stats["status"]
+                )
+                self._add(
+                    "meetingmind_task_seconds_total", stats["wall_seconds"], task=task
+                )
+                self._add(
+                    "meetingmind_task_iterations_total", stats["iterations"], task=task
+                )
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            samples = [
+                (name, "counter", labels, value)
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            collectors = list(self._collectors)
+        for collector in collectors:
+            samples += [
+                (name, kind, tuple(labels.items()), value)
+                for name, kind, labels, value in collector()
+            ]
+
+        lines: List[str] = []
+        seen = set()
+        for name, kind, labels, value in samples:
+            family = name
+            if kind == "histogram":
+                family = re.sub(r"_(bucket|sum|count)$", "", name)
+            if family not in seen:
+                seen.add(family)
+                lines.append(f"# TYPE {family} {kind}")
+            label_text = ",".join(
+                f'{key}="{str(val).replace(chr(34), chr(39))}"' for key, val in labels
+            )
+            if label_text:
+                name = f"{name}{{{label_text}}}"
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+metrics.add_collector(gemini_rate_limiter.samples)
+metrics.add_collector(llm_hedge_policy.samples)
+metrics.add_collector(glossary_store.samples)
@@ -0,0 +1,391 @@
+"""
+On-disk cache of LLM responses.
+
+Reruns of the same meeting (after an SMTP failure, a UI refresh, ...) send the
+crew's agents the exact same prompts. CachedLLM answers those from a local
+diskcache store instead of calling the model again. Entries are keyed by
+model, sampling parameters, stop words, the full message list and the tool
+schema, and expire after a TTL; the store is bounded in size with LRU
+eviction.
+
+Set MEETINGMIND_LLM_CACHE=off (or CachedLLM.cache_enabled = False) to bypass
+the cache. MEETINGMIND_LLM_CONCURRENCY (or CachedLLM.set_max_concurrency)
+caps how many requests go to the model at once; cache hits are not limited.
+Requests that do go to the model are also paced by the process-wide
+crew_agents.rate_limit limiter, and optionally hedged (crew_agents.hedging).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Union
+
+import diskcache
+import litellm
+from crewai import LLM
+from crewai.utilities.events import (
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    LLMCallStartedEvent,
+    crewai_event_bus,
+)
+from crewai.utilities.events.llm_events import LLMCallType, LLMEventBase
+from litellm.integrations.custom_logger import CustomLogger
+
+from crew_agents.hedging import HedgeCancelled, HedgePolicy, llm_hedge_policy
+from crew_agents.rate_limit import (
+    RateLimiter,
+    gemini_rate_limiter,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "meetingmind", "llm"
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Bump when the key layout changes
+CACHE_VERSION = 1
+
+
+class LLMResponseCache:
+    """
+    Size- and TTL-bounded response store with hit/miss counters. The
+    diskcache directory is only created on first use.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._cache: Optional[diskcache.Cache] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    @property
+    def cache(self) -> diskcache.Cache:
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = diskcache.Cache(
+                        self.directory,
+                        size_limit=self.max_bytes,
+                        eviction_policy="least-recently-used",
+                    )
+        return self._cache
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"version": CACHE_VERSION, **request}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        response = self.cache.get(key)
+        self._count("misses" if response is None else "hits")
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        self.cache.set(key, response, expire=self.ttl_seconds)
+        self._count("stores")
+
+    def bypass(self) -> None:
+        self._count("bypassed")
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        if self._cache is not None:
+            stats["entries"] = len(self._cache)
+            stats["bytes"] = self._cache.volume()
+        return stats
+
+
+llm_response_cache = LLMResponseCache(
+    directory=os.getenv("MEETINGMIND_LLM_CACHE_DIR", DEFAULT_CACHE_DIR)
+)
+
+
+class LLMRetryEvent(LLMEventBase):
+    """A model request retried after a 429 (see CachedLLM._limited_call)."""
+
+    error: str
+    pause_seconds: float
+    fairness_key: Optional[str] = None
+    type: str = "llm_retry"
+
+
+class CachedLLM(LLM):
+    """
+    crewai LLM that serves repeated identical requests from `response_cache`.
+    Calls that pass `available_functions` execute tools inside the call, so
+    they always go to the model.
+    """
+
+    def __init__(
+        self,
+        *args,
+        response_cache: LLMResponseCache = llm_response_cache,
+        cache_enabled: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = gemini_rate_limiter,
+        max_rate_limit_retries: int = 5,
+        hedge_policy: Optional[HedgePolicy] = llm_hedge_policy,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.hedge_policy = hedge_policy
+        self.set_max_concurrency(
+            max_concurrency or int(os.getenv("MEETINGMIND_LLM_CONCURRENCY", "0"))
+        )
+        self.cache_enabled = (
+            os.getenv("MEETINGMIND_LLM_CACHE", "on").lower()
+            not in ("0", "off", "false")
+            if cache_enabled is None
+            else cache_enabled
+        )
+
+    def set_max_concurrency(self, max_concurrency: Optional[int]) -> None:
+        """At most `max_concurrency` model requests in flight; 0/None is unlimited."""
+        self._call_slots = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+
+    def _send(self, *args) -> Union[str, Any]:
+        with self._call_slots or nullcontext():
+            start = time.perf_counter()
+            response = super().call(*args)
+            # Model latency only, without rate limiter or concurrency waits
+            if self.hedge_policy is not None:
+                self.hedge_policy.observe(time.perf_counter() - start)
+            return response
+
+    def _call_model(
+        self,
+        messages,
+        tools,
+        callbacks,
+        available_functions,
+        from_task,
+        from_agent,
+        fairness_key=None,
+    ) -> Union[str, Any]:
+        args = (messages, tools, callbacks, available_functions, from_task, from_agent)
+        key = fairness_key or _fairness_key(from_task, from_agent)
+        # Function calls run tools (e.g. send an email) inside the request, so
+        # they are never duplicated and keep crewai's own call events
+        if available_functions:
+            return self._limited_call(args, key=key)
+        return self._reported_call(args, key)
+
+    def _reported_call(self, args: tuple, key: str) -> Union[str, Any]:
+        """
+        Sends the request, through hedge_policy when it is enabled. Attempts
+        (429 retries, hedges) are sent without the caller's task, agent and
+        callbacks; crewai's call events and the token callbacks are emitted
+        here once per request, for the attempt that answered.
+        """
+        messages, tools, callbacks, available_functions, from_task, from_agent = args
+
+        def attempt(cancelled: Optional[threading.Event]):
+            usage = _UsageCapture()
+            silent = (messages, tools, [usage], available_functions, None, None)
+            owner = (from_task, from_agent)
+            return self._limited_call(silent, cancelled, key, owner), usage
+
+        hedge_policy = self.hedge_policy
+        hedged = hedge_policy is not None and hedge_policy.enabled
+        crewai_event_bus.emit(
+            self,
+            event=LLMCallStartedEvent(
+                messages=messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            ),
+        )
+        try:
+            response, usage = hedge_policy.run(attempt) if hedged else attempt(None)
+        except Exception as e:
+            crewai_event_bus.emit(
+                self,
+                event=LLMCallFailedEvent(
+                    error=str(e), from_task=from_task, from_agent=from_agent
+                ),
+            )
+            raise
+        for callback in callbacks or []:
+            if usage.usage is not None and hasattr(callback, "log_success_event"):
+                callback.log_success_event(
+                    kwargs={},
+                    response_obj={"usage": usage.usage},
+                    start_time=0,
+                    end_time=0,
+                )
+        crewai_event_bus.emit(
+            self,
+            event=LLMCallCompletedEvent(
+                messages=messages,
+                response=response,
+                call_type=LLMCallType.LLM_CALL,
+                from_task=from_task,
+                from_agent=from_agent,
+            ),
+        )
+        return response
+
+    def _limited_call(
+        self,
+        args: tuple,
+        cancelled: Optional[threading.Event] = None,
+        key: Optional[str] = None,
+        owner: Optional[tuple] = None,
+    ) -> Union[str, Any]:
+        """
+        Sends the request once `rate_limiter` admits it, queued under `key`
+        (by default the caller's crew). 429s are retried here after the
+        limiter's pause instead of surfacing to the agent's own retry loop,
+        and reported as LLMRetryEvents of `owner` (from_task, from_agent). A
+        hedged attempt whose twin already won is dropped before it is sent,
+        and its limiter charge refunded.
+        """
+        messages, _, _, _, from_task, from_agent = args
+        if owner is not None:
+            from_task, from_agent = owner
+        limiter = self.rate_limiter
+        if limiter is None:
+            if cancelled is not None and cancelled.is_set():
+                raise HedgeCancelled()
+            return self._send(*args)
+
+        if isinstance(messages, str):
+            prompt_tokens = litellm.token_counter(model=self.model, text=messages)
+        else:
+            prompt_tokens = litellm.token_counter(model=self.model, messages=messages)
+        key = key or _fairness_key(from_task, from_agent)
+        for attempt in range(self.max_rate_limit_retries + 1):
+            estimate = limiter.estimate_tokens(prompt_tokens)
+            limiter.acquire(estimate, key)
+            if cancelled is not None and cancelled.is_set():
+                limiter.release(estimate)
+                raise HedgeCancelled()
+            try:
+                response = self._send(*args)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_rate_limit_retries:
+                    raise
+                pause = limiter.record_rate_limited(retry_after_seconds(e))
+                print(f"⏳ Gemini rate limit hit, retrying in {pause:.1f}s...")
+                crewai_event_bus.emit(
+                    self,
+                    event=LLMRetryEvent(
+                        error=str(e),
+                        pause_seconds=pause,
+                        fairness_key=key,
+                        from_task=from_task,
+                        from_agent=from_agent,
+                    ),
+                )
+                continue
+
+            completion_tokens = (
+                litellm.token_counter(model=self.model, text=response)
+                if isinstance(response, str)
+                else 0
+            )
+            limiter.record_completion_tokens(completion_tokens)
+            limiter.record_success(estimate, prompt_tokens + completion_tokens)
+            return response
+
+    def cache_key(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+    ) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        return self.response_cache.key(
+            {
+                "model": self.model,
+                "temperature": self.temperature,
+                "top_p": self.top_p,
+                "max_tokens": self.max_tokens,
+                "stop": self.stop,
+                "messages": messages,
+                "tools": tools,
+            }
+        )
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+        fairness_key: Optional[str] = None,
+    ) -> Union[str, Any]:
+        """
+        `fairness_key` is the rate limiter queue of the request; calls made
+        outside a crew pass one per run (see map_reduce_summary).
+        """
+        call = (messages, tools, callbacks, available_functions, from_task, from_agent)
+        if not self.cache_enabled or available_functions:
+            self.response_cache.bypass()
+            return self._call_model(*call, fairness_key)
+
+        key = self.cache_key(messages, tools)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self._call_model(*call, fairness_key)
+        if isinstance(response, str) and response:
+            self.response_cache.put(key, response)
+        return response
+
+
+class _UsageCapture(CustomLogger):
+    """Token usage of one hedged attempt, as crewai reports it to callbacks."""
+
+    def __init__(self):
+        super().__init__()
+        self.usage = None
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        # litellm's own logging passes the whole response, crewai a dict
+        if isinstance(response_obj, dict) and response_obj.get("usage"):
+            self.usage = response_obj["usage"]
+
+
+def _fairness_key(from_task, from_agent) -> str:
+    """Default rate limiter queue: the caller's crew (one per run), else "direct"."""
+    agent = from_task.agent if from_task is not None else from_agent
+    crew = getattr(agent, "crew", None)
+    return f"crew:{crew.id}" if crew is not None else "direct"
@@ -0,0 +1,176 @@
+"""
+Map-reduce summarization for long meeting transcripts.
+
+The transcript is split into token-budgeted chunks on sentence boundaries.
+Every chunk is reduced to compact notes (summary points, action items, terms)
+by concurrent LLM calls, and one reduce call merges the notes into the
+structured document task1 produces. Wall-clock time grows with
+chunks / max_workers rather than with transcript length, and no single call
+sees more than one chunk of raw transcript.
+"""
+
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from textwrap import dedent
+from typing import Dict, List
+
+import litellm
+
+DEFAULT_MAX_CHUNK_TOKENS = 3000
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+MAP_PROMPT = dedent(
+    """
+    You are reading part {index} of {total} of a meeting transcript.
+    Extract, strictly from this part and without speculation:
+
+    ## Summary Points
+    Main discussion points and decisions, one bullet each.
+
+    ## Action Items
+    One bullet per action: owner, task, deadline (write "unspecified" if not stated).
+
+    ## Terms
+    Technical terms, acronyms, jargon and ambiguous statements worth clarifying,
+    one bullet each with a short definition when the transcript gives one.
+
+    Also note the meeting title, date and attendees if this part mentions them.
+    Answer with the sections above only.
+
+    Transcript part:
+    {chunk}
+    """
+)
+
+REDUCE_PROMPT = dedent(
+    """
+    Below are notes extracted, in order, from consecutive parts of one meeting
+    transcript. Merge them into a single document, removing duplicates and
+    keeping every distinct decision and action item.
+
+    Produce a structured markdown document with the following sections:
+    1. **Meeting Title**
+    2. **Date and Attendance**
+    3. **Meeting Summary**
+    4. **Key Takeaways**
+    5. **Action Items** — owner, task and deadline
+    6. **Insights and Clarifications (MeetingMind Notes)**
+    7. **Glossary of Terms**
+    8. **Helpful Links (if any)** — title, URL, and short description
+
+    Only use information present in the notes.
+
+    Notes:
+    {notes}
+    """
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence for sentence in _SENTENCE_END.split(text.strip()) if sentence]
+
+
+def count_tokens(text: str, model: str) -> int:
+    return litellm.token_counter(model=model, text=text)
+
+
+def chunk_transcript(text: str, max_tokens: int, model: str) -> List[str]:
+    """
+    Greedily packs whole sentences into chunks of at most `max_tokens`.
+    A single sentence longer than the budget (e.g. unpunctuated speech) is
+    split on words.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for sentence in split_sentences(text):
+        tokens = count_tokens(sentence, model)
+        if tokens > max_tokens:
+            words = sentence.split()
+            # Approximate: split evenly so each piece fits the budget
+            pieces = -(-tokens // max_tokens)
+            step = -(-len(words) // pieces)
+            parts = [" ".join(words[i : i + step]) for i in range(0, len(words), step)]
+        else:
+            parts = [sentence]
+
+        for part in parts:
+            part_tokens = tokens if len(parts) == 1 else count_tokens(part, model)
+            if current and current_tokens + part_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _call(llm, prompt: str, stage: str, recorder=None, fairness_key=None) -> str:
+    if recorder is None:
+        return llm.call(prompt, fairness_key=fairness_key)
+    with recorder.llm_call(stage, fairness_key) as record:
+        record.prompt_tokens = count_tokens(prompt, llm.model)
+        response = llm.call(prompt, fairness_key=fairness_key)
+        record.completion_tokens = count_tokens(response or "", llm.model)
+    return response
+
+
+def map_chunk(
+    llm, chunk: str, index: int, total: int, recorder=None, fairness_key=None
+) -> str:
+    prompt = MAP_PROMPT.format(index=index, total=total, chunk=chunk)
+    return _call(llm, prompt, "map_reduce:map", recorder, fairness_key)
+
+
+def reduce_notes(llm, notes: List[str], recorder=None, fairness_key=None) -> str:
+    joined = "\n\n".join(
+        f"### Part {i + 1}\n{note.strip()}" for i, note in enumerate(notes)
+    )
+    prompt = REDUCE_PROMPT.format(notes=joined)
+    return _call(llm, prompt, "map_reduce:reduce", recorder, fairness_key)
+
+
+def map_reduce_config(llm, max_chunk_tokens: int = DEFAULT_MAX_CHUNK_TOKENS) -> Dict:
+    """Everything that shapes map_reduce_summary's output, for checkpoint keys."""
+    return {
+        "stage": "map_reduce",
+        "map_prompt": MAP_PROMPT,
+        "reduce_prompt": REDUCE_PROMPT,
+        "model": llm.model,
+        "temperature": llm.temperature,
+        "max_chunk_tokens": max_chunk_tokens,
+    }
+
+
+def map_reduce_summary(
+    meeting_transcript: str,
+    llm,
+    max_chunk_tokens: int = DEFAULT_MAX_CHUNK_TOKENS,
+    max_workers: int = 4,
+    recorder=None,
+) -> str:
+    """
+    Returns the task1 meeting document for `meeting_transcript`, built from
+    per-chunk notes extracted concurrently (at most `max_workers` calls in
+    flight) and merged by a single reduce call. Calls are timed on `recorder`
+    (a crew_agents.instrumentation.RunRecorder) when given. `llm` is a
+    CachedLLM; the calls share one rate limiter queue per summary, so
+    concurrent runs are served in turn.
+    """
+    chunks = chunk_transcript(meeting_transcript, max_chunk_tokens, llm.model)
+    if not chunks:
+        raise ValueError("Meeting transcript is empty")
+
+    key = f"map_reduce:{uuid.uuid4().hex}"
+    print(f"🧩 Summarizing {len(chunks)} transcript chunk(s)...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(map_chunk, llm, chunk, i + 1, len(chunks), recorder, key)
+            for i, chunk in enumerate(chunks)
+        ]
+        notes = [future.result() for future in futures]
+
+    print("🧮 Merging chunk notes...")
+    return reduce_notes(llm, notes, recorder, key)
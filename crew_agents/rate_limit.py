@@ -0,0 +1,237 @@
+"""
+Process-wide adaptive rate limiter for Gemini requests.
+
+Every model request of every agent, crew run and map_reduce stage goes
+through one RateLimiter (see CachedLLM), which keeps two token buckets:
+requests per minute and tokens per minute. Callers wait in per-run queues
+served round-robin, so one large run cannot starve the others. A 429 halves
+the allowed rate and pauses all callers for the server's retry-after (or a
+backoff); every success then raises the rate back step by step (AIMD).
+Queue depth, wait times and 429 counts are exported with the other metrics
+in crew_agents.instrumentation.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_RPM = 1000
+DEFAULT_TPM = 1_000_000
+WAIT_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+_RETRY_DELAY = re.compile(r"retry[-_ ]?(?:after|delay)\D{0,5}(\d+(?:\.\d+)?)", re.I)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    return (
+        getattr(error, "status_code", None) == 429
+        or type(error).__name__ == "RateLimitError"
+        or "RESOURCE_EXHAUSTED" in str(error)
+    )
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Server-requested delay from a 429's Retry-After header or Gemini's retryDelay."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        if value is not None:
+            return float(value)
+    except (TypeError, ValueError):
+        pass
+    match = _RETRY_DELAY.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_RPM,
+        tokens_per_minute: float = DEFAULT_TPM,
+        min_rate_factor: float = 0.05,
+        recovery_step: float = 0.05,
+        default_backoff: float = 5.0,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.min_rate_factor = min_rate_factor
+        self.recovery_step = recovery_step
+        self.default_backoff = default_backoff
+
+        self._cond = threading.Condition()
+        self._rate_factor = 1.0
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        # Fair queuing: one FIFO per run key, keys served round-robin
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._completion_estimate = 500.0
+
+        self._stats = {
+            "requests": 0,
+            "tokens": 0,
+            "rate_limited": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "max_queue_depth": 0,
+        }
+        self._wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        factor = self._rate_factor / 60.0
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.requests_per_minute * factor,
+        )
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self.tokens_per_minute * factor,
+        )
+
+    def _delay(self, tokens: float, now: float) -> float:
+        """Seconds until one request of `tokens` fits both buckets."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        factor = self._rate_factor / 60.0
+        request_delay = (1 - self._requests) / (self.requests_per_minute * factor)
+        token_delay = (tokens - self._tokens) / (self.tokens_per_minute * factor)
+        return max(0.0, request_delay, token_delay)
+
+    def _head(self):
+        if not self._queues:
+            return None
+        return next(iter(self._queues.values()))[0]
+
+    def estimate_tokens(self, prompt_tokens: int) -> int:
+        return int(prompt_tokens + self._completion_estimate)
+
+    def acquire(self, tokens: int, key: str = "default") -> float:
+        """
+        Blocks until a request of about `tokens` tokens may be sent; returns
+        the seconds waited. Requests larger than the whole TPM budget are
+        charged as the full budget.
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        waiter = object()
+        start = time.monotonic()
+        with self._cond:
+            self._queues.setdefault(key, deque()).append(waiter)
+            depth = self.queue_depth()
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._head() is waiter:
+                    delay = self._delay(tokens, now)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+
+            self._requests -= 1
+            self._tokens -= tokens
+            queue = self._queues.pop(key)
+            queue.popleft()
+            if queue:
+                self._queues[key] = queue  # back of the rotation
+            self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._stats["requests"] += 1
+            self._stats["tokens"] += tokens
+            self._stats["wait_seconds"] += waited
+            self._stats["max_wait_seconds"] = max(
+                self._stats["max_wait_seconds"], waited
+            )
+            bucket = next(
+                (i for i, bound in enumerate(WAIT_BUCKETS) if waited <= bound),
+                len(WAIT_BUCKETS),
+            )
+            self._wait_buckets[bucket] += 1
+        return waited
+
+    def release(self, tokens: int) -> None:
+        """Refunds an acquired request of `tokens` that was never sent."""
+        tokens = min(tokens, self.tokens_per_minute)
+        with self._cond:
+            self._requests = min(self.requests_per_minute, self._requests + 1)
+            self._tokens = min(self.tokens_per_minute, self._tokens + tokens)
+            self._stats["requests"] -= 1
+            self._stats["tokens"] -= tokens
+            self._cond.notify_all()
+
+    def record_success(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Settles the token charge with the real usage and recovers the rate."""
+        with self._cond:
+            self._tokens += estimated_tokens - actual_tokens
+            self._stats["tokens"] += actual_tokens - estimated_tokens
+            self._rate_factor = min(1.0, self._rate_factor + self.recovery_step)
+            self._cond.notify_all()
+
+    def record_completion_tokens(self, completion_tokens: int) -> None:
+        with self._cond:
+            self._completion_estimate = (
+                0.8 * self._completion_estimate + 0.2 * completion_tokens
+            )
+
+    def record_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """Halves the rate and pauses every caller; returns the pause in seconds."""
+        pause = retry_after if retry_after is not None else self.default_backoff
+        with self._cond:
+            self._stats["rate_limited"] += 1
+            self._rate_factor = max(self.min_rate_factor, self._rate_factor / 2)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            # Drain the buckets so the halved rate applies from now on
+            self._requests = min(self._requests, 0.0)
+            self._cond.notify_all()
+        return pause
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_depth"] = self.queue_depth()
+            stats["rate_factor"] = self._rate_factor
+            stats["effective_rpm"] = self.requests_per_minute * self._rate_factor
+            stats["effective_tpm"] = self.tokens_per_minute * self._rate_factor
+        return stats
+
+    def samples(self) -> Iterable[Tuple[str, str, Dict[str, str], float]]:
+        """(name, type, labels, value) samples for MetricsRegistry.to_prometheus."""
+        stats = self.stats()
+        prefix = "meetingmind_llm_ratelimit"
+        yield f"{prefix}_queue_depth", "gauge", {}, stats["queue_depth"]
+        yield f"{prefix}_max_queue_depth", "gauge", {}, stats["max_queue_depth"]
+        yield f"{prefix}_effective_rpm", "gauge", {}, stats["effective_rpm"]
+        yield f"{prefix}_effective_tpm", "gauge", {}, stats["effective_tpm"]
+        yield f"{prefix}_requests_total", "counter", {}, stats["requests"]
+        yield f"{prefix}_tokens_total", "counter", {}, stats["tokens"]
+        yield f"{prefix}_429_total", "counter", {}, stats["rate_limited"]
+        with self._cond:
+            counts = list(self._wait_buckets)
+        cumulative = 0
+        bounds: List[str] = [f"{bound:g}" for bound in WAIT_BUCKETS] + ["+Inf"]
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            yield f"{prefix}_wait_seconds_bucket", "histogram", {
+                "le": bound
+            }, cumulative
+        yield f"{prefix}_wait_seconds_sum", "histogram", {}, stats["wait_seconds"]
+        yield f"{prefix}_wait_seconds_count", "histogram", {}, stats["requests"]
+
+
+gemini_rate_limiter = RateLimiter(
+    requests_per_minute=float(os.getenv("MEETINGMIND_GEMINI_RPM", DEFAULT_RPM)),
+    tokens_per_minute=float(os.getenv("MEETINGMIND_GEMINI_TPM", DEFAULT_TPM)),
+)
@@ -0,0 +1,208 @@
+"""
+Per-meeting in-memory retrieval over transcript chunks.
+
+TranscriptIndex splits a transcript into overlapping sentence-aligned chunks
+and ranks them with BM25 over an inverted index held in numpy arrays, so a
+multi-hour meeting indexes in well under a second. With `embeddings=True`
+the chunks are also embedded into an in-memory chromadb collection (its
+default local ONNX model) and both rankings are merged by reciprocal rank
+fusion. Agents query it through crew_tools.transcript_search.
+"""
+
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+_SENTENCE = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+_WORD = re.compile(r"\S+")
+_TERM = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    """a an and are as at be but by for from has have he i if in is it its of on
+    or so that the their them they this to was we were what when which who will
+    with you your our us do did not no yes just""".split()
+)
+
+
+class Passage(NamedTuple):
+    chunk_id: int
+    text: str
+    score: float
+    start: int  # character offsets in the indexed transcript
+    end: int
+
+
+def terms(text: str) -> List[str]:
+    return [
+        term
+        for term in _TERM.findall(text.lower())
+        if term not in STOPWORDS and len(term) > 1
+    ]
+
+
+def sentence_spans(
+    text: str, max_words: int, piece_words: Optional[int] = None
+) -> List[Tuple[int, int, int]]:
+    """
+    (start, end, words) per sentence of `text`. A sentence longer than
+    `max_words` (e.g. unpunctuated Speech-to-Text output) is split on word
+    boundaries into even pieces of at most `piece_words` (default
+    `max_words`) words.
+    """
+    piece_words = piece_words or max_words
+    spans = []
+    for match in _SENTENCE.finditer(text):
+        words = [(w.start(), w.end()) for w in _WORD.finditer(match.group())]
+        if not words:
+            continue
+        if len(words) <= max_words:
+            spans.append((match.start(), match.end(), len(words)))
+            continue
+        pieces = -(-len(words) // piece_words)
+        step = -(-len(words) // pieces)
+        for i in range(0, len(words), step):
+            piece = words[i : i + step]
+            end = (
+                match.end() if i + step >= len(words) else piece[-1][1] + match.start()
+            )
+            spans.append((match.start() + piece[0][0], end, len(piece)))
+    return spans
+
+
+def chunk_spans(text: str, chunk_words: int = 120, overlap_words: int = 30):
+    """
+    (start, end) character spans of chunks of whole sentences holding about
+    `chunk_words` words; consecutive chunks share about `overlap_words`.
+    Sentences longer than `overlap_words` are split on words first.
+    """
+    # Pieces of oversized sentences are small enough to overlap
+    sentences = sentence_spans(text, overlap_words or chunk_words)
+    spans = []
+    i = 0
+    while i < len(sentences):
+        j, words = i, 0
+        while j < len(sentences) and (
+            words == 0 or words + sentences[j][2] <= chunk_words
+        ):
+            words += sentences[j][2]
+            j += 1
+        spans.append((sentences[i][0], sentences[j - 1][1]))
+        if j >= len(sentences):
+            break
+        # Step back over trailing sentences so the next chunk overlaps this one
+        back, k = 0, j
+        while k - 1 > i and back + sentences[k - 1][2] <= overlap_words:
+            k -= 1
+            back += sentences[k][2]
+        i = k
+    return spans
+
+
+class TranscriptIndex:
+    def __init__(
+        self,
+        text: str,
+        chunk_words: int = 120,
+        overlap_words: int = 30,
+        embeddings: bool = False,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.text = text
+        self.spans = chunk_spans(text, chunk_words, overlap_words)
+        self.chunks = [text[start:end].strip() for start, end in self.spans]
+        self.k1, self.b = k1, b
+        self._build_bm25()
+        self._collection = self._build_embeddings() if embeddings else None
+
+    def _build_bm25(self) -> None:
+        postings: Dict[str, List] = defaultdict(list)
+        lengths = np.zeros(len(self.chunks), dtype=np.float64)
+        for chunk_id, chunk in enumerate(self.chunks):
+            counts = Counter(terms(chunk))
+            lengths[chunk_id] = sum(counts.values())
+            for term, tf in counts.items():
+                postings[term].append((chunk_id, tf))
+
+        n = len(self.chunks)
+        avg_length = lengths.mean() if n else 0.0
+        # Length normalization of every chunk, shared by all terms
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(avg_length, 1e-9))
+        self._postings = {}
+        for term, entries in postings.items():
+            ids = np.fromiter(
+                (c for c, _ in entries), dtype=np.int64, count=len(entries)
+            )
+            tf = np.fromiter(
+                (t for _, t in entries), dtype=np.float64, count=len(entries)
+            )
+            idf = math.log(1 + (n - len(entries) + 0.5) / (len(entries) + 0.5))
+            # Precomputed BM25 weight of the term in each chunk
+            self._postings[term] = (ids, idf * tf * (self.k1 + 1) / (tf + norm[ids]))
+
+    def _build_embeddings(self):
+        import uuid
+
+        import chromadb
+
+        client = chromadb.EphemeralClient()
+        collection = client.create_collection(f"meeting-{uuid.uuid4().hex}")
+        if self.chunks:
+            collection.add(
+                ids=[str(i) for i in range(len(self.chunks))], documents=self.chunks
+            )
+        return collection
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.chunks), dtype=np.float64)
+        for term in set(terms(query)):
+            entry = self._postings.get(term)
+            if entry is not None:
+                np.add.at(scores, entry[0], entry[1])
+        return scores
+
+    def search(self, query: str, top_k: int = 5) -> List[Passage]:
+        if not self.chunks:
+            return []
+        scores = self.bm25_scores(query)
+        candidates = np.argsort(-scores, kind="stable")
+        if self._collection is None:
+            ranked = [(int(i), float(scores[i])) for i in candidates if scores[i] > 0]
+        else:
+            ranked = self._fuse(query, candidates, scores, top_k)
+        return [
+            Passage(i, self.chunks[i], score, *self.spans[i])
+            for i, score in ranked[:top_k]
+        ]
+
+    def _fuse(self, query: str, candidates, scores, top_k: int, k: int = 60):
+        """Reciprocal rank fusion of the BM25 and embedding rankings."""
+        depth = min(len(self.chunks), max(top_k * 4, 20))
+        result = self._collection.query(query_texts=[query], n_results=depth)
+        fused: Dict[int, float] = defaultdict(float)
+        for rank, i in enumerate(int(i) for i in candidates[:depth] if scores[i] > 0):
+            fused[i] += 1 / (k + rank + 1)
+        for rank, i in enumerate(int(i) for i in result["ids"][0]):
+            fused[i] += 1 / (k + rank + 1)
+        return sorted(fused.items(), key=lambda item: -item[1])
+
+
+def build_index(
+    meeting_transcript: str, embeddings: Optional[bool] = None, **kwargs
+) -> TranscriptIndex:
+    """
+    Index for one meeting. Embeddings are on by default when
+    MEETINGMIND_TRANSCRIPT_EMBEDDINGS=on; they need chromadb's local model,
+    and if it cannot be loaded the index falls back to BM25 only.
+    """
+    if embeddings is None:
+        embeddings = os.getenv("MEETINGMIND_TRANSCRIPT_EMBEDDINGS", "off") == "on"
+    if embeddings:
+        try:
+            return TranscriptIndex(meeting_transcript, embeddings=True, **kwargs)
+        except Exception as e:
+            print(f"⚠️ Embedding index unavailable ({e}), using BM25 only")
+    return TranscriptIndex(meeting_transcript, **kwargs)
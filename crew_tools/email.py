@@ -1,15 +1,30 @@
 import json
 import os
 import smtplib
+import threading
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, field_validator
 
+# Caps concurrent SMTP sessions across crews (see set_smtp_concurrency)
+_smtp_slots = threading.BoundedSemaphore(
+    int(os.getenv("MEETINGMIND_SMTP_CONCURRENCY", "2"))
+)
+
+
+# The tool's output for a delivered email; anything else means it was not sent
+EMAIL_SENT = "Email sent successfully!"
+
+
+def set_smtp_concurrency(max_sessions: int) -> None:
+    global _smtp_slots
+    _smtp_slots = threading.BoundedSemaphore(max_sessions)
+
 
 class ToolParameters(BaseModel):
     subject: str
@@ -41,6 +56,8 @@ class SendEmailTool(BaseTool):
         "Sends an email with subject, HTML body, optional CC, BCC, and attachments to fixed recipients."
     )
     args_schema: Optional[type] = ToolParameters
+    # A retried send must reach the SMTP server, not crewai's tool cache
+    cache_function: Callable = lambda _args=None, _result=None: False
 
     # ✅ Hardcoded SMTP Config (use env vars or secrets manager in prod)
     smtp_server: str = os.getenv("SMTP_SERVER", "mail.smtp2go.com")
@@ -88,12 +105,12 @@ class SendEmailTool(BaseTool):
 
             all_recipients = self.fixed_recipients + cc + bcc
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            with _smtp_slots, smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 server.starttls()
                 server.login(self.smtp_user, self.smtp_password)
                 server.sendmail(self.sender_email, all_recipients, message.as_string())
 
-            return "Email sent successfully!"
+            return EMAIL_SENT
         except Exception as e:
             return f"Failed to send email: {str(e)}"
 
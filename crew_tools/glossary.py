@@ -0,0 +1,37 @@
+from typing import Any, Optional
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+
+class GlossaryLookupParameters(BaseModel):
+    terms: str = Field(
+        ...,
+        description="Comma-separated terms or acronyms to look up, e.g. 'SLA, PowerBI, churn rate'",
+    )
+
+
+class GlossaryLookupTool(BaseTool):
+    name: str = "glossary_lookup"
+    description: str = (
+        "Looks terms up in the glossary of definitions collected from past meetings. "
+        "Returns the known definitions with their sources and lists the unknown terms. "
+        "Use it before searching the web, and only search for the terms it reports as unknown."
+    )
+    args_schema: Optional[type] = GlossaryLookupParameters
+    store: Any = None  # crew_agents.glossary.GlossaryStore, set by get_tool
+
+    def _run(self, terms: str) -> str:
+        known, unknown = self.store.lookup_many(terms.split(","))
+        lines = []
+        for match in known:
+            entry = match.entry
+            name = entry.term if match.score == 1.0 else f"{entry.term} (closest match)"
+            sources = f" Sources: {', '.join(entry.sources)}" if entry.sources else ""
+            lines.append(f"- {match.query} → **{name}**: {entry.definition}{sources}")
+        if unknown:
+            lines.append(f"Unknown terms (search these): {', '.join(unknown)}")
+        return "\n".join(lines) or "No terms given."
+
+
+glossary_tool = GlossaryLookupTool()
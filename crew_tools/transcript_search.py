@@ -0,0 +1,32 @@
+from typing import Any, Optional
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+
+class TranscriptSearchParameters(BaseModel):
+    query: str = Field(
+        ...,
+        description="Keywords or a question describing the passages to find, e.g. 'will send deadline next week'",
+    )
+    top_k: int = Field(5, description="Number of passages to return (1-10)")
+
+
+# One tool per meeting: it is bound to that meeting's TranscriptIndex
+class TranscriptSearchTool(BaseTool):
+    name: str = "meeting_transcript_search"
+    description: str = (
+        "Searches the current meeting transcript and returns the most relevant passages, best match first. "
+        "Use it to find commitments, decisions, questions or technical terms without rereading the whole transcript."
+    )
+    args_schema: Optional[type] = TranscriptSearchParameters
+    index: Any = None  # crew_agents.retrieval.TranscriptIndex
+
+    def _run(self, query: str, top_k: int = 5) -> str:
+        passages = self.index.search(query, top_k=max(1, min(int(top_k), 10)))
+        if not passages:
+            return f"No passages in the transcript match '{query}'."
+        return "\n\n".join(
+            f"[Passage {rank + 1}, chars {p.start}-{p.end}]\n{p.text}"
+            for rank, p in enumerate(passages)
+        )
@@ -1,11 +1,23 @@
 import json
 import os
-from typing import Optional
+import threading
+from typing import Any, Optional
 
 import requests
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+# requests sessions are not guaranteed thread-safe, so each thread keeps its own
+# (and its pooled connections) across searches and crews
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
 
 class SerperToolParameters(BaseModel):
     query: str = Field(..., description="The search query to find relevant results")
@@ -18,13 +30,30 @@ class SerperSearchTool(BaseTool):
     )
     args_schema: Optional[type] = SerperToolParameters
     serper_api_key: str  # Must be passed when instantiating the tool
+    # Queries for a term already defined in past meetings are answered from it;
+    # set by crew_agents.agents_and_task.get_tool
+    glossary: Any = None  # crew_agents.glossary.GlossaryStore
 
     def _run(self, query: str) -> str:
+        match = self.glossary.lookup_query(query) if self.glossary else None
+        if match is not None:
+            entry = match.entry
+            return json.dumps(
+                [
+                    {
+                        "title": f"{entry.term} (MeetingMind glossary)",
+                        "link": entry.sources[0] if entry.sources else "",
+                        "snippet": entry.definition,
+                    }
+                ],
+                indent=2,
+            )
+
         url = "https://google.serper.dev/search"
         payload = json.dumps({"q": query})
         headers = {"X-API-KEY": self.serper_api_key, "content-type": "application/json"}
 
-        response = requests.post(url, headers=headers, data=payload)
+        response = _session().post(url, headers=headers, data=payload)
 
         try:
             results = response.json().get("organic", [])
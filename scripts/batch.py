@@ -0,0 +1,289 @@
+"""
+Batch backfill of recorded meetings: transcription and the crew over a worker pool.
+
+    python -m scripts.batch gs://bucket/meetings/a.mp4 gs://bucket/meetings/b.mp4
+    python -m scripts.batch --prefix gs://bucket/meetings/ --workers 8 --mode dag
+    python -m scripts.batch --uri-file uris.txt --recognizer-concurrency 4 \
+        --llm-concurrency 6 --smtp-concurrency 1
+
+Each meeting is transcribed (long-running recognition, cached), compacted
+(scripts.compaction) and run through crew_launch. Recognitions, Gemini
+requests and SMTP sessions have separate concurrency limits, so e.g. a slow
+recognizer does not keep Gemini idle. Progress is recorded per URI in a
+JSON manifest; rerunning the same command after a crash skips finished
+meetings, waits on recognitions that are still running instead of
+resubmitting them, and resumes crews from their task checkpoints. A meeting whose email was not sent is recorded as failed,
+so --retry-failed sends it again.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+
+DEFAULT_MANIFEST_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "meetingmind", "batch_manifest.json"
+)
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv")
+
+PENDING = "pending"
+TRANSCRIBING = "transcribing"
+TRANSCRIBED = "transcribed"
+DONE = "done"
+FAILED = "failed"
+
+
+class BatchManifest:
+    """
+    Per-URI progress of a batch, rewritten atomically on every update so a
+    crash never leaves a partial manifest.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self._entries: Dict[str, Dict] = json.load(f)
+        except FileNotFoundError:
+            self._entries = {}
+
+    def get(self, uri: str) -> Dict:
+        with self._lock:
+            return dict(self._entries.get(uri, {"status": PENDING}))
+
+    def update(self, uri: str, **fields) -> None:
+        with self._lock:
+            self._entries.setdefault(uri, {"status": PENDING}).update(fields)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def unfinished(self, uris: List[str], retry_failed: bool = False) -> List[str]:
+        skip = (DONE,) if retry_failed else (DONE, FAILED)
+        return [uri for uri in uris if self.get(uri)["status"] not in skip]
+
+    def counts(self, uris: List[str]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for uri in uris:
+            status = self.get(uri)["status"]
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+
+def list_videos(prefix_uri: str) -> List[str]:
+    """gs:// URIs of the videos under `prefix_uri`, in name order."""
+    from scripts import clients
+
+    if not prefix_uri.startswith("gs://"):
+        raise ValueError(f"Expected a gs:// prefix, got {prefix_uri!r}")
+    bucket_name, _, prefix = prefix_uri[len("gs://") :].partition("/")
+    blobs = clients.get_storage_client().list_blobs(bucket_name, prefix=prefix)
+    return sorted(
+        f"gs://{bucket_name}/{blob.name}"
+        for blob in blobs
+        if blob.name.lower().endswith(VIDEO_EXTENSIONS)
+    )
+
+
+def transcribe(
+    uri: str,
+    manifest: BatchManifest,
+    recognizer_slots: threading.Semaphore,
+    credentials_path: str,
+) -> str:
+    """
+    Transcript text of `uri`. Holds a recognizer slot until the recognition
+    is finished; a job recorded in the manifest by an earlier run is awaited
+    rather than resubmitted.
+    """
+    from scripts.jobs import DONE as JOB_DONE
+    from scripts.utils import get_job_manager, submit_gcs_video
+
+    with recognizer_slots:
+        job = None
+        job_id = manifest.get(uri).get("job_id")
+        if job_id:
+            job = get_job_manager().get(job_id)
+        if job is None:
+            job = submit_gcs_video(uri, google_credentials_path=credentials_path)
+            manifest.update(uri, status=TRANSCRIBING, job_id=job.id)
+        job.wait()
+
+    if job.status != JOB_DONE:
+        raise RuntimeError(f"Transcription failed: {job.error}")
+    return job.result.text
+
+
+def process_meeting(
+    uri: str,
+    manifest: BatchManifest,
+    recognizer_slots: threading.Semaphore,
+    credentials_path: str,
+    mode: str,
+    compact: bool = True,
+) -> Dict:
+    from agent_launch import compact_transcript, crew_launch
+
+    started = time.time()
+    manifest.update(uri, started_at=started, error=None)
+    try:
+        transcript = transcribe(uri, manifest, recognizer_slots, credentials_path)
+        manifest.update(
+            uri,
+            status=TRANSCRIBED,
+            transcript_chars=len(transcript),
+            transcribe_seconds=time.time() - started,
+        )
+        if compact:
+            compacted = compact_transcript(transcript)
+            transcript = compacted.text
+            manifest.update(
+                uri,
+                tokens_before=compacted.tokens_before,
+                tokens_after=compacted.tokens_after,
+            )
+
+        _, report = crew_launch(transcript, mode=mode, resume=True, with_report=True)
+        # A failed send leaves the meeting FAILED; --retry-failed resumes from
+        # the checkpointed summary and only recomposes and sends the email
+        manifest.update(
+            uri,
+            status=DONE if report["email_sent"] else FAILED,
+            error=None if report["email_sent"] else "Meeting email was not sent",
+            email_sent=report["email_sent"],
+            finished_at=time.time(),
+            seconds=time.time() - started,
+            crew_seconds=report["wall_seconds"],
+            llm_calls=sum(a["llm_calls"] for a in report["agents"].values()),
+        )
+    except Exception as e:
+        manifest.update(uri, status=FAILED, error=str(e), finished_at=time.time())
+    return manifest.get(uri)
+
+
+def run_batch(
+    uris: List[str],
+    manifest: BatchManifest,
+    mode: str = "dag",
+    workers: int = 8,
+    recognizer_concurrency: int = 4,
+    llm_concurrency: int = 4,
+    smtp_concurrency: int = 1,
+    credentials_path: str = "secrets/secret.json",
+    retry_failed: bool = False,
+    compact: bool = True,
+) -> Dict[str, int]:
+    from crew_agents import factory
+    from crew_agents.agents_and_task import get_llm
+    from crew_tools.email import set_smtp_concurrency
+    from scripts import clients
+    from scripts.utils import get_job_manager
+
+    todo = manifest.unfinished(uris, retry_failed)
+    print(f"📦 {len(uris)} meeting(s), {len(uris) - len(todo)} already finished")
+    if not todo:
+        return manifest.counts(uris)
+
+    clients.configure(credentials_path)
+    get_job_manager()  # picks up recognitions left running by a crashed batch
+    get_llm().set_max_concurrency(llm_concurrency)
+    set_smtp_concurrency(smtp_concurrency)
+    # Every worker may hold a crew; the LLM limit is what throttles Gemini
+    factory.crew_pool = factory.CrewPool(size=workers)
+    recognizer_slots = threading.BoundedSemaphore(recognizer_concurrency)
+
+    started = time.time()
+    finished = done = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+        futures = {
+            pool.submit(
+                process_meeting,
+                uri,
+                manifest,
+                recognizer_slots,
+                credentials_path,
+                mode,
+                compact,
+            ): uri
+            for uri in todo
+        }
+        for future in as_completed(futures):
+            entry = future.result()
+            finished += 1
+            done += entry["status"] == DONE
+            rate = done / (time.time() - started) * 3600
+            icon = "✅" if entry["status"] == DONE else "❌"
+            print(
+                f"{icon} [{finished}/{len(todo)}] {futures[future]} "
+                f"({entry.get('seconds', 0):.0f}s) — {rate:.1f} meetings/hour"
+            )
+            if entry["status"] == FAILED:
+                print(f"    {entry['error']}")
+
+    elapsed = time.time() - started
+    counts = manifest.counts(uris)
+    print(
+        f"🏁 {done}/{len(todo)} meeting(s) done in {elapsed / 60:.1f} min — "
+        f"{done / elapsed * 3600:.1f} meetings/hour; totals {counts}"
+    )
+    return counts
+
+
+def main():
+    from agent_launch import CREW_MODES
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("uris", nargs="*", help="gs:// video URIs")
+    parser.add_argument("--prefix", help="process every video under this gs:// prefix")
+    parser.add_argument("--uri-file", help="file with one gs:// URI per line")
+    parser.add_argument("--mode", choices=CREW_MODES, default="dag")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--recognizer-concurrency", type=int, default=4)
+    parser.add_argument("--llm-concurrency", type=int, default=4)
+    parser.add_argument("--smtp-concurrency", type=int, default=1)
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST_PATH)
+    parser.add_argument("--credentials", default="secrets/secret.json")
+    parser.add_argument("--retry-failed", action="store_true")
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="pass raw transcripts to the crew (see scripts.compaction)",
+    )
+    args = parser.parse_args()
+
+    uris: List[str] = list(args.uris)
+    if args.uri_file:
+        with open(args.uri_file) as f:
+            uris += [line.strip() for line in f if line.strip()]
+    if args.prefix:
+        from scripts import clients
+
+        clients.configure(args.credentials)
+        uris += list_videos(args.prefix)
+    uris = list(dict.fromkeys(uris))
+    if not uris:
+        parser.error("no meetings given, pass URIs, --uri-file or --prefix")
+
+    counts = run_batch(
+        uris,
+        BatchManifest(args.manifest),
+        mode=args.mode,
+        workers=args.workers,
+        recognizer_concurrency=args.recognizer_concurrency,
+        llm_concurrency=args.llm_concurrency,
+        smtp_concurrency=args.smtp_concurrency,
+        credentials_path=args.credentials,
+        retry_failed=args.retry_failed,
+        compact=not args.no_compact,
+    )
+    raise SystemExit(1 if counts.get(FAILED) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compares audio bytes uploaded and end-to-end latency per recognizer encoding.
+
+    python -m scripts.bench_audio_encodings meeting.mp4
+    python -m scripts.bench_audio_encodings meeting.mp4 --bucket tes-cloudera \
+        --credentials secrets/secret.json
+
+Without --bucket only the local extraction leg is measured.
+"""
+
+import argparse
+import os
+import time
+from typing import Optional
+
+from scripts import clients
+from scripts.utils import AUDIO_FORMATS, extract_audio_ffmpeg, upload_to_gcs
+
+
+def bench_encoding(
+    video_path: str,
+    encoding: str,
+    sample_rate_hz: int,
+    bucket_name: Optional[str] = None,
+    language_code: str = "en-US",
+    model: str = "video",
+) -> dict:
+    row = {"encoding": encoding}
+
+    start = time.perf_counter()
+    audio_path = extract_audio_ffmpeg(video_path, sample_rate_hz, encoding)
+    row["extract_s"] = time.perf_counter() - start
+    row["bytes"] = os.path.getsize(audio_path)
+
+    if bucket_name:
+        from google.cloud import speech
+
+        extension = AUDIO_FORMATS[encoding][1]
+        blob_name = f"bench/{os.path.basename(video_path)}.{extension}"
+
+        start = time.perf_counter()
+        gcs_audio_uri = upload_to_gcs(audio_path, bucket_name, blob_name)
+        row["upload_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding[encoding],
+            sample_rate_hertz=sample_rate_hz,
+            language_code=language_code,
+            model=model,
+        )
+        operation = clients.get_speech_client().long_running_recognize(
+            config=config, audio=speech.RecognitionAudio(uri=gcs_audio_uri)
+        )
+        operation.result(timeout=600)
+        row["recognize_s"] = time.perf_counter() - start
+
+    row["total_s"] = sum(
+        row.get(leg, 0.0) for leg in ("extract_s", "upload_s", "recognize_s")
+    )
+    os.remove(audio_path)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("video_path")
+    parser.add_argument("--bucket", help="GCS bucket for the upload/recognize legs")
+    parser.add_argument("--credentials", help="Service account JSON path")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument(
+        "--encodings", nargs="+", default=list(AUDIO_FORMATS), choices=AUDIO_FORMATS
+    )
+    args = parser.parse_args()
+
+    clients.configure(args.credentials)
+
+    rows = [
+        bench_encoding(args.video_path, encoding, args.sample_rate, args.bucket)
+        for encoding in args.encodings
+    ]
+
+    baseline = rows[0]["bytes"]
+    print(f"{'encoding':<10} {'bytes':>12} {'ratio':>7} {'extract':>8} {'total':>8}")
+    for row in rows:
+        print(
+            f"{row['encoding']:<10} {row['bytes']:>12,} "
+            f"{row['bytes'] / baseline:>7.2f} "
+            f"{row['extract_s']:>7.2f}s {row['total_s']:>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures per-call Google Cloud client overhead, building fresh clients on every
+call (the old behaviour) versus the shared registry in scripts.clients.
+
+    python -m scripts.bench_clients --credentials secrets/secret.json
+    python -m scripts.bench_clients --credentials secrets/secret.json \
+        --bucket tes-cloudera --calls 20
+
+With --bucket each call also performs one cheap metadata request, which
+includes the auth token fetch and connection setup a fresh client pays.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, List, Optional
+
+from scripts import clients
+
+
+def fresh_clients(credentials_path: str):
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
+    from google.cloud import speech, storage
+
+    return storage.Client(), speech.SpeechClient()
+
+
+def pooled_clients(credentials_path: str):
+    clients.configure(credentials_path)
+    return clients.get_storage_client(), clients.get_speech_client()
+
+
+def bench(
+    make_clients: Callable,
+    credentials_path: str,
+    calls: int,
+    bucket_name: Optional[str],
+) -> List[float]:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        storage_client, _ = make_clients(credentials_path)
+        if bucket_name:
+            storage_client.bucket(bucket_name).exists()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--credentials", required=True)
+    parser.add_argument("--bucket")
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, make_clients in (("fresh", fresh_clients), ("pooled", pooled_clients)):
+        timings = bench(make_clients, args.credentials, args.calls, args.bucket)
+        print(
+            f"{name:<7} first {timings[0] * 1000:8.1f} ms   "
+            f"median {statistics.median(timings) * 1000:8.1f} ms   "
+            f"total {sum(timings) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compares LLM call latency with and without hedged requests against a local
+fake LLM server with injected stalls (scripts/fake_llm_server.py).
+
+    python -m scripts.bench_hedging
+    python -m scripts.bench_hedging --calls 400 --concurrency 8 --stall-rate 0.05 --stall 4 \
+        --percentile 0.95 --budget 0.1
+
+Each policy runs the same number of calls through CachedLLM (response cache
+and rate limiter off). The report lists p50/p95/p99 latency, the extra
+requests sent and the hedge rate and win rate.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_policy(
+    base_url: str, server, policy, calls: int, concurrency: int
+) -> Dict[str, float]:
+    from crew_agents.llm_cache import CachedLLM
+
+    llm = CachedLLM(
+        model="openai/fake",
+        base_url=base_url,
+        api_key="fake",
+        cache_enabled=False,
+        rate_limiter=None,
+        hedge_policy=policy,
+    )
+
+    def one_call(i: int) -> float:
+        start = time.perf_counter()
+        llm.call(f"Request {i}")
+        return time.perf_counter() - start
+
+    sent_before = server.requests
+    stats_before = policy.stats() if policy is not None else {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(one_call, range(calls)))
+    result = {
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "sent": server.requests - sent_before,
+    }
+    if policy is not None:
+        stats = policy.stats()
+        for stat in ("hedges", "hedge_wins", "budget_denied"):
+            result[stat] = stats[stat] - stats_before[stat]
+        result["hedge_rate"] = result["hedges"] / calls
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--median", type=float, default=0.2)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall", type=float, default=3.0)
+    parser.add_argument("--percentile", type=float, default=0.95)
+    parser.add_argument("--budget", type=float, default=0.1)
+    parser.add_argument("--warmup", type=int, default=40)
+    args = parser.parse_args()
+
+    from crew_agents.hedging import HedgePolicy
+    from scripts.fake_llm_server import serve
+
+    server = serve(median=args.median, stall_rate=args.stall_rate, stall=args.stall)
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+
+    hedged = HedgePolicy(percentile=args.percentile, budget=args.budget, min_delay=0.0)
+    # Seed the latency window so hedging is active from the first measured call
+    run_policy(base_url, server, hedged, args.warmup, args.concurrency)
+
+    for name, policy in (("no hedging", None), ("hedged", hedged)):
+        result = run_policy(base_url, server, policy, args.calls, args.concurrency)
+        line = (
+            f"{name:<11} p50 {result['p50'] * 1000:7.0f} ms  "
+            f"p95 {result['p95'] * 1000:7.0f} ms  p99 {result['p99'] * 1000:7.0f} ms  "
+            f"requests sent {result['sent']}"
+        )
+        if policy is not None:
+            line += (
+                f"  hedge rate {result['hedge_rate']:.1%}"
+                f"  hedge wins {result['hedge_wins']}/{result['hedges']}"
+                f"  budget denied {result['budget_denied']}"
+            )
+        print(line)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
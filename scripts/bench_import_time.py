@@ -0,0 +1,93 @@
+"""
+Measures cold-start import time of the app entry points with `-X importtime`.
+
+    python -m scripts.bench_import_time
+    python -m scripts.bench_import_time --modules agent_launch app --runs 5 --top 8
+
+Each run imports the module in a fresh interpreter (no credentials needed) and
+reports the wall-clock time of the process, the total import time and the
+heaviest direct imports of the module.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """Returns (depth, cumulative_us, module) per `-X importtime` line."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative), name.strip()))
+    return entries
+
+
+def import_once(module: str) -> Tuple[float, List[Tuple[int, int, str]]]:
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("GEMINI_API_KEY", "SERPER_API_KEY")
+    }
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return wall, parse_importtime(result.stderr)
+
+
+def bench(module: str, runs: int, top: int) -> None:
+    walls, totals = [], []
+    children: Dict[str, List[int]] = {}
+    for _ in range(runs):
+        wall, entries = import_once(module)
+        walls.append(wall)
+        target = next(e for e in reversed(entries) if e[0] == 0 and e[2] == module)
+        totals.append(target[1])
+        for depth, cumulative, name in entries:
+            if depth == 1:
+                children.setdefault(name, []).append(cumulative)
+
+    print(
+        f"{module:<14} wall median {statistics.median(walls) * 1000:8.1f} ms   "
+        f"import median {statistics.median(totals) / 1000:8.1f} ms"
+    )
+    heaviest = sorted(
+        ((statistics.median(times), name) for name, times in children.items()),
+        reverse=True,
+    )
+    for cumulative, name in heaviest[:top]:
+        print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=["agent_launch", "app"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        bench(module, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measures TranscriptIndex build and query time on synthetic multi-hour transcripts.
+
+    python -m scripts.bench_retrieval_index
+    python -m scripts.bench_retrieval_index --hours 1 4 8 --runs 5 --embeddings
+
+Transcripts are generated at about 150 spoken words per minute from a fixed
+vocabulary with occasional commitments and jargon, so BM25 has realistic
+term statistics. Embedding builds download chromadb's local model on first
+use.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+from crew_agents.retrieval import TranscriptIndex
+
+WORDS_PER_MINUTE = 150
+COMMON = (
+    "we should look at the numbers again before next quarter and see how the "
+    "customers are responding to the new onboarding flow because last time the "
+    "team thought it was going well but the data said otherwise"
+).split()
+JARGON = "NPS churn ARR SLA onboarding cohort retention pipeline KPI roadmap".split()
+COMMITMENTS = [
+    "I will send the report by Friday.",
+    "Maddie will follow up with the vendor next week.",
+    "Steve is going to own the dashboard migration.",
+]
+QUERIES = [
+    "who will send the report",
+    "churn and retention numbers",
+    "follow up with vendor next week",
+    "dashboard migration owner",
+]
+
+
+def synthetic_transcript(hours: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    sentences: List[str] = []
+    words = 0
+    while words < hours * 60 * WORDS_PER_MINUTE:
+        if rng.random() < 0.03:
+            sentence = rng.choice(COMMITMENTS)
+        else:
+            length = rng.randint(6, 22)
+            tokens = [
+                rng.choice(JARGON) if rng.random() < 0.05 else rng.choice(COMMON)
+                for _ in range(length)
+            ]
+            sentence = " ".join(tokens)
+            sentence = sentence[0].upper() + sentence[1:] + rng.choice([".", ".", "?"])
+        sentences.append(sentence)
+        words += len(sentence.split())
+    return " ".join(sentences)
+
+
+def bench(hours: float, runs: int, embeddings: bool) -> None:
+    text = synthetic_transcript(hours)
+    builds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        index = TranscriptIndex(text, embeddings=embeddings)
+        builds.append(time.perf_counter() - start)
+
+    queries = []
+    for _ in range(runs):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.search(query, top_k=5)
+            queries.append(time.perf_counter() - start)
+
+    print(
+        f"{hours:4g} h  {len(text.split()):>8,} words  {len(index.chunks):>6,} chunks  "
+        f"build median {statistics.median(builds) * 1000:8.1f} ms  "
+        f"query median {statistics.median(queries) * 1000:6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 3, 8])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--embeddings", action="store_true")
+    args = parser.parse_args()
+
+    for hours in args.hours:
+        bench(hours, args.runs, args.embeddings)
+
+
+if __name__ == "__main__":
+    main()
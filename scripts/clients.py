@@ -0,0 +1,75 @@
+"""
+Process-wide Google Cloud clients.
+
+Credentials are loaded once and shared. The Speech client (gRPC, thread-safe)
+is shared by every caller so its channel is reused. Storage clients wrap a
+requests session that is not guaranteed thread-safe, so each thread gets its
+own client built on the shared credentials.
+"""
+
+import threading
+from typing import Optional
+
+from google.cloud import speech, storage
+from google.oauth2 import service_account
+
+_lock = threading.Lock()
+_local = threading.local()
+_credentials_path: Optional[str] = None
+_credentials = None
+_speech_client: Optional[speech.SpeechClient] = None
+# Bumped on reconfiguration so threads drop storage clients built before it
+_generation = 0
+
+
+def configure(credentials_path: Optional[str]) -> None:
+    """
+    Sets the service account JSON used by the shared clients; None falls back
+    to Application Default Credentials. Calling it again with the same path is
+    a no-op, so callers can pass their credentials path on every call.
+    """
+    global _credentials_path, _credentials, _speech_client, _generation
+    if credentials_path == _credentials_path and _generation:
+        return
+    with _lock:
+        if credentials_path == _credentials_path and _generation:
+            return
+        _credentials_path = credentials_path
+        _credentials = None
+        _speech_client = None
+        _generation += 1
+
+
+def get_credentials():
+    global _credentials
+    if _credentials is None and _credentials_path:
+        with _lock:
+            if _credentials is None:
+                _credentials = service_account.Credentials.from_service_account_file(
+                    _credentials_path,
+                    scopes=["https://www.googleapis.com/auth/cloud-platform"],
+                )
+    return _credentials
+
+
+def get_speech_client() -> speech.SpeechClient:
+    global _speech_client
+    if _speech_client is None:
+        credentials = get_credentials()
+        with _lock:
+            if _speech_client is None:
+                _speech_client = speech.SpeechClient(credentials=credentials)
+    return _speech_client
+
+
+def get_storage_client() -> storage.Client:
+    client = getattr(_local, "storage_client", None)
+    if client is None or _local.generation != _generation:
+        credentials = get_credentials()
+        client = storage.Client(
+            credentials=credentials,
+            project=getattr(credentials, "project_id", None),
+        )
+        _local.storage_client = client
+        _local.generation = _generation
+    return client
@@ -0,0 +1,138 @@
+"""
+Deterministic transcript compaction before the crew runs.
+
+Speech-to-Text output carries fillers ("um", "uh"), false starts ("wh-"),
+stuttered words ("the the") and repeated phrases ("we should we should").
+Every agent reads the full transcript on every iteration, so compact()
+drops those in one linear pass over the words and joins the rest with
+single spaces. Repetitions are never collapsed across the end of a sentence,
+so sentence boundaries survive for the chunkers and the candidate miner.
+The compacted text keeps a CompactionMap back to character offsets in the
+original transcript.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+FILLERS = frozenset(
+    ["um", "umm", "uh", "uhh", "uhm", "erm", "er", "ah", "eh", "hmm", "hm", "mm", "mmm"]
+)
+MAX_REPEAT_WORDS = 3  # longest phrase collapsed when repeated back to back
+# Grammatical doubles ("had had") and spoken numbers ("five five five") are kept
+KEEP_REPEATED = frozenset(
+    ["that", "had", "is", "zero", "oh", "one", "two", "three", "four", "five"]
+    + ["six", "seven", "eight", "nine", "ten"]
+)
+
+_WORD = re.compile(r"\S+")
+_EDGE_PUNCTUATION = re.compile(r"^[^\w]+|[^\w]+$")
+_TRAILING_PUNCTUATION = re.compile(r"[^\w]*$")
+_SENTENCE_END = re.compile(r"[.!?][^\w]*$")
+
+
+class CompactionMap:
+    """
+    Maps character offsets in the compacted text back to the original. Kept
+    word i starts at `compacted_starts[i]` in the compacted text and at
+    `original_starts[i]` in the original; both are sorted, so lookups are a
+    binary search.
+    """
+
+    def __init__(self, compacted_starts: np.ndarray, original_starts: np.ndarray):
+        self.compacted_starts = np.asarray(compacted_starts, dtype=np.int64)
+        self.original_starts = np.asarray(original_starts, dtype=np.int64)
+
+    def to_original(self, offset: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        o = np.asarray(offset, dtype=np.int64)
+        if not len(self.compacted_starts):
+            return int(o) if o.ndim == 0 else o
+        word = np.searchsorted(self.compacted_starts, o, side="right") - 1
+        word = np.clip(word, 0, len(self.compacted_starts) - 1)
+        original = self.original_starts[word] + (o - self.compacted_starts[word])
+        return int(original) if original.ndim == 0 else original
+
+
+class CompactedTranscript(NamedTuple):
+    text: str
+    original: str
+    offset_map: CompactionMap
+    removed: Dict[str, int]  # words dropped per rule
+    tokens_before: Optional[int] = None
+    tokens_after: Optional[int] = None
+
+    def original_span(self, start: int, end: int) -> str:
+        """The original text behind compacted text[start:end]."""
+        if end <= start:
+            return ""
+        original_start = self.offset_map.to_original(start)
+        original_end = self.offset_map.to_original(end - 1) + 1
+        return self.original[original_start:original_end]
+
+
+def _normalize(word: str) -> str:
+    return _EDGE_PUNCTUATION.sub("", word).lower()
+
+
+def compact(text: str, model: Optional[str] = None) -> CompactedTranscript:
+    """
+    Compacts `text`. With `model`, tokens before and after are counted with
+    litellm's tokenizer for that model.
+    """
+    kept: List[List] = []  # [original start, word] per kept word
+    normalized: List[str] = []
+    removed = {"fillers": 0, "false_starts": 0, "repetitions": 0}
+
+    for match in _WORD.finditer(text):
+        word = match.group()
+        norm = _normalize(word)
+        if norm in FILLERS:
+            removed["fillers"] += 1
+            continue
+        if word.endswith("-") and len(word) > 1:
+            removed["false_starts"] += 1
+            continue
+        kept.append([match.start(), word])
+        normalized.append(norm)
+        if not norm:
+            continue  # bare punctuation (e.g. "--" between fragments) stays
+
+        # Collapse a phrase of up to MAX_REPEAT_WORDS repeated back to back,
+        # never across the end of a sentence ("the budget. Budget cuts")
+        for n in range(1, MAX_REPEAT_WORDS + 1):
+            phrase = normalized[-n:]
+            if len(normalized) < 2 * n or phrase != normalized[-2 * n : -n]:
+                continue
+            if any(w in KEEP_REPEATED or w.isdigit() for w in phrase):
+                continue
+            if any(_SENTENCE_END.search(w) for _, w in kept[-2 * n : -1]):
+                continue
+            # The first copy stays, with the punctuation that ended the last
+            trailing = _TRAILING_PUNCTUATION.search(kept[-1][1]).group()
+            last = kept[-n - 1]
+            last[1] = _TRAILING_PUNCTUATION.sub("", last[1]) + trailing
+            del kept[-n:]
+            del normalized[-n:]
+            removed["repetitions"] += n
+            break
+
+    words = [word for _, word in kept]
+    compacted_starts = np.zeros(len(words), dtype=np.int64)
+    if words:
+        compacted_starts[1:] = np.cumsum([len(word) + 1 for word in words[:-1]])
+    offset_map = CompactionMap(
+        compacted_starts, np.array([start for start, _ in kept], dtype=np.int64)
+    )
+    compacted = " ".join(words)
+
+    tokens_before = tokens_after = None
+    if model:
+        import litellm
+
+        tokens_before = litellm.token_counter(model=model, text=text)
+        tokens_after = litellm.token_counter(model=model, text=compacted)
+
+    return CompactedTranscript(
+        compacted, text, offset_map, removed, tokens_before, tokens_after
+    )
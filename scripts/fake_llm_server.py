@@ -0,0 +1,106 @@
+"""
+Local OpenAI-compatible chat completions server with injected latency.
+
+    python -m scripts.fake_llm_server --port 8765 --median 0.3 --stall-rate 0.05 --stall 5
+
+Point a crewai/litellm LLM at it with model="openai/fake" and
+base_url="http://127.0.0.1:8765/v1". Each request sleeps for a lognormal
+latency around `median`, and with probability `stall_rate` for `stall`
+seconds instead, mimicking the occasional stalled Gemini call. Used by
+scripts/bench_hedging.py.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        if random.random() < server.stall_rate:
+            time.sleep(server.stall)
+        else:
+            time.sleep(random.lognormvariate(0, server.sigma) * server.median)
+
+        body = json.dumps(
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": server.reply},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 10,
+                    "completion_tokens": 5,
+                    "total_tokens": 15,
+                },
+            }
+        ).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up on this request
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(
+    port: int = 0,
+    median: float = 0.3,
+    sigma: float = 0.25,
+    stall_rate: float = 0.05,
+    stall: float = 5.0,
+    reply: str = "Thought: I now know the final answer\nFinal Answer: ok",
+) -> ThreadingHTTPServer:
+    """Starts the server on a background thread; port 0 picks a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeLLMHandler)
+    server.daemon_threads = True
+    server.median, server.sigma = median, sigma
+    server.stall_rate, server.stall = stall_rate, stall
+    server.reply = reply
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--median", type=float, default=0.3)
+    parser.add_argument("--sigma", type=float, default=0.25)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.median, args.sigma, args.stall_rate, args.stall)
+    print(f"🧪 Fake LLM listening on http://127.0.0.1:{server.server_port}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
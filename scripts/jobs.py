@@ -0,0 +1,362 @@
+"""
+Non-blocking tracking of Speech-to-Text long-running operations.
+
+submit() returns a TranscriptionJob immediately and prepares its audio (e.g.
+download, extraction and upload) on a small worker pool before starting the
+recognition. A single background poller checks every in-flight operation
+with per-job exponential backoff, so one thread tracks many meetings at
+once; finished operations are turned into results on the worker pool, so a
+slow result handler never stalls the polling of other jobs. Operation
+names are persisted to a JSON state file shared by every process (each
+one merges its own jobs into it); resume() picks up unfinished jobs whose
+process has exited. Polls that fail with a non-retryable error (e.g. an
+expired operation) or fail too many times in a row fail the job instead of
+hanging its waiters.
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from google.api_core import exceptions as google_exceptions
+from google.cloud import speech
+
+from scripts import clients
+
+DEFAULT_STATE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "meetingmind", "jobs.json"
+)
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# get_operation errors that retrying cannot fix
+NON_RETRYABLE_ERRORS = (
+    google_exceptions.NotFound,
+    google_exceptions.PermissionDenied,
+    google_exceptions.InvalidArgument,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: state file updates are not locked
+    fcntl = None
+
+
+class Recognition(NamedTuple):
+    """A long-running recognize request, as returned by a job's prepare step."""
+
+    config: Any
+    audio: Any
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class TranscriptionJob:
+    def __init__(
+        self,
+        operation_name: Optional[str],  # None while the audio is being prepared
+        metadata: Optional[Dict] = None,
+        job_id: Optional[str] = None,
+        submitted_at: Optional[float] = None,
+    ):
+        self.id = job_id or uuid.uuid4().hex
+        self.operation_name = operation_name
+        self.metadata = metadata or {}
+        self.submitted_at = submitted_at or time.time()
+        self.status = RUNNING
+        self.result = None
+        self.error: Optional[str] = None
+        self.polls = 0
+        self.poll_failures = 0  # consecutive
+        self._callbacks: List[Callable[["TranscriptionJob"], None]] = []
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, callback: Callable[["TranscriptionJob"], None]):
+        with self._lock:
+            if not self.done:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, status: str, result=None, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"⚠️ Job {self.id} callback failed: {e}")
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "operation_name": self.operation_name,
+            "metadata": self.metadata,
+            "submitted_at": self.submitted_at,
+        }
+
+
+class TranscriptionJobManager:
+    """
+    Tracks long-running recognize operations from one poller thread.
+
+    `result_handler(metadata, response)` turns a finished
+    LongRunningRecognizeResponse into the job result. It runs on the poller
+    thread and is also applied to jobs resumed after a restart, so it must
+    only depend on the job's (JSON-serializable) metadata.
+    """
+
+    def __init__(
+        self,
+        result_handler: Optional[Callable[[Dict, object], object]] = None,
+        state_path: str = DEFAULT_STATE_PATH,
+        initial_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 1.5,
+        max_poll_failures: int = 20,
+        workers: int = 4,
+    ):
+        self.result_handler = result_handler
+        self.state_path = state_path
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_poll_failures = max_poll_failures
+
+        self._jobs: Dict[str, TranscriptionJob] = {}
+        self._intervals: Dict[str, float] = {}
+        self._schedule: List = []  # heap of (next_poll_at, job_id)
+        self._cond = threading.Condition()
+        self._stopped = False
+        # Audio preparation and result handling, off the poller thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="transcription-worker"
+        )
+        self._thread = threading.Thread(
+            target=self._poll_loop, name="transcription-jobs", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self, prepare: Callable[[Dict], Any], metadata: Optional[Dict] = None
+    ) -> TranscriptionJob:
+        """
+        Returns a job right away and runs `prepare(metadata)` on the worker
+        pool. It returns the Recognition to start, or the job's result when
+        no recognition is needed (e.g. a cached transcript), and may add to
+        the metadata handed to `result_handler`.
+        """
+        job = TranscriptionJob(None, metadata)
+        with self._cond:
+            self._jobs[job.id] = job
+        self._executor.submit(self._prepare, job, prepare)
+        return job
+
+    def track(
+        self,
+        operation_name: str,
+        metadata: Optional[Dict] = None,
+        job_id: Optional[str] = None,
+        submitted_at: Optional[float] = None,
+    ) -> TranscriptionJob:
+        job = TranscriptionJob(operation_name, metadata, job_id, submitted_at)
+        with self._cond:
+            self._jobs[job.id] = job
+            self._start_polling(job)
+        return job
+
+    def resume(self) -> List[TranscriptionJob]:
+        """
+        Re-tracks the unfinished jobs recorded in the state file by processes
+        that are no longer running.
+        """
+        resumed = []
+        for entry in self._read_state():
+            if entry["id"] in self._jobs:
+                continue
+            pid = entry.get("pid")
+            if pid is not None and pid != os.getpid() and _process_alive(pid):
+                continue  # still tracked by its own process
+            resumed.append(
+                self.track(
+                    entry["operation_name"],
+                    entry.get("metadata"),
+                    job_id=entry["id"],
+                    submitted_at=entry.get("submitted_at"),
+                )
+            )
+        return resumed
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def status(self) -> Dict[str, int]:
+        with self._cond:
+            jobs = list(self._jobs.values())
+        counts = {RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in jobs:
+            counts[job.status] += 1
+        return counts
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=False)
+
+    def _start_polling(self, job: TranscriptionJob) -> None:
+        # Caller holds self._cond
+        self._intervals[job.id] = self.initial_interval
+        heapq.heappush(
+            self._schedule, (time.monotonic() + self.initial_interval, job.id)
+        )
+        self._save()
+        self._cond.notify()
+
+    def _prepare(self, job: TranscriptionJob, prepare: Callable[[Dict], Any]):
+        try:
+            prepared = prepare(job.metadata)
+            if not isinstance(prepared, Recognition):
+                self._complete(job, DONE, result=prepared)
+                return
+            operation = clients.get_speech_client().long_running_recognize(
+                config=prepared.config, audio=prepared.audio
+            )
+        except Exception as e:
+            print(f"⚠️ Preparing job {job.id} failed: {e}")
+            self._complete(job, FAILED, error=str(e))
+            return
+        with self._cond:
+            job.operation_name = operation.operation.name
+            self._start_polling(job)
+
+    def _read_state(self) -> List[Dict]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _save(self) -> None:
+        """
+        Rewrites this process's entries in the state file and keeps the
+        other processes' ones. Caller holds self._cond.
+        """
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(f"{self.state_path}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = [
+                entry for entry in self._read_state() if entry["id"] not in self._jobs
+            ]
+            # Jobs still preparing have no operation to resume yet
+            entries += [
+                {**job.to_dict(), "pid": os.getpid()}
+                for job in self._jobs.values()
+                if job.status == RUNNING and job.operation_name
+            ]
+            tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.state_path)
+
+    def _poll_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and (
+                    not self._schedule or self._schedule[0][0] > time.monotonic()
+                ):
+                    timeout = (
+                        self._schedule[0][0] - time.monotonic()
+                        if self._schedule
+                        else None
+                    )
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                _, job_id = heapq.heappop(self._schedule)
+                job = self._jobs[job_id]
+
+            self._poll(job)
+
+    def _poll(self, job: TranscriptionJob) -> None:
+        job.polls += 1
+        try:
+            operations = clients.get_speech_client().transport.operations_client
+            operation = operations.get_operation(job.operation_name)
+            job.poll_failures = 0
+        except Exception as e:
+            print(f"⚠️ Polling {job.operation_name} failed: {e}")
+            job.poll_failures += 1
+            if (
+                isinstance(e, NON_RETRYABLE_ERRORS)
+                or job.poll_failures >= self.max_poll_failures
+            ):
+                self._complete(job, FAILED, error=f"Polling failed: {e}")
+                return
+            # Transient poll failures are retried with backoff
+            operation = None
+
+        if operation is None or not operation.done:
+            with self._cond:
+                interval = min(
+                    self._intervals[job.id] * self.backoff, self.max_interval
+                )
+                self._intervals[job.id] = interval
+                heapq.heappush(self._schedule, (time.monotonic() + interval, job.id))
+            return
+        self._executor.submit(self._finish_operation, job, operation)
+
+    def _finish_operation(self, job: TranscriptionJob, operation) -> None:
+        if operation.HasField("error"):
+            status, result, error = FAILED, None, operation.error.message
+        else:
+            response = speech.LongRunningRecognizeResponse.deserialize(
+                operation.response.value
+            )
+            try:
+                result = (
+                    self.result_handler(job.metadata, response)
+                    if self.result_handler
+                    else response
+                )
+                status, error = DONE, None
+            except Exception as e:
+                status, result, error = FAILED, None, str(e)
+        self._complete(job, status, result, error)
+
+    def _complete(self, job: TranscriptionJob, status: str, result=None, error=None):
+        with self._cond:
+            self._intervals.pop(job.id, None)
+            job.status = status  # so _save drops it before callbacks run
+            self._save()
+        job._finish(status, result=result, error=error)
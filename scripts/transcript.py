@@ -0,0 +1,220 @@
+import io
+from typing import BinaryIO, Iterable, List, NamedTuple, Sequence, Union
+
+import numpy as np
+
+# Bump when the .npz layout changes
+NPZ_VERSION = 1
+
+
+class Word(NamedTuple):
+    text: str
+    start_seconds: float
+    end_seconds: float
+    confidence: float = 0.0
+    speaker: int = 0  # Speech-to-Text speaker_tag, 0 when diarization is off
+
+
+class TimedSegment(NamedTuple):
+    words: List[Word]
+    start_seconds: float
+    end_seconds: float
+
+
+class Transcript:
+    """
+    Columnar transcript.
+    Words are stored as one UTF-8 buffer plus byte offsets, next to parallel
+    arrays of start/end times, confidences and speaker tags. Segments are
+    ranges of word indices with their own start/end times, sorted by start, so
+    time -> segment lookups are a binary search.
+    """
+
+    _FIELDS = (
+        "text_utf8",
+        "word_offsets",
+        "word_start",
+        "word_end",
+        "word_confidence",
+        "word_speaker",
+        "segment_offsets",
+        "segment_start",
+        "segment_end",
+    )
+
+    def __init__(
+        self,
+        text_utf8: np.ndarray,
+        word_offsets: np.ndarray,
+        word_start: np.ndarray,
+        word_end: np.ndarray,
+        word_confidence: np.ndarray,
+        word_speaker: np.ndarray,
+        segment_offsets: np.ndarray,
+        segment_start: np.ndarray,
+        segment_end: np.ndarray,
+    ):
+        # word i is text_utf8[word_offsets[i] : word_offsets[i + 1] - 1]
+        self.text_utf8 = text_utf8
+        self.word_offsets = word_offsets
+        self.word_start = word_start
+        self.word_end = word_end
+        self.word_confidence = word_confidence
+        self.word_speaker = word_speaker
+        # segment j covers words segment_offsets[j] : segment_offsets[j + 1]
+        self.segment_offsets = segment_offsets
+        self.segment_start = segment_start
+        self.segment_end = segment_end
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[TimedSegment]) -> "Transcript":
+        segments = [segment for segment in segments if segment.words]
+        words = [word for segment in segments for word in segment.words]
+
+        encoded = [word.text.encode("utf-8") for word in words]
+        word_offsets = np.zeros(len(words) + 1, dtype=np.int64)
+        if encoded:
+            word_offsets[1:] = np.cumsum([len(word) + 1 for word in encoded])
+
+        segment_offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+        if segments:
+            segment_offsets[1:] = np.cumsum(
+                [len(segment.words) for segment in segments]
+            )
+
+        return cls(
+            text_utf8=np.frombuffer(b" ".join(encoded), dtype=np.uint8),
+            word_offsets=word_offsets,
+            word_start=np.array([w.start_seconds for w in words], dtype=np.float32),
+            word_end=np.array([w.end_seconds for w in words], dtype=np.float32),
+            word_confidence=np.array([w.confidence for w in words], dtype=np.float32),
+            word_speaker=np.array([w.speaker for w in words], dtype=np.int16),
+            segment_offsets=segment_offsets,
+            segment_start=np.array(
+                [s.start_seconds for s in segments], dtype=np.float32
+            ),
+            segment_end=np.array([s.end_seconds for s in segments], dtype=np.float32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.word_start)
+
+    @property
+    def num_segments(self) -> int:
+        return len(self.segment_start)
+
+    @property
+    def text(self) -> str:
+        return self.text_utf8.tobytes().decode("utf-8")
+
+    def _text_between(self, first_word: int, last_word: int) -> str:
+        if first_word >= last_word:
+            return ""
+        start = self.word_offsets[first_word]
+        end = self.word_offsets[last_word] - 1
+        return self.text_utf8[start:end].tobytes().decode("utf-8")
+
+    def word(self, i: int) -> Word:
+        return Word(
+            self._text_between(i, i + 1),
+            float(self.word_start[i]),
+            float(self.word_end[i]),
+            float(self.word_confidence[i]),
+            int(self.word_speaker[i]),
+        )
+
+    def segment(self, j: int) -> str:
+        return self._text_between(self.segment_offsets[j], self.segment_offsets[j + 1])
+
+    def segments(self) -> List[str]:
+        return [self.segment(j) for j in range(self.num_segments)]
+
+    def segment_at(self, seconds: float) -> int:
+        """
+        Index of the segment playing at `seconds` (the last one that started
+        at or before it), or -1 before the first segment.
+        """
+        return int(np.searchsorted(self.segment_start, seconds, side="right")) - 1
+
+    def word_at(self, seconds: float) -> int:
+        return int(np.searchsorted(self.word_start, seconds, side="right")) - 1
+
+    def slice(self, start_seconds: float, end_seconds: float) -> "Transcript":
+        """Returns the words starting in [start_seconds, end_seconds)."""
+        first = int(np.searchsorted(self.word_start, start_seconds, side="left"))
+        last = int(np.searchsorted(self.word_start, end_seconds, side="left"))
+
+        byte_start = self.word_offsets[first]
+        byte_end = max(self.word_offsets[last] - 1, byte_start)
+
+        segment_offsets = np.clip(self.segment_offsets, first, last) - first
+        keep = np.flatnonzero(np.diff(segment_offsets) > 0)
+        segment_offsets = np.append(segment_offsets[keep], last - first)
+
+        return Transcript(
+            text_utf8=self.text_utf8[byte_start:byte_end],
+            word_offsets=self.word_offsets[first : last + 1] - byte_start,
+            word_start=self.word_start[first:last],
+            word_end=self.word_end[first:last],
+            word_confidence=self.word_confidence[first:last],
+            word_speaker=self.word_speaker[first:last],
+            segment_offsets=segment_offsets,
+            segment_start=np.maximum(self.segment_start[keep], start_seconds),
+            segment_end=np.minimum(self.segment_end[keep], end_seconds),
+        )
+
+    def map_times(self, to_original) -> "Transcript":
+        """
+        Returns a copy with every time passed through `to_original`, a
+        vectorized function such as scripts.vad.OffsetMap.to_original.
+        """
+        times = [
+            np.asarray(to_original(getattr(self, name)), dtype=np.float32)
+            for name in ("word_start", "word_end", "segment_start", "segment_end")
+        ]
+        return Transcript(
+            self.text_utf8,
+            self.word_offsets,
+            *times[:2],
+            self.word_confidence,
+            self.word_speaker,
+            self.segment_offsets,
+            *times[2:],
+        )
+
+    def to_npz(self, file: Union[str, BinaryIO]) -> None:
+        np.savez_compressed(
+            file,
+            version=np.array(NPZ_VERSION),
+            **{name: getattr(self, name) for name in self._FIELDS},
+        )
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        self.to_npz(buffer)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_npz(cls, file: Union[str, BinaryIO]) -> "Transcript":
+        with np.load(file, allow_pickle=False) as data:
+            if int(data["version"]) != NPZ_VERSION:
+                raise ValueError(f"Unsupported transcript version {data['version']}")
+            return cls(**{name: data[name] for name in cls._FIELDS})
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "Transcript":
+        return cls.from_npz(io.BytesIO(payload))
+
+
+def words_from_text(
+    text: str, start_seconds: float, end_seconds: float
+) -> Sequence[Word]:
+    """
+    Spreads the words of `text` evenly over a time range, for results that
+    came back without word time offsets.
+    """
+    tokens = text.split()
+    if not tokens:
+        return []
+    edges = np.linspace(start_seconds, end_seconds, len(tokens) + 1)
+    return [Word(token, edges[i], edges[i + 1]) for i, token in enumerate(tokens)]
@@ -0,0 +1,158 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from google.api_core.exceptions import NotFound
+
+from scripts.transcript import Transcript
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "meetingmind", "transcripts"
+)
+DEFAULT_MAX_LOCAL_BYTES = 256 * 1024 * 1024
+REMOTE_PREFIX = "transcription"
+
+# Bump when the cached payload format changes
+CACHE_VERSION = 2
+
+
+def media_fingerprint(blob) -> str:
+    """
+    Returns a content hash for a GCS object from its metadata (no download).
+    Composite objects have no MD5, so CRC32C plus size is used instead.
+    """
+    if blob.md5_hash is None and blob.crc32c is None:
+        blob.reload()
+    if blob.md5_hash:
+        return f"md5:{blob.md5_hash}"
+    return f"crc32c:{blob.crc32c}:{blob.size}"
+
+
+def file_fingerprint(path: str, chunk_bytes: int = 1024 * 1024) -> str:
+    """
+    Returns the content hash of a local file in the same form media_fingerprint
+    gives for a GCS object (base64 MD5), so a video keeps its cache key whether
+    it is transcribed from disk or from GCS.
+    """
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b""):
+            digest.update(chunk)
+    return f"md5:{base64.b64encode(digest.digest()).decode('ascii')}"
+
+
+def cache_key(media_hash: str, recognition_config: Dict) -> str:
+    payload = json.dumps(
+        {"version": CACHE_VERSION, "media": media_hash, "config": recognition_config},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranscriptCache:
+    """
+    Two-tier transcript cache: a size-bounded local LRU directory in front of
+    `transcription/{key}.npz` objects in the media's GCS bucket, storing
+    Transcript arrays.
+    Entries are keyed by `cache_key`, so identical media with an identical
+    recognition config share an entry regardless of file name.
+    """
+
+    def __init__(
+        self,
+        local_dir: str = DEFAULT_CACHE_DIR,
+        max_local_bytes: int = DEFAULT_MAX_LOCAL_BYTES,
+    ):
+        self.local_dir = local_dir
+        self.max_local_bytes = max_local_bytes
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "evictions": 0}
+
+    def _local_path(self, key: str) -> str:
+        return os.path.join(self.local_dir, f"{key}.npz")
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def get(self, key: str, bucket=None) -> Optional[Transcript]:
+        local_path = self._local_path(key)
+        try:
+            with open(local_path, "rb") as f:
+                payload = f.read()
+            os.utime(local_path)  # mark as recently used
+            self._count("local_hits")
+            return self._decode(payload)
+        except FileNotFoundError:
+            pass
+
+        if bucket is not None:
+            try:
+                # A missing object raises NotFound, so no separate exists() call
+                payload = bucket.blob(f"{REMOTE_PREFIX}/{key}.npz").download_as_bytes()
+            except NotFound:
+                payload = None
+            if payload is not None:
+                self._count("remote_hits")
+                self._write_local(key, payload)
+                return self._decode(payload)
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, transcript: Transcript, bucket=None) -> None:
+        payload = transcript.to_bytes()
+        self._write_local(key, payload)
+        if bucket is not None:
+            bucket.blob(f"{REMOTE_PREFIX}/{key}.npz").upload_from_string(
+                payload, content_type="application/octet-stream"
+            )
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["local_hits"] + stats["remote_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["local_hits"] + stats["remote_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+    @staticmethod
+    def _decode(payload: bytes) -> Transcript:
+        return Transcript.from_bytes(payload)
+
+    def _write_local(self, key: str, payload: bytes) -> None:
+        os.makedirs(self.local_dir, exist_ok=True)
+        local_path = self._local_path(key)
+        tmp_path = f"{local_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, local_path)
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.local_dir):
+                if entry.name.endswith(".npz"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_bytes <= self.max_local_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                total_bytes -= size
+                self._stats["evictions"] += 1
+
+
+transcript_cache = TranscriptCache(
+    local_dir=os.getenv("MEETINGMIND_CACHE_DIR", DEFAULT_CACHE_DIR)
+)
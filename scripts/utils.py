@@ -1,13 +1,97 @@
+import io
 import os
+import shutil
+import struct
 import subprocess
 import tempfile
-from typing import List, Tuple
+import threading
+import wave
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from google.cloud import speech, storage
 
+from scripts import clients
+from scripts.jobs import DONE, Recognition, TranscriptionJob, TranscriptionJobManager
+from scripts.transcript import TimedSegment, Transcript, Word, words_from_text
+from scripts.transcript_cache import (
+    cache_key,
+    file_fingerprint,
+    media_fingerprint,
+    transcript_cache,
+)
+from scripts.vad import OffsetMap, trim_silence_stream
 
-def extract_audio_ffmpeg(video_path: str, sample_rate_hz: int) -> str:
-    tmp_wav = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+# A single streaming_recognize call accepts roughly five minutes of audio
+STREAMING_LIMIT_SECONDS = 290
+
+# Ranged-read size when piping GCS objects into ffmpeg (bounds memory use)
+DOWNLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+# Resumable upload chunk size for audio of unknown length (multiple of 256 KiB)
+UPLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+# Top-level MP4/MOV boxes an ISO media file may start with, and how many of
+# them to walk with ranged reads looking for moov
+MP4_TOP_LEVEL_BOXES = frozenset(
+    [b"ftyp", b"styp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pdin"]
+)
+MAX_MP4_BOXES = 32
+
+# ffmpeg output arguments, file extension and content type per recognizer encoding
+AUDIO_FORMATS = {
+    "LINEAR16": (["-c:a", "pcm_s16le", "-f", "wav"], "wav", "audio/wav"),
+    "FLAC": (["-c:a", "flac", "-f", "flac"], "flac", "audio/flac"),
+    "OGG_OPUS": (
+        ["-c:a", "libopus", "-b:a", "32k", "-application", "voip", "-f", "ogg"],
+        "ogg",
+        "audio/ogg",
+    ),
+}
+# WAV headers cannot be finalized on a pipe, so piped LINEAR16 is headerless PCM
+PIPE_LINEAR16_FORMAT = (["-f", "s16le"], "pcm", "audio/l16")
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+class StreamingSegment(NamedTuple):
+    text: str
+    is_final: bool
+    start_seconds: float
+    end_seconds: float
+    words: Tuple[Word, ...] = ()
+
+
+def audio_format(
+    encoding: str, sample_rate_hz: int, to_pipe: bool = False
+) -> Tuple[List[str], str, str]:
+    """
+    Returns (ffmpeg output args, file extension, content type) for a recognizer
+    encoding, validating the sample rate the encoding requires.
+    """
+    if encoding not in AUDIO_FORMATS:
+        raise ValueError(
+            f"Unsupported encoding {encoding!r}, expected one of {list(AUDIO_FORMATS)}"
+        )
+    if encoding == "OGG_OPUS" and sample_rate_hz not in OPUS_SAMPLE_RATES:
+        raise ValueError(f"OGG_OPUS requires a sample rate in {OPUS_SAMPLE_RATES}")
+    if encoding == "LINEAR16" and to_pipe:
+        return PIPE_LINEAR16_FORMAT
+    return AUDIO_FORMATS[encoding]
+
+
+def extract_audio_ffmpeg(
+    video_path: str, sample_rate_hz: int, encoding: str = "LINEAR16"
+) -> str:
+    output_args, extension, _ = audio_format(encoding, sample_rate_hz)
+    tmp_audio = tempfile.NamedTemporaryFile(suffix=f".{extension}", delete=False)
     cmd = [
         "ffmpeg",
         "-y",
@@ -18,90 +102,1019 @@ def extract_audio_ffmpeg(video_path: str, sample_rate_hz: int) -> str:
         "-ar",
         str(sample_rate_hz),
         "-vn",
-        "-f",
-        "wav",
-        tmp_wav.name,
+        *output_args,
+        tmp_audio.name,
     ]
     subprocess.run(
         cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
     )
-    return tmp_wav.name
+    return tmp_audio.name
+
+
+def _pump_to_stdin(source, stdin, errors: list) -> None:
+    """
+    Copies in-memory bytes, a binary file, or a GCS object using ranged reads
+    of DOWNLOAD_CHUNK_BYTES (so at most one chunk is held in memory), into
+    ffmpeg's stdin.
+    """
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            stdin.write(source)
+            return
+        if hasattr(source, "read"):
+            shutil.copyfileobj(source, stdin, DOWNLOAD_CHUNK_BYTES)
+            return
+        with source.open("rb", chunk_size=DOWNLOAD_CHUNK_BYTES) as reader:
+            while True:
+                chunk = reader.read(DOWNLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                stdin.write(chunk)
+    except BrokenPipeError:
+        pass  # ffmpeg exited early, its return code is checked by the reader
+    except Exception as e:
+        errors.append(e)
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+def iter_audio_ffmpeg(
+    source: Union[str, bytes, BinaryIO, "storage.Blob"],
+    sample_rate_hz: int,
+    encoding: str = "LINEAR16",
+    chunk_bytes: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    Decodes a video with ffmpeg and yields mono audio in the recognizer
+    `encoding` (headerless PCM for LINEAR16) in chunks of `chunk_bytes`, as
+    soon as ffmpeg produces them.
+    `source` is a local path, or a GCS blob whose bytes are streamed into
+    ffmpeg's stdin while it decodes, so no intermediate video file is written.
+    It may also be mono 16-bit PCM at `sample_rate_hz` to re-encode, as bytes
+    or a binary file.
+    """
+    output_args, _, _ = audio_format(encoding, sample_rate_hz, to_pipe=True)
+    from_pipe = not isinstance(source, str)
+    if isinstance(source, (bytes, bytearray)) or hasattr(source, "read"):
+        input_args = ["-f", "s16le", "-ar", str(sample_rate_hz), "-ac", "1"]
+    else:
+        input_args = []
+    cmd = [
+        "ffmpeg",
+        *input_args,
+        "-i",
+        "pipe:0" if from_pipe else source,
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate_hz),
+        "-vn",
+        *output_args,
+        "-",
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if from_pipe else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+    pump_errors = []
+    if from_pipe:
+        pump = threading.Thread(
+            target=_pump_to_stdin, args=(source, proc.stdin, pump_errors), daemon=True
+        )
+        pump.start()
+
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        if from_pipe:
+            pump.join()
+
+    if pump_errors:
+        raise pump_errors[0]
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def iter_pcm_ffmpeg(
+    source: Union[str, "storage.Blob"], sample_rate_hz: int, frame_ms: int = 100
+) -> Iterator[bytes]:
+    """
+    Yields mono 16-bit PCM frames of `frame_ms` decoded from `source`,
+    see iter_audio_ffmpeg.
+    """
+    frame_bytes = 2 * sample_rate_hz * frame_ms // 1000
+    return iter_audio_ffmpeg(source, sample_rate_hz, "LINEAR16", frame_bytes)
+
+
+def mp4_moov_at_end(blob) -> bool:
+    """
+    Reads the top-level box headers of a GCS MP4/MOV object (16-byte ranged
+    reads) and returns True when its media data comes before the moov atom,
+    so ffmpeg cannot decode it from a pipe. Other containers return False.
+    """
+    if blob.size is None:
+        blob.reload()
+    offset = 0
+    for _ in range(MAX_MP4_BOXES):
+        if offset + 8 > blob.size:
+            return False
+        header = blob.download_as_bytes(
+            start=offset, end=min(offset + 16, blob.size) - 1
+        )
+        size, box = struct.unpack(">I4s", header[:8])
+        if offset == 0 and box not in MP4_TOP_LEVEL_BOXES:
+            return False
+        if box in (b"moov", b"mdat"):
+            return box == b"mdat"
+        if size == 1 and len(header) == 16:
+            size = struct.unpack(">Q", header[8:])[0]  # 64-bit box size
+        if size < 8:
+            return False  # size 0 runs to the end of the file
+        offset += size
+    return False
+
+
+def iter_audio_from_blob(
+    blob,
+    sample_rate_hz: int,
+    encoding: str = "LINEAR16",
+    chunk_bytes: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    Streams a GCS video through ffmpeg without a temp video file.
+    MP4s with the moov atom at the end cannot be decoded from a pipe; they are
+    detected up front (see mp4_moov_at_end) and downloaded to a temp file to
+    decode from disk. Other containers that make ffmpeg fail before any audio
+    is produced fall back to the same download.
+    """
+    if mp4_moov_at_end(blob):
+        print("⬇️ Video has its moov atom at the end, downloading to a temp file...")
+        yield from _iter_audio_downloaded(blob, sample_rate_hz, encoding, chunk_bytes)
+        return
+
+    produced = False
+    try:
+        for chunk in iter_audio_ffmpeg(blob, sample_rate_hz, encoding, chunk_bytes):
+            produced = True
+            yield chunk
+        return
+    except subprocess.CalledProcessError:
+        if produced:
+            raise
+
+    print("⬇️ Video is not streamable, downloading to a temp file...")
+    yield from _iter_audio_downloaded(blob, sample_rate_hz, encoding, chunk_bytes)
+
+
+def _iter_audio_downloaded(
+    blob, sample_rate_hz: int, encoding: str, chunk_bytes: int
+) -> Iterator[bytes]:
+    tmp_video = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
+    try:
+        blob.download_to_filename(tmp_video.name)
+        yield from iter_audio_ffmpeg(
+            tmp_video.name, sample_rate_hz, encoding, chunk_bytes
+        )
+    finally:
+        os.remove(tmp_video.name)
+
+
+def iter_pcm_from_blob(
+    blob, sample_rate_hz: int, frame_ms: int = 100
+) -> Iterator[bytes]:
+    frame_bytes = 2 * sample_rate_hz * frame_ms // 1000
+    return iter_audio_from_blob(blob, sample_rate_hz, "LINEAR16", frame_bytes)
+
+
+class IterReader(io.RawIOBase):
+    """
+    Read-only file object over an iterator of byte chunks, used to hand a PCM
+    stream to GCS resumable uploads.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b""
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
 
 
 def upload_to_gcs(local_path: str, bucket_name: str, blob_name: str) -> str:
-    storage_client = storage.Client()
+    storage_client = clients.get_storage_client()
     bucket = storage_client.bucket(bucket_name)
     blob = bucket.blob(blob_name)
     blob.upload_from_filename(local_path)
     return f"gs://{bucket_name}/{blob_name}"
 
 
-def transcribe_gcs_video_with_cache(
+def iter_pcm_windows(
+    frames: Iterable[bytes],
+    sample_rate_hz: int,
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> Iterator[Tuple[float, bytes]]:
+    """
+    Yields (offset_seconds, pcm_bytes) windows of `chunk_seconds` from a stream
+    of mono 16-bit PCM frames, as soon as each window is complete.
+    Consecutive windows overlap by `overlap_seconds`.
+    """
+    if not 0 <= overlap_seconds < chunk_seconds:
+        raise ValueError("overlap_seconds must be in [0, chunk_seconds)")
+
+    window_bytes = 2 * int(chunk_seconds * sample_rate_hz)
+    step_bytes = 2 * int((chunk_seconds - overlap_seconds) * sample_rate_hz)
+
+    buffer = bytearray()
+    offset_bytes = 0
+    for frame in frames:
+        buffer += frame
+        # Only emit a full window once audio past it exists, so the final
+        # window is never a tail already covered by the previous overlap
+        while len(buffer) > window_bytes:
+            yield offset_bytes / (2 * sample_rate_hz), bytes(buffer[:window_bytes])
+            del buffer[:step_bytes]
+            offset_bytes += step_bytes
+
+    if buffer:
+        yield offset_bytes / (2 * sample_rate_hz), bytes(buffer)
+
+
+def iter_wav_windows(
+    wav_path: str, chunk_seconds: float, overlap_seconds: float
+) -> Iterator[Tuple[float, bytes]]:
+    """
+    Yields (offset_seconds, pcm_bytes) windows of `chunk_seconds` from a WAV file.
+    Consecutive windows overlap by `overlap_seconds`.
+    """
+    with wave.open(wav_path, "rb") as wav:
+        rate = wav.getframerate()
+        frames = iter(lambda: wav.readframes(rate), b"")
+        yield from iter_pcm_windows(frames, rate, chunk_seconds, overlap_seconds)
+
+
+def recognition_config(
+    encoding: str, sample_rate_hz: int, language_code: str, model: str
+) -> "speech.RecognitionConfig":
+    return speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding[encoding],
+        sample_rate_hertz=sample_rate_hz,
+        language_code=language_code,
+        model=model,
+        enable_word_time_offsets=True,
+        enable_word_confidence=True,
+        # Sentence boundaries drive transcript chunking and candidate mining
+        enable_automatic_punctuation=True,
+    )
+
+
+def _words(alternative, offset_seconds: float = 0.0) -> List[Word]:
+    return [
+        Word(
+            word.word,
+            offset_seconds + word.start_time.total_seconds(),
+            offset_seconds + word.end_time.total_seconds(),
+            word.confidence,
+            word.speaker_tag,
+        )
+        for word in alternative.words
+    ]
+
+
+def _recognize_chunk(
+    speech_client, config, pcm: bytes, offset_seconds: float
+) -> List[List[Word]]:
+    """
+    Recognizes one inline audio window.
+    Returns the words of each recognition result, timed from the start of the
+    whole recording.
+    """
+    audio = speech.RecognitionAudio(content=pcm)
+    duration_seconds = len(pcm) / (2 * config.sample_rate_hertz)
+    if duration_seconds <= 60:
+        response = speech_client.recognize(config=config, audio=audio)
+    else:
+        operation = speech_client.long_running_recognize(config=config, audio=audio)
+        response = operation.result(timeout=600)
+
+    return [
+        _words(result.alternatives[0], offset_seconds)
+        for result in response.results
+        if result.alternatives
+    ]
+
+
+def transcribe_pcm_chunked(
+    speech_client,
+    windows: Iterable[Tuple[float, bytes]],
+    config,
+    overlap_seconds: float = 2,
+    max_workers: int = 8,
+) -> List[TimedSegment]:
+    """
+    Transcribes overlapping LINEAR16 windows on a bounded worker pool.
+    Windows are submitted as they arrive (at most 2 * `max_workers` in flight),
+    so recognition overlaps with decoding when `windows` is a live stream.
+    Words are kept by the window that owns their start time (the overlap is split
+    at its midpoint), so the stitched segments contain no duplicated words.
+    Returns the segment list in order.
+    """
+    offsets = []
+    chunk_results = []
+    in_flight = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for offset, pcm in windows:
+            if len(in_flight) >= 2 * max_workers:
+                chunk_results.append(in_flight.popleft().result())
+            offsets.append(offset)
+            in_flight.append(
+                pool.submit(
+                    _recognize_chunk,
+                    speech_client,
+                    config,
+                    pcm=pcm,
+                    offset_seconds=offset,
+                )
+            )
+        chunk_results.extend(future.result() for future in in_flight)
+
+    segments = []
+    for i, results in enumerate(chunk_results):
+        lower = offsets[i] + overlap_seconds / 2 if i > 0 else float("-inf")
+        upper = (
+            offsets[i + 1] + overlap_seconds / 2
+            if i + 1 < len(offsets)
+            else float("inf")
+        )
+        for words in results:
+            kept = [word for word in words if lower <= word.start_seconds < upper]
+            if kept:
+                segments.append(
+                    TimedSegment(kept, kept[0].start_seconds, kept[-1].end_seconds)
+                )
+
+    return segments
+
+
+def transcribe_wav_chunked(
+    speech_client,
+    wav_path: str,
+    config,
+    chunk_seconds: float = 55,
+    overlap_seconds: float = 2,
+    max_workers: int = 8,
+) -> List[TimedSegment]:
+    """
+    Transcribes a LINEAR16 WAV file as overlapping windows, see
+    transcribe_pcm_chunked.
+    """
+    return transcribe_pcm_chunked(
+        speech_client,
+        iter_wav_windows(wav_path, chunk_seconds, overlap_seconds),
+        config,
+        overlap_seconds=overlap_seconds,
+        max_workers=max_workers,
+    )
+
+
+def timed_segments(response) -> List[TimedSegment]:
+    """
+    Converts a recognize/long_running_recognize response into segments.
+    Each result runs from the end of the previous one to its result_end_time.
+    """
+    segments = []
+    previous_end = 0.0
+    for result in response.results:
+        if not result.alternatives:
+            continue
+        alternative = result.alternatives[0]
+        end = result.result_end_time.total_seconds()
+        words = _words(alternative) or words_from_text(
+            alternative.transcript, previous_end, end
+        )
+        segments.append(TimedSegment(words, previous_end, end))
+        previous_end = end
+    return segments
+
+
+def recognition_cache_config(
+    sample_rate_hz: int,
+    language_code: str,
+    encoding: str,
+    model: str,
+    **extra,
+) -> dict:
+    """
+    Recognition settings that change the transcript and therefore the cache key.
+    """
+    return {
+        "sample_rate_hz": sample_rate_hz,
+        "language_code": language_code,
+        "encoding": encoding,
+        "model": model,
+        # Set by recognition_config; unpunctuated entries are not reused
+        "automatic_punctuation": True,
+        **{name: value for name, value in extra.items() if value is not None},
+    }
+
+
+def stream_transcribe_pcm(
+    speech_client, frames: Iterable[bytes], config
+) -> Iterator[StreamingSegment]:
+    """
+    Feeds LINEAR16 PCM frames to the streaming recognizer and yields interim and
+    final segments as they arrive. Streams are restarted every
+    STREAMING_LIMIT_SECONDS of audio to stay under the per-stream limit; segment
+    times are relative to the start of `frames`.
+    """
+    streaming_config = speech.StreamingRecognitionConfig(
+        config=config, interim_results=True
+    )
+    bytes_per_second = 2 * config.sample_rate_hertz
+    frames = iter(frames)
+    session_offset = 0.0
+
+    while True:
+        first_frame = next(frames, None)
+        if first_frame is None:
+            return
+
+        sent_bytes = 0
+
+        def session_requests(frame=first_frame):
+            nonlocal sent_bytes
+            while frame is not None:
+                sent_bytes += len(frame)
+                yield speech.StreamingRecognizeRequest(audio_content=frame)
+                if sent_bytes >= STREAMING_LIMIT_SECONDS * bytes_per_second:
+                    return
+                frame = next(frames, None)
+
+        last_final_end = session_offset
+        responses = speech_client.streaming_recognize(
+            config=streaming_config, requests=session_requests()
+        )
+        for response in responses:
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                alternative = result.alternatives[0]
+                end = session_offset + result.result_end_time.total_seconds()
+                yield StreamingSegment(
+                    text=alternative.transcript.strip(),
+                    is_final=result.is_final,
+                    start_seconds=last_final_end,
+                    end_seconds=end,
+                    words=tuple(_words(alternative, session_offset)),
+                )
+                if result.is_final:
+                    last_final_end = end
+
+        session_offset += sent_bytes / bytes_per_second
+
+
+def _stream_with_cache(
+    speech_client, frames: Iterable[bytes], config, key: str, bucket
+) -> Iterator[StreamingSegment]:
+    """
+    Replays a cached transcription as final segments, or streams `frames` to
+    the recognizer and caches the final transcript once the stream completes.
+    """
+    cached = transcript_cache.get(key, bucket)
+    if cached is not None:
+        print(f"✅ Found cached transcription: {key}")
+        for j in range(cached.num_segments):
+            yield StreamingSegment(
+                cached.segment(j),
+                True,
+                float(cached.segment_start[j]),
+                float(cached.segment_end[j]),
+            )
+        return
+
+    print("📝 Streaming audio to recognizer...")
+    finals = []
+    for segment in stream_transcribe_pcm(speech_client, frames, config):
+        if segment.is_final and segment.text:
+            finals.append(segment)
+        yield segment
+
+    print("💾 Caching transcript...")
+    transcript = Transcript.from_segments(
+        TimedSegment(
+            list(segment.words)
+            or words_from_text(
+                segment.text, segment.start_seconds, segment.end_seconds
+            ),
+            segment.start_seconds,
+            segment.end_seconds,
+        )
+        for segment in finals
+    )
+    transcript_cache.put(key, transcript, bucket)
+
+
+def stream_transcribe_gcs_video(
     gcs_video_uri: str,
     google_credentials_path: str,
     sample_rate_hz: int = 16000,
     language_code: str = "en-US",
-    encoding: str = "LINEAR16",
     model: str = "video",
-) -> Tuple[str, List[str]]:
+) -> Iterator[StreamingSegment]:
     """
-    Checks if a transcription exists for a GCS video.
-    If not, transcribes the video and caches the result as a .txt file in GCS.
-    Returns: (full_transcript, segment_list)
+    Streaming counterpart of transcribe_gcs_video_with_cache.
+    Yields interim and final segments while the video is still being downloaded
+    and decoded.
+    A cached transcription is replayed as final segments; otherwise the final
+    transcript is cached once the stream completes.
     """
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = google_credentials_path
-    storage_client = storage.Client()
-    speech_client = speech.SpeechClient()
+    clients.configure(google_credentials_path)
+    speech_client = clients.get_speech_client()
+    bucket, video_blob = _video_blob(gcs_video_uri)
 
-    # Parse GCS video path
-    assert gcs_video_uri.startswith("gs://")
-    bucket_name, blob_path = gcs_video_uri.replace("gs://", "").split("/", 1)
-    video_name = os.path.basename(blob_path).rsplit(".", 1)[0]
+    key = cache_key(
+        media_fingerprint(video_blob),
+        recognition_cache_config(sample_rate_hz, language_code, "LINEAR16", model),
+    )
+    config = recognition_config("LINEAR16", sample_rate_hz, language_code, model)
+    # Generators are lazy, so nothing is downloaded on a cache hit
+    frames = iter_pcm_from_blob(video_blob, sample_rate_hz)
+    yield from _stream_with_cache(speech_client, frames, config, key, bucket)
 
-    # Check for transcription
-    transcript_blob_path = f"transcription/{video_name}.txt"
-    audio_blob_path = f"audio/{video_name}.wav"
-    bucket = storage_client.bucket(bucket_name)
-    transcript_blob = bucket.blob(transcript_blob_path)
 
-    if transcript_blob.exists():
-        print(
-            f"✅ Found cached transcription: gs://{bucket_name}/{transcript_blob_path}"
-        )
-        transcript = transcript_blob.download_as_text()
-        return transcript, transcript.split(". ")
+def stream_transcribe_local_video(
+    video_path: str,
+    bucket_name: str,
+    google_credentials_path: str,
+    sample_rate_hz: int = 16000,
+    language_code: str = "en-US",
+    model: str = "video",
+) -> Iterator[StreamingSegment]:
+    """
+    stream_transcribe_gcs_video for a video on local disk: audio is decoded on
+    this host and nothing but the cached transcript is written to `bucket_name`.
+    """
+    clients.configure(google_credentials_path)
+    speech_client = clients.get_speech_client()
+    bucket = clients.get_storage_client().bucket(bucket_name)
+
+    key = cache_key(
+        file_fingerprint(video_path),
+        recognition_cache_config(sample_rate_hz, language_code, "LINEAR16", model),
+    )
+    config = recognition_config("LINEAR16", sample_rate_hz, language_code, model)
+    frames = iter_pcm_ffmpeg(video_path, sample_rate_hz)
+    yield from _stream_with_cache(speech_client, frames, config, key, bucket)
+
+
+def _trimmed_pcm(
+    video_blob, sample_rate_hz: int, stream_media: bool
+) -> Tuple[BinaryIO, OffsetMap]:
+    """
+    Decodes the video to PCM and compresses its silent spans, see _trim_pcm.
+    """
+    if stream_media:
+        print("🎧 Streaming audio out of the video...")
+        return _trim_pcm(iter_pcm_from_blob(video_blob, sample_rate_hz), sample_rate_hz)
+
+    wav_path = _download_and_extract_audio(video_blob, sample_rate_hz, "LINEAR16")
+    try:
+        with wave.open(wav_path, "rb") as wav:
+            frames = iter(lambda: wav.readframes(sample_rate_hz), b"")
+            return _trim_pcm(frames, sample_rate_hz)
+    finally:
+        os.remove(wav_path)
 
+
+def _trim_pcm(
+    frames: Iterable[bytes], sample_rate_hz: int
+) -> Tuple[BinaryIO, OffsetMap]:
+    """
+    Compresses the silent spans of a PCM stream as it is decoded. Returns the
+    trimmed PCM as a temporary file (removed once closed) and the map back to
+    original video times; the recording is never held in memory.
+    """
+    input_bytes = 0
+
+    def counted():
+        nonlocal input_bytes
+        for frame in frames:
+            input_bytes += len(frame)
+            yield frame
+
+    trimmed = tempfile.TemporaryFile()
+    offset_map = trim_silence_stream(counted(), sample_rate_hz, trimmed)
+    print(
+        f"🔇 Trimmed silence: {input_bytes / (2 * sample_rate_hz):.0f}s -> "
+        f"{trimmed.tell() / (2 * sample_rate_hz):.0f}s of audio"
+    )
+    trimmed.seek(0)
+    return trimmed, offset_map
+
+
+def _iter_file(f: BinaryIO, chunk_bytes: int = DOWNLOAD_CHUNK_BYTES) -> Iterator[bytes]:
+    return iter(lambda: f.read(chunk_bytes), b"")
+
+
+def _download_and_extract_audio(video_blob, sample_rate_hz: int, encoding: str) -> str:
     # Download video to temp
     print("⬇️ Downloading video...")
     tmp_video = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
-    bucket.blob(blob_path).download_to_filename(tmp_video.name)
+    video_blob.download_to_filename(tmp_video.name)
 
     # Extract audio
     print("🎧 Extracting audio...")
-    wav_path = extract_audio_ffmpeg(tmp_video.name, sample_rate_hz)
+    return extract_audio_ffmpeg(tmp_video.name, sample_rate_hz, encoding)
 
-    # Upload audio
-    print("☁️ Uploading audio to GCS...")
-    gcs_audio_uri = upload_to_gcs(wav_path, bucket_name, audio_blob_path)
 
-    # Transcribe
-    print("📝 Transcribing via long-running recognizer...")
-    audio = speech.RecognitionAudio(uri=gcs_audio_uri)
-    config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding[encoding],
-        sample_rate_hertz=sample_rate_hz,
-        language_code=language_code,
-        model=model,
+def _video_blob(gcs_video_uri: str):
+    # Parse GCS video path
+    assert gcs_video_uri.startswith("gs://")
+    bucket_name, blob_path = gcs_video_uri.replace("gs://", "").split("/", 1)
+    bucket = clients.get_storage_client().bucket(bucket_name)
+    return bucket, bucket.blob(blob_path)
+
+
+def _upload_recognition_audio(
+    bucket,
+    video_blob,
+    key: str,
+    sample_rate_hz: int,
+    encoding: str,
+    stream_media: bool,
+    pcm: Optional[BinaryIO] = None,
+) -> str:
+    """
+    Puts the meeting audio in GCS in `encoding` for long-running recognition,
+    from an already trimmed `pcm` file when given. Returns its gs:// URI.
+    """
+    _, extension, content_type = audio_format(
+        encoding, sample_rate_hz, to_pipe=stream_media or pcm is not None
+    )
+    audio_blob_path = f"audio/{key}.{extension}"
+
+    if pcm is not None:
+        print("☁️ Uploading trimmed audio to GCS...")
+        audio = (
+            pcm
+            if encoding == "LINEAR16"
+            else IterReader(iter_audio_ffmpeg(pcm, sample_rate_hz, encoding))
+        )
+        audio_blob = bucket.blob(audio_blob_path, chunk_size=UPLOAD_CHUNK_BYTES)
+        audio_blob.upload_from_file(audio, content_type=content_type)
+    elif stream_media:
+        # Encoded audio goes straight from ffmpeg into bounded resumable chunks
+        print("☁️ Streaming audio out of the video into GCS...")
+        audio_blob = bucket.blob(audio_blob_path, chunk_size=UPLOAD_CHUNK_BYTES)
+        audio_blob.upload_from_file(
+            IterReader(iter_audio_from_blob(video_blob, sample_rate_hz, encoding)),
+            content_type=content_type,
+        )
+    else:
+        audio_path = _download_and_extract_audio(video_blob, sample_rate_hz, encoding)
+
+        # Upload audio
+        print("☁️ Uploading audio to GCS...")
+        return upload_to_gcs(audio_path, bucket.name, audio_blob_path)
+
+    return f"gs://{bucket.name}/{audio_blob_path}"
+
+
+def finalize_recognition(metadata: dict, response) -> Transcript:
+    """
+    Builds and caches the Transcript of a finished long-running recognition.
+    `metadata` holds the cache key, bucket name and the optional VAD offset map.
+    """
+    transcript = Transcript.from_segments(timed_segments(response))
+    if metadata.get("offset_map"):
+        offset_map = OffsetMap.from_dict(metadata["offset_map"])
+        transcript = transcript.map_times(offset_map.to_original)
+
+    # Save transcript to the local and GCS cache tiers
+    print("💾 Caching transcript...")
+    bucket = clients.get_storage_client().bucket(metadata["bucket_name"])
+    transcript_cache.put(metadata["key"], transcript, bucket)
+    return transcript
+
+
+def transcribe_gcs_video(
+    gcs_video_uri: str,
+    google_credentials_path: str,
+    sample_rate_hz: int = 16000,
+    language_code: str = "en-US",
+    encoding: str = "LINEAR16",
+    model: str = "video",
+    chunk_seconds: Optional[float] = None,
+    chunk_overlap_seconds: float = 2,
+    max_workers: int = 8,
+    stream_media: bool = False,
+    vad: bool = False,
+) -> Transcript:
+    """
+    Checks if a transcription exists for a GCS video.
+    If not, transcribes the video and caches the result locally and in GCS.
+    Returns a structured Transcript with word timings and confidences.
+    The cache is keyed on the video's content hash plus the recognition config,
+    see scripts.transcript_cache.
+    When `chunk_seconds` is set, the audio is split into overlapping windows that
+    are recognized concurrently (at most `max_workers` at a time) instead of one
+    long-running request, so wall-clock time stays roughly flat with meeting length.
+    The uploaded audio uses `encoding` (LINEAR16, FLAC or OGG_OPUS); the
+    compressed encodings cut upload bytes considerably for long meetings.
+    With `stream_media`, the video is piped from GCS through ffmpeg and the audio
+    goes straight to the recognizer windows or the audio upload, so extraction
+    overlaps the download and no intermediate video or audio file is written.
+    With `vad`, silent spans are compressed (see scripts.vad) before upload and
+    recognition; word and segment times are mapped back to the original video
+    timeline.
+    See submit_gcs_video for a non-blocking variant.
+    """
+    clients.configure(google_credentials_path)
+    speech_client = clients.get_speech_client()
+    bucket, video_blob = _video_blob(gcs_video_uri)
+
+    # Chunked windows are sent inline as raw PCM whatever `encoding` says
+    upload_encoding = "LINEAR16" if chunk_seconds else encoding
+    audio_format(upload_encoding, sample_rate_hz)
+
+    # Check for transcription
+    key = cache_key(
+        media_fingerprint(video_blob),
+        recognition_cache_config(
+            sample_rate_hz,
+            language_code,
+            upload_encoding,
+            model,
+            chunk_seconds=chunk_seconds,
+            chunk_overlap_seconds=chunk_overlap_seconds if chunk_seconds else None,
+            vad=vad or None,
+        ),
+    )
+
+    cached = transcript_cache.get(key, bucket)
+    if cached is not None:
+        print(f"✅ Found cached transcription: {key}")
+        return cached
+
+    pcm, offset_map = None, None
+    if vad:
+        pcm, offset_map = _trimmed_pcm(video_blob, sample_rate_hz, stream_media)
+
+    if not chunk_seconds:
+        gcs_audio_uri = _upload_recognition_audio(
+            bucket, video_blob, key, sample_rate_hz, encoding, stream_media, pcm
+        )
+
+        # Transcribe
+        print("📝 Transcribing via long-running recognizer...")
+        audio = speech.RecognitionAudio(uri=gcs_audio_uri)
+        config = recognition_config(encoding, sample_rate_hz, language_code, model)
+
+        operation = speech_client.long_running_recognize(config=config, audio=audio)
+        response = operation.result(timeout=600)
+
+        metadata = {"key": key, "bucket_name": bucket.name}
+        if offset_map is not None:
+            metadata["offset_map"] = offset_map.to_dict()
+        return finalize_recognition(metadata, response)
+
+    if vad:
+        windows = iter_pcm_windows(
+            _iter_file(pcm), sample_rate_hz, chunk_seconds, chunk_overlap_seconds
+        )
+    elif stream_media:
+        print("🎧 Streaming audio out of the video...")
+        frames = iter_pcm_from_blob(video_blob, sample_rate_hz)
+        windows = iter_pcm_windows(
+            frames, sample_rate_hz, chunk_seconds, chunk_overlap_seconds
+        )
+    else:
+        wav_path = _download_and_extract_audio(video_blob, sample_rate_hz, "LINEAR16")
+        windows = iter_wav_windows(wav_path, chunk_seconds, chunk_overlap_seconds)
+
+    # Windows are sent inline, so no audio upload is needed
+    print(f"📝 Transcribing {chunk_seconds}s windows in parallel...")
+    config = recognition_config("LINEAR16", sample_rate_hz, language_code, model)
+    segments = transcribe_pcm_chunked(
+        speech_client,
+        windows,
+        config,
+        overlap_seconds=chunk_overlap_seconds,
+        max_workers=max_workers,
     )
 
-    operation = speech_client.long_running_recognize(config=config, audio=audio)
-    response = operation.result(timeout=600)
+    transcript = Transcript.from_segments(segments)
+    if vad:
+        transcript = transcript.map_times(offset_map.to_original)
+
+    # Save transcript to the local and GCS cache tiers
+    print("💾 Caching transcript...")
+    transcript_cache.put(key, transcript, bucket)
+
+    return transcript
+
+
+_job_manager: Optional[TranscriptionJobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> TranscriptionJobManager:
+    """
+    Process-wide job manager whose jobs resolve to Transcripts. Jobs left
+    unfinished by a previous process are resumed on first use.
+    """
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = TranscriptionJobManager(result_handler=finalize_recognition)
+            resumed = _job_manager.resume()
+            if resumed:
+                print(f"🔁 Resumed {len(resumed)} transcription job(s)")
+    return _job_manager
+
+
+def submit_gcs_video(
+    gcs_video_uri: str,
+    google_credentials_path: str,
+    sample_rate_hz: int = 16000,
+    language_code: str = "en-US",
+    encoding: str = "LINEAR16",
+    model: str = "video",
+    stream_media: bool = False,
+    vad: bool = False,
+    job_manager: Optional[TranscriptionJobManager] = None,
+) -> TranscriptionJob:
+    """
+    Non-blocking counterpart of transcribe_gcs_video (long-running mode).
+    Returns a job right away; the cache lookup, audio preparation and upload
+    run on the job manager's worker pool before the recognition starts. The
+    job's result is the Transcript, served from the cache when there is one.
+    """
+    clients.configure(google_credentials_path)
+    job_manager = job_manager or get_job_manager()
+    audio_format(encoding, sample_rate_hz)
+
+    def prepare(metadata: dict):
+        bucket, video_blob = _video_blob(gcs_video_uri)
+        key = cache_key(
+            media_fingerprint(video_blob),
+            recognition_cache_config(
+                sample_rate_hz, language_code, encoding, model, vad=vad or None
+            ),
+        )
+        metadata.update(key=key, bucket_name=bucket.name)
+
+        cached = transcript_cache.get(key, bucket)
+        if cached is not None:
+            print(f"✅ Found cached transcription: {key}")
+            return cached
+
+        pcm = None
+        if vad:
+            pcm, offset_map = _trimmed_pcm(video_blob, sample_rate_hz, stream_media)
+            metadata["offset_map"] = offset_map.to_dict()
+
+        gcs_audio_uri = _upload_recognition_audio(
+            bucket, video_blob, key, sample_rate_hz, encoding, stream_media, pcm
+        )
+
+        print("📝 Submitting long-running recognition...")
+        return Recognition(
+            config=recognition_config(encoding, sample_rate_hz, language_code, model),
+            audio=speech.RecognitionAudio(uri=gcs_audio_uri),
+        )
+
+    return job_manager.submit(prepare, {"video_uri": gcs_video_uri})
+
+
+def submit_local_video(
+    video_path: str,
+    bucket_name: str,
+    google_credentials_path: str,
+    sample_rate_hz: int = 16000,
+    language_code: str = "en-US",
+    encoding: str = "FLAC",
+    model: str = "video",
+    vad: bool = False,
+    job_manager: Optional[TranscriptionJobManager] = None,
+) -> TranscriptionJob:
+    """
+    submit_gcs_video for a video on local disk, e.g. a file uploaded to the app.
+    Audio is extracted and compressed on this host and only the audio goes to
+    `bucket_name`, so the video is never uploaded and downloaded again before
+    recognition. Audio is FLAC by default to keep the upload small, while
+    submit_gcs_video defaults to LINEAR16; the cache key only matches the
+    one the same video gets in GCS when both use the same encoding.
+    Use archive_video_async to keep a copy of the original video.
+    """
+    clients.configure(google_credentials_path)
+    job_manager = job_manager or get_job_manager()
+    _, extension, _ = audio_format(encoding, sample_rate_hz)
+
+    def prepare(metadata: dict):
+        bucket = clients.get_storage_client().bucket(bucket_name)
+        key = cache_key(
+            file_fingerprint(video_path),
+            recognition_cache_config(
+                sample_rate_hz, language_code, encoding, model, vad=vad or None
+            ),
+        )
+        metadata.update(key=key, bucket_name=bucket.name)
+
+        cached = transcript_cache.get(key, bucket)
+        if cached is not None:
+            print(f"✅ Found cached transcription: {key}")
+            return cached
+
+        if vad:
+            print("🎧 Extracting audio...")
+            pcm, offset_map = _trim_pcm(
+                iter_pcm_ffmpeg(video_path, sample_rate_hz), sample_rate_hz
+            )
+            metadata["offset_map"] = offset_map.to_dict()
+            gcs_audio_uri = _upload_recognition_audio(
+                bucket, None, key, sample_rate_hz, encoding, False, pcm
+            )
+        else:
+            print("🎧 Extracting audio...")
+            audio_path = extract_audio_ffmpeg(video_path, sample_rate_hz, encoding)
+            print("☁️ Uploading audio to GCS...")
+            gcs_audio_uri = upload_to_gcs(
+                audio_path, bucket.name, f"audio/{key}.{extension}"
+            )
+            os.remove(audio_path)
+
+        print("📝 Submitting long-running recognition...")
+        return Recognition(
+            config=recognition_config(encoding, sample_rate_hz, language_code, model),
+            audio=speech.RecognitionAudio(uri=gcs_audio_uri),
+        )
+
+    return job_manager.submit(prepare, {"video_path": video_path})
+
+
+def transcribe_local_video(
+    video_path: str, bucket_name: str, google_credentials_path: str, **kwargs
+) -> Transcript:
+    """
+    Blocking submit_local_video, see it for the keyword arguments.
+    """
+    job = submit_local_video(video_path, bucket_name, google_credentials_path, **kwargs)
+    job.wait()
+    if job.status != DONE:
+        raise RuntimeError(f"Transcription of {video_path} failed: {job.error}")
+    return job.result
 
-    transcripts = [result.alternatives[0].transcript for result in response.results]
-    full_transcript = " ".join(transcripts)
 
-    # Save transcript to GCS
-    print("💾 Uploading transcript to GCS...")
-    transcript_blob.upload_from_string(full_transcript)
+_archive_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="archive")
+
+
+def archive_video_async(video_path: str, bucket_name: str, blob_name: str) -> Future:
+    """
+    Uploads the original video to GCS in the background, off the
+    transcription path. Returns a Future resolving to its gs:// URI.
+    """
 
-    return full_transcript, transcripts
+    def _archive() -> str:
+        gcs_uri = upload_to_gcs(video_path, bucket_name, blob_name)
+        print(f"📦 Archived video to {gcs_uri}")
+        return gcs_uri
+
+    return _archive_executor.submit(_archive)
+
+
+def transcribe_gcs_video_with_cache(
+    gcs_video_uri: str, google_credentials_path: str, **kwargs
+) -> Tuple[str, List[str]]:
+    """
+    String view of transcribe_gcs_video, see it for the keyword arguments.
+    Returns: (full_transcript, segment_list)
+    """
+    transcript = transcribe_gcs_video(gcs_video_uri, google_credentials_path, **kwargs)
+    return transcript.text, transcript.segments()
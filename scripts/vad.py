@@ -0,0 +1,202 @@
+import shutil
+import tempfile
+from typing import BinaryIO, Iterable, Tuple, Union
+
+import numpy as np
+
+# Frames per read when copying kept audio out of the spill file
+COPY_BLOCK_FRAMES = 2048
+
+
+class OffsetMap:
+    """
+    Maps times in silence-trimmed audio back to the original recording.
+    Each kept span starts at `trimmed_starts[i]` in the trimmed audio and at
+    `original_starts[i]` in the original; both are sorted, so lookups are a
+    binary search.
+    """
+
+    def __init__(self, trimmed_starts: np.ndarray, original_starts: np.ndarray):
+        self.trimmed_starts = np.asarray(trimmed_starts, dtype=np.float64)
+        self.original_starts = np.asarray(original_starts, dtype=np.float64)
+
+    @classmethod
+    def identity(cls) -> "OffsetMap":
+        return cls(np.zeros(1), np.zeros(1))
+
+    def to_original(
+        self, trimmed_seconds: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        t = np.asarray(trimmed_seconds, dtype=np.float64)
+        span = np.searchsorted(self.trimmed_starts, t, side="right") - 1
+        span = np.clip(span, 0, len(self.trimmed_starts) - 1)
+        original = self.original_starts[span] + (t - self.trimmed_starts[span])
+        return float(original) if original.ndim == 0 else original
+
+    def to_dict(self) -> dict:
+        return {
+            "trimmed_starts": self.trimmed_starts.tolist(),
+            "original_starts": self.original_starts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OffsetMap":
+        return cls(data["trimmed_starts"], data["original_starts"])
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (starts, lengths) of the runs of equal values in `mask`."""
+    boundaries = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.concatenate(([0], boundaries))
+    lengths = np.diff(np.concatenate((starts, [len(mask)])))
+    return starts, lengths
+
+
+def _frame_features(frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(energy in dB, zero-crossing rate) of each row of int16 `frames`."""
+    samples = frames.astype(np.float32) / 32768.0
+    energy_db = 10.0 * np.log10(np.mean(samples**2, axis=1) + 1e-10)
+    signs = np.signbit(samples)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy_db, zcr
+
+
+def _speech_mask(
+    energy_db: np.ndarray,
+    zcr: np.ndarray,
+    margin_db: float = 12.0,
+    min_energy_db: float = -55.0,
+    zcr_threshold: float = 0.25,
+) -> np.ndarray:
+    threshold = max(np.percentile(energy_db, 10) + margin_db, min_energy_db)
+    return (energy_db > threshold) | (
+        (energy_db > threshold - margin_db / 2) & (zcr > zcr_threshold)
+    )
+
+
+def speech_frames(
+    pcm: np.ndarray,
+    sample_rate_hz: int,
+    frame_ms: int = 30,
+    margin_db: float = 12.0,
+    min_energy_db: float = -55.0,
+    zcr_threshold: float = 0.25,
+) -> np.ndarray:
+    """
+    Energy/zero-crossing-rate voice activity detector over int16 PCM.
+    Returns a boolean mask with one entry per `frame_ms` frame (the trailing
+    partial frame is folded into the last one).
+    A frame is speech when its energy is `margin_db` above the recording's
+    noise floor (10th energy percentile), or slightly below that with a high
+    zero-crossing rate, which catches unvoiced consonants.
+    """
+    frame_len = sample_rate_hz * frame_ms // 1000
+    n_frames = len(pcm) // frame_len
+    if n_frames == 0:
+        return np.ones(1 if len(pcm) else 0, dtype=bool)
+
+    frames = pcm[: n_frames * frame_len].reshape(n_frames, frame_len)
+    energy_db, zcr = _frame_features(frames)
+    return _speech_mask(energy_db, zcr, margin_db, min_energy_db, zcr_threshold)
+
+
+def _kept_frames(
+    speech: np.ndarray, frame_ms: int, pad_seconds: float, max_gap_seconds: float
+) -> np.ndarray:
+    """Pads speech frames and keeps the first `max_gap_seconds` of each silence."""
+    pad_frames = int(pad_seconds * 1000 / frame_ms)
+    if pad_frames:
+        padded = np.convolve(speech, np.ones(2 * pad_frames + 1), "full")
+        speech = padded[pad_frames : pad_frames + len(speech)] > 0
+
+    starts, lengths = _runs(speech)
+    position_in_run = np.arange(len(speech)) - np.repeat(starts, lengths)
+    return speech | (position_in_run < int(max_gap_seconds * 1000 / frame_ms))
+
+
+def _offset_map(keep: np.ndarray, frame_seconds: float) -> OffsetMap:
+    span_starts, span_lengths = _runs(keep)
+    kept = keep[span_starts]
+    span_starts, span_lengths = span_starts[kept], span_lengths[kept]
+
+    original_starts = span_starts * frame_seconds
+    trimmed_starts = np.concatenate(([0], np.cumsum(span_lengths)[:-1])) * frame_seconds
+    return OffsetMap(trimmed_starts, original_starts)
+
+
+def trim_silence(
+    pcm: np.ndarray,
+    sample_rate_hz: int,
+    frame_ms: int = 30,
+    pad_seconds: float = 0.2,
+    max_gap_seconds: float = 0.5,
+) -> Tuple[np.ndarray, OffsetMap]:
+    """
+    Compresses every silent span of int16 PCM to at most `max_gap_seconds`,
+    after padding speech by `pad_seconds` on both sides so word edges survive.
+    Returns the trimmed PCM and the OffsetMap back to the original timeline.
+    """
+    frame_len = sample_rate_hz * frame_ms // 1000
+    speech = speech_frames(pcm, sample_rate_hz, frame_ms)
+    if not len(speech):
+        return pcm, OffsetMap.identity()
+
+    keep = _kept_frames(speech, frame_ms, pad_seconds, max_gap_seconds)
+    sample_keep = np.repeat(keep, frame_len)
+    tail = len(pcm) - len(sample_keep)
+    if tail > 0:
+        sample_keep = np.concatenate((sample_keep, np.full(tail, keep[-1])))
+    else:
+        sample_keep = sample_keep[: len(pcm)]
+
+    return pcm[sample_keep], _offset_map(keep, frame_len / sample_rate_hz)
+
+
+def trim_silence_stream(
+    chunks: Iterable[bytes],
+    sample_rate_hz: int,
+    output: BinaryIO,
+    frame_ms: int = 30,
+    pad_seconds: float = 0.2,
+    max_gap_seconds: float = 0.5,
+) -> OffsetMap:
+    """
+    trim_silence over a stream of int16 PCM byte chunks, writing the trimmed
+    PCM to `output`. The stream is spilled to a temporary file while the
+    frame features are computed and then copied out frame by frame, so only
+    the per-frame features are held in memory, not the recording.
+    """
+    frame_len = sample_rate_hz * frame_ms // 1000
+    frame_bytes = 2 * frame_len
+    energy, zcr = [], []
+    pending = b""
+    with tempfile.TemporaryFile() as spill:
+        for chunk in chunks:
+            spill.write(chunk)
+            pending += chunk
+            usable = len(pending) - len(pending) % frame_bytes
+            if usable:
+                frames = np.frombuffer(pending[:usable], dtype=np.int16)
+                features = _frame_features(frames.reshape(-1, frame_len))
+                energy.append(features[0])
+                zcr.append(features[1])
+                pending = pending[usable:]
+
+        spill.seek(0)
+        if not energy:
+            shutil.copyfileobj(spill, output)
+            return OffsetMap.identity()
+
+        speech = _speech_mask(np.concatenate(energy), np.concatenate(zcr))
+        keep = _kept_frames(speech, frame_ms, pad_seconds, max_gap_seconds)
+        for first in range(0, len(keep), COPY_BLOCK_FRAMES):
+            block = keep[first : first + COPY_BLOCK_FRAMES]
+            data = spill.read(len(block) * frame_bytes)
+            frames = np.frombuffer(data, dtype=np.int16).reshape(len(block), frame_len)
+            output.write(frames[block].tobytes())
+        # The trailing partial frame follows the last frame, as in trim_silence
+        tail = spill.read()
+        if keep[-1]:
+            output.write(tail)
+
+    return _offset_map(keep, frame_len / sample_rate_hz)
@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+# Module singletons (checkpoint store, glossary, LLM cache) read their
+# settings on import, so point them at a scratch directory first
+_scratch = tempfile.mkdtemp(prefix="meetingmind-tests-")
+os.environ.setdefault(
+    "MEETINGMIND_CHECKPOINT_DIR", os.path.join(_scratch, "checkpoints")
+)
+os.environ.setdefault(
+    "MEETINGMIND_GLOSSARY_PATH", os.path.join(_scratch, "glossary.json")
+)
+os.environ.setdefault("MEETINGMIND_CACHE_DIR", os.path.join(_scratch, "transcripts"))
+os.environ.setdefault("MEETINGMIND_LLM_CACHE", "off")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("SERPER_API_KEY", "test")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
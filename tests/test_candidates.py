@@ -0,0 +1,50 @@
+from crew_agents.candidates import PIECE_WORDS, mine_candidates
+
+
+def test_sentence_starting_with_a_name_is_an_action_item():
+    text = (
+        "We reviewed the roadmap. Sarah will send the deck. "
+        "The weather was nice. Prices went up."
+    )
+    mined = mine_candidates(text, radius=0)
+    assert mined.action_items == "Sarah will send the deck."
+
+
+def test_capitalized_sentence_start_used_lowercase_is_not_a_name():
+    text = "Marketing will review it. The marketing budget is fine."
+    assert mine_candidates(text, radius=0).action_items == ""
+
+
+def test_long_punctuated_sentence_keeps_name_and_date_together():
+    sentence = (
+        "After a long discussion about the budget, the vendor options and the "
+        "timeline from last quarter, Priya will share the revised numbers with "
+        "finance by Friday afternoon."
+    )
+    mined = mine_candidates(f"{sentence} Lunch was good.", radius=0)
+    assert mined.action_items == sentence
+    assert mined.stats["sentences"] == 2
+
+
+def test_unpunctuated_transcript_is_windowed():
+    filler = "we talked about the general state of things for a while "
+    text = filler * 30 + "then Priya will send the report tomorrow " + filler * 30
+    mined = mine_candidates(text, radius=0)
+    assert "Priya will send" in mined.action_items
+    assert len(mined.action_items.split()) <= 2 * PIECE_WORDS
+    assert mined.stats["sentences"] > 1
+
+
+def test_strong_commitment_needs_no_name_or_date():
+    mined = mine_candidates("I'll follow up on the contract.", radius=0)
+    assert mined.action_items == "I'll follow up on the contract."
+
+
+def test_terms():
+    text = (
+        "Our SLA for PowerBI dashboards is tight. "
+        "The Customer Health Score dropped after the GPT-4 rollout."
+    )
+    terms = dict(mine_candidates(text).term_list)
+    assert {"SLA", "PowerBI", "Customer Health Score", "GPT-4"} <= set(terms)
+    assert mine_candidates("No jargon here.").terms == ""
@@ -0,0 +1,42 @@
+"""
+Transcript compaction (scripts.compaction).
+"""
+
+from scripts.compaction import compact
+
+
+def test_fillers_false_starts_and_stutters_are_dropped():
+    result = compact("Um so we wh- we need the the budget, uh, by Friday.")
+    # Without the false start, "we we" is a stutter too
+    assert result.text == "so we need the budget, by Friday."
+    assert result.removed == {"fillers": 2, "false_starts": 1, "repetitions": 2}
+
+
+def test_repeated_phrases_collapse_to_one_copy():
+    result = compact("We should we should ship it.")
+    assert result.text == "We should ship it."
+    assert result.removed["repetitions"] == 2
+
+
+def test_repetitions_never_span_a_sentence_end():
+    text = "We cut the budget. Budget cuts hurt."
+    assert compact(text).text == text
+
+
+def test_grammatical_doubles_and_numbers_are_kept():
+    text = "He had had enough. Call five five five one two."
+    assert compact(text).text == text
+
+
+def test_offsets_map_back_to_the_original():
+    result = compact("Um, the uh deadline deadline is Friday.")
+    start = result.text.index("deadline")
+    end = result.text.index("Friday.") + len("Friday.")
+    assert result.original_span(start, end) == "deadline deadline is Friday."
+    assert result.original_span(3, 3) == ""
+
+
+def test_empty_transcript():
+    result = compact("")
+    assert result.text == ""
+    assert result.offset_map.to_original(0) == 0
@@ -0,0 +1,118 @@
+"""
+Resume must retry a meeting email that was not delivered, whichever agent
+called the email tool (see agent_launch._run_crew).
+"""
+
+import json
+import smtplib
+
+import crewai.llm
+import pytest
+
+import agent_launch
+
+SEND = (
+    "Thought: I will send the recap\n"
+    "Action: send_email_tool\n"
+    'Action Input: {"subject": "Meeting recap", "body": "<p>Recap</p>"}'
+)
+DELEGATE = (
+    "Thought: The composer should send it\n"
+    "Action: Delegate work to coworker\n"
+    "Action Input: "
+    + json.dumps(
+        {
+            "task": "Compose and send the meeting recap email",
+            "context": "Recap of the meeting",
+            "coworker": "Meeting Email Composer",
+        }
+    )
+)
+DONE = "Thought: I now know the final answer\nFinal Answer: Recap email handled."
+
+
+def _fake_completion(original):
+    """Scripted agents: the manager delegates the email, the composer sends it."""
+
+    def completion(*args, **kwargs):
+        kwargs.pop("stream", None)
+        messages = kwargs.get("messages") or []
+        system = str(messages[0].get("content")) if messages else ""
+        prompt = " ".join(str(m.get("content")) for m in messages)
+        acted = any(
+            m.get("role") == "assistant" and "Action:" in str(m.get("content"))
+            for m in messages
+        )
+        if acted:
+            answer = DONE
+        elif "Meeting Email Composer" in system[:200]:
+            answer = SEND
+        elif "Meeting Orchestration Leader" in system[:200] and "recap email" in prompt:
+            answer = DELEGATE
+        else:
+            answer = DONE
+        return original(*args, **{**kwargs, "mock_response": answer})
+
+    return completion
+
+
+class FailingSMTP:
+    def __init__(self, *args, **kwargs):
+        raise ConnectionRefusedError("SMTP server unavailable")
+
+
+class FakeSMTP:
+    sent = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def starttls(self):
+        pass
+
+    def login(self, *args):
+        pass
+
+    def sendmail(self, *args):
+        FakeSMTP.sent += 1
+
+
+@pytest.fixture
+def scripted_llm(monkeypatch):
+    monkeypatch.setattr(
+        crewai.llm.litellm,
+        "completion",
+        _fake_completion(crewai.llm.litellm.completion),
+    )
+
+
+@pytest.mark.parametrize("mode", ["hierarchical", "map_reduce"])
+def test_failed_send_is_retried_on_resume(mode, scripted_llm, monkeypatch):
+    transcript = f"Meeting about the {mode} launch. Bob will ship the report by Friday."
+
+    monkeypatch.setattr(smtplib, "SMTP", FailingSMTP)
+    _, report = agent_launch.crew_launch(
+        transcript, mode=mode, resume=True, with_report=True
+    )
+    assert report["email_sent"] is False
+
+    FakeSMTP.sent = 0
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    _, report = agent_launch.crew_launch(
+        transcript, mode=mode, resume=True, with_report=True
+    )
+    assert report["email_sent"] is True
+    assert FakeSMTP.sent == 1
+
+    # Delivered: resuming again does not send a second email
+    _, report = agent_launch.crew_launch(
+        transcript, mode=mode, resume=True, with_report=True
+    )
+    assert report["email_sent"] is True
+    assert FakeSMTP.sent == 1
@@ -0,0 +1,98 @@
+import multiprocessing
+
+from crew_agents.glossary import GlossaryStore, normalize, parse_glossary
+
+RUN_OUTPUT = """Here is the glossary for this meeting.
+Note: some terms could not be verified.
+Summary: The team discussed SLAs.
+
+- **SLA** (Service Level Agreement): A commitment on uptime. Source: [Wikipedia](https://en.wikipedia.org/wiki/SLA)
+- **PowerBI**: Microsoft's BI tool.
+  - Source: [Docs](https://learn.microsoft.com/power-bi)
+* ARR - Annual recurring revenue (Sources: https://a.example/arr, https://b.example)
+"""
+
+
+def test_parse_glossary_takes_only_list_items():
+    entries = {term: rest for term, *rest in parse_glossary(RUN_OUTPUT)}
+    assert set(entries) == {"SLA", "PowerBI", "ARR"}
+    assert entries["SLA"] == [
+        ["Service Level Agreement"],
+        "A commitment on uptime.",
+        ["https://en.wikipedia.org/wiki/SLA"],
+    ]
+    assert entries["PowerBI"][2] == ["https://learn.microsoft.com/power-bi"]
+    assert entries["ARR"][1:] == [
+        "Annual recurring revenue",
+        ["https://a.example/arr", "https://b.example"],
+    ]
+
+
+def test_parse_glossary_only_reads_the_glossary_heading():
+    document = """## Meeting Summary
+- Decision: ship the release
+## Glossary of Terms
+| Term | Definition |
+|---|---|
+| CSAT | Customer satisfaction score |
+- **NPS**: Net promoter score
+## Action Items
+- Bob: send the deck
+"""
+    assert [entry[0] for entry in parse_glossary(document)] == ["CSAT", "NPS"]
+
+
+def test_parse_glossary_skips_labels():
+    assert parse_glossary("- Note: definitions are from public sources") == []
+
+
+def test_normalize():
+    assert normalize("SLAs") == normalize("sla") == "sla"
+    assert normalize("Power-BI") == "power bi"
+
+
+def test_lookup(tmp_path):
+    store = GlossaryStore(str(tmp_path / "glossary.json"))
+    assert store.add("Customer Health Score", "Churn risk indicator", ["https://x"])
+    assert store.lookup("customer health score").score == 1.0
+    fuzzy = store.lookup("Customer Helth Score")
+    assert fuzzy is not None and 0.85 <= fuzzy.score < 1.0
+    assert store.lookup("Customer Helth Score", fuzzy=False) is None
+
+    store.add("SLA", "Service level agreement")
+    assert store.lookup("SLO") is None  # too short for fuzzy matching
+    assert store.lookup_query("what is SLA?").entry.term == "SLA"
+    assert store.lookup_query("how to negotiate an SLA with vendors") is None
+    assert store.stats()["searches_avoided"] == 1
+
+
+def test_known_terms_keep_their_definition(tmp_path):
+    store = GlossaryStore(str(tmp_path / "glossary.json"))
+    assert store.harvest(RUN_OUTPUT, meeting="a") == 3
+    assert store.harvest("- **SLA**: Something else [x](https://c.example)", "b") == 0
+    entry = store.lookup("SLA").entry
+    assert entry.definition == "A commitment on uptime."
+    assert entry.sources == ["https://en.wikipedia.org/wiki/SLA", "https://c.example"]
+    assert entry.meetings == 2
+
+    reloaded = GlossaryStore(store.path)
+    assert len(reloaded) == 3
+
+
+def _add_terms(path: str, prefix: str) -> None:
+    store = GlossaryStore(path)
+    for i in range(30):
+        store.add(f"{prefix}{i}", f"definition {i}")
+
+
+def test_concurrent_processes_keep_each_others_terms(tmp_path):
+    path = str(tmp_path / "glossary.json")
+    processes = [
+        multiprocessing.Process(target=_add_terms, args=(path, prefix))
+        for prefix in ("alpha", "beta")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert len(GlossaryStore(path)) == 60
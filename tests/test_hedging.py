@@ -0,0 +1,160 @@
+"""
+Hedged requests (crew_agents.hedging) and how CachedLLM sends and accounts for
+them.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import crewai.llm
+import pytest
+from crewai import Agent
+from crewai.agents.agent_builder.utilities.base_token_process import TokenProcess
+from crewai.utilities.events import (
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+    crewai_event_bus,
+)
+from crewai.utilities.token_counter_callback import TokenCalcHandler
+
+from crew_agents import hedging
+from crew_agents.hedging import HedgeCancelled, HedgePolicy
+from crew_agents.llm_cache import CachedLLM
+from crew_agents.rate_limit import RateLimiter
+
+
+def _warm_policy(**kwargs) -> HedgePolicy:
+    policy = HedgePolicy(percentile=0.5, min_samples=5, min_delay=0.05, **kwargs)
+    for _ in range(5):
+        policy.observe(0.05)
+    return policy
+
+
+def test_success_wins_when_both_attempts_finish_together(monkeypatch):
+    def wait_for_both(futures, timeout=None, return_when=FIRST_COMPLETED):
+        if timeout is not None:
+            return wait(futures, timeout=timeout)
+        done, _ = wait(futures, return_when="ALL_COMPLETED")
+        # The failed attempt comes first, as a set may iterate it
+        failed_first = sorted(done, key=lambda future: future.exception() is None)
+        return failed_first, set()
+
+    monkeypatch.setattr(hedging, "wait", wait_for_both)
+    calls = []
+
+    def attempt(cancelled):
+        calls.append(cancelled)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            raise RuntimeError("primary failed")
+        return "hedge answer"
+
+    policy = _warm_policy(budget=1.0)
+    assert policy.run(attempt) == "hedge answer"
+    assert policy.stats()["hedge_wins"] == 1
+
+
+def test_error_raised_once_both_attempts_failed():
+    def attempt(cancelled):
+        time.sleep(0.1)
+        raise RuntimeError("model down")
+
+    with pytest.raises(RuntimeError, match="model down"):
+        _warm_policy(budget=1.0).run(attempt)
+
+
+def test_hedges_stay_within_budget():
+    policy = _warm_policy(budget=0.25)
+
+    def attempt(cancelled):
+        time.sleep(0.1)
+        return "ok"
+
+    for _ in range(8):
+        policy.run(attempt)
+    stats = policy.stats()
+    assert stats["hedges"] == 2
+    assert stats["budget_denied"] == 6
+
+
+def _llm(monkeypatch, answer=lambda call: "ok", **kwargs) -> CachedLLM:
+    calls = []
+
+    def completion(*args, **kw):
+        calls.append(kw)
+        kw.pop("stream", None)
+        return original(*args, **{**kw, "mock_response": answer(len(calls))})
+
+    original = crewai.llm.litellm.completion
+    monkeypatch.setattr(crewai.llm.litellm, "completion", completion)
+    kwargs.setdefault("rate_limiter", None)
+    kwargs.setdefault("hedge_policy", None)
+    llm = CachedLLM(model="gemini/gemini-2.0-flash", cache_enabled=False, **kwargs)
+    llm.completions = calls
+    return llm
+
+
+def test_cancelled_attempt_refunds_rate_limiter(monkeypatch):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=100_000)
+    llm = _llm(monkeypatch, rate_limiter=limiter)
+    cancelled = threading.Event()
+    cancelled.set()
+
+    args = ("Hello", None, None, None, None, None)
+    with pytest.raises(HedgeCancelled):
+        llm._limited_call(args, cancelled)
+
+    stats = limiter.stats()
+    assert stats["requests"] == 0
+    assert stats["tokens"] == 0
+    assert llm.completions == []
+    assert limiter._requests == pytest.approx(60, abs=0.1)
+    assert limiter._tokens == pytest.approx(100_000, abs=10)
+
+
+def test_observed_latency_excludes_rate_limiter_wait(monkeypatch):
+    limiter = RateLimiter()
+    limiter.record_rate_limited(0.3)
+    policy = HedgePolicy()
+    llm = _llm(monkeypatch, rate_limiter=limiter, hedge_policy=policy)
+
+    start = time.perf_counter()
+    llm.call("Hello")
+    assert time.perf_counter() - start >= 0.3
+    assert len(policy._latencies) == 1
+    assert policy._latencies[0] < 0.25
+
+
+def test_hedged_call_is_reported_once(monkeypatch):
+    policy = _warm_policy(budget=1.0)
+
+    def answer(call):
+        if call == 1:
+            time.sleep(0.3)  # the primary stalls, so the hedge is sent
+        return f"answer {call}"
+
+    llm = _llm(monkeypatch, answer, hedge_policy=policy)
+    agent = Agent(role="Summarizer", goal="Summarize", backstory="-", llm=llm)
+    tokens = TokenProcess()
+    events = []
+    with crewai_event_bus.scoped_handlers():
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def started(source, event):
+            if str(event.agent_id) == str(agent.id):
+                events.append("started")
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def completed(source, event):
+            if str(event.agent_id) == str(agent.id):
+                events.append(("completed", event.response))
+
+        callbacks = [TokenCalcHandler(tokens)]
+        response = llm.call("Hello", callbacks=callbacks, from_agent=agent)
+
+    # Attempts are sent without the agent, so only the hedged call is attributed
+    assert len(llm.completions) == 2
+    assert response == "answer 2"
+    assert events == ["started", ("completed", "answer 2")]
+    assert tokens.get_summary().successful_requests == 1
@@ -0,0 +1,87 @@
+"""
+RunRecorder task queue times and LLM retry counts (crew_agents.instrumentation).
+"""
+
+import time
+from types import SimpleNamespace
+
+import crewai.llm
+import litellm
+from crewai import Agent
+from crewai.utilities.events import crewai_event_bus
+
+from crew_agents.instrumentation import RunRecorder
+from crew_agents.llm_cache import CachedLLM, LLMRetryEvent
+from crew_agents.rate_limit import RateLimiter
+
+MODEL = "gemini/gemini-2.0-flash"
+
+
+def _task(name: str, context=None):
+    agent = SimpleNamespace(role="Summarizer")
+    return SimpleNamespace(id=name, name=name, agent=agent, context=context)
+
+
+def test_queue_time_runs_from_dependencies_not_run_start():
+    recorder = RunRecorder("sequential")
+    time.sleep(0.2)  # waiting for a crew is the run's queue time, not a task's
+    first, second, third = _task("first"), _task("second"), _task("third")
+    third.context = [first]
+    recorder.attach([], [first, second, third])
+
+    recorder._on_task_started(first)
+    time.sleep(0.1)
+    recorder._on_task_finished(first, "completed")
+    recorder._on_task_started(second)
+    time.sleep(0.1)
+    recorder._on_task_finished(second, "completed")
+    recorder._on_task_started(third)
+    recorder._on_task_finished(third, "completed")
+
+    tasks = recorder.report()["tasks"]
+    assert tasks["first"]["queue_seconds"] < 0.05
+    assert tasks["second"]["queue_seconds"] < 0.05
+    # third only needed first, which finished while second ran
+    assert 0.1 <= tasks["third"]["queue_seconds"] < 0.2
+
+
+def test_rate_limit_retries_are_not_failures(monkeypatch):
+    original = crewai.llm.litellm.completion
+    calls = []
+
+    def completion(*args, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise litellm.RateLimitError("RESOURCE_EXHAUSTED", "gemini", MODEL)
+        kwargs.pop("stream", None)
+        return original(*args, **{**kwargs, "mock_response": "Notes."})
+
+    monkeypatch.setattr(crewai.llm.litellm, "completion", completion)
+    limiter = RateLimiter(default_backoff=0.01)
+    llm = CachedLLM(
+        model=MODEL, cache_enabled=False, rate_limiter=limiter, hedge_policy=None
+    )
+    agent = Agent(role="Summarizer", goal="Summarize", backstory="-", llm=llm)
+    recorder = RunRecorder("sequential")
+    recorder.attach([agent], [])
+
+    assert llm.call("Hello", from_agent=agent) == "Notes."
+
+    stats = recorder.finish()["agents"]["Summarizer"]
+    assert len(calls) == 2
+    assert stats["llm_calls"] == 1
+    assert stats["llm_retries"] == 1
+    assert stats["llm_failures"] == 0
+
+
+def test_retries_of_keyed_calls_outside_agents_are_counted():
+    recorder = RunRecorder("map_reduce")
+    with recorder.llm_call("map_reduce:map", "map_reduce:run-1"):
+        crewai_event_bus.emit(
+            None,
+            event=LLMRetryEvent(
+                error="429", pause_seconds=0.0, fairness_key="map_reduce:run-1"
+            ),
+        )
+    report = recorder.finish()
+    assert report["agents"]["map_reduce:map"]["llm_retries"] == 1
@@ -0,0 +1,153 @@
+import json
+import threading
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+from google.cloud import speech
+from google.longrunning import operations_pb2
+
+from scripts import clients, jobs
+from scripts.jobs import DONE, FAILED, Recognition, TranscriptionJobManager
+
+
+class FakeOperations:
+    """Operations that finish after `polls` get_operation calls each."""
+
+    def __init__(self, polls: int = 1, error: Exception = None):
+        self.polls = polls
+        self.error = error
+        self.calls = {}
+
+    def get_operation(self, name):
+        if self.error is not None:
+            raise self.error
+        self.calls[name] = self.calls.get(name, 0) + 1
+        operation = operations_pb2.Operation(name=name)
+        if self.calls[name] >= self.polls:
+            operation.done = True
+            response = speech.LongRunningRecognizeResponse()
+            operation.response.Pack(speech.LongRunningRecognizeResponse.pb(response))
+        return operation
+
+
+class FakeSpeechClient:
+    def __init__(self, operations: FakeOperations):
+        self.transport = type("Transport", (), {"operations_client": operations})()
+        self.started = 0
+
+    def long_running_recognize(self, config, audio):
+        self.started += 1
+        name = f"operations/{self.started}"
+        return type("Future", (), {"operation": operations_pb2.Operation(name=name)})()
+
+
+@pytest.fixture
+def speech_client(monkeypatch):
+    def install(operations: FakeOperations) -> FakeSpeechClient:
+        client = FakeSpeechClient(operations)
+        monkeypatch.setattr(clients, "get_speech_client", lambda: client)
+        return client
+
+    return install
+
+
+def _manager(tmp_path, **kwargs) -> TranscriptionJobManager:
+    kwargs.setdefault("initial_interval", 0.01)
+    kwargs.setdefault("max_interval", 0.02)
+    return TranscriptionJobManager(state_path=str(tmp_path / "jobs.json"), **kwargs)
+
+
+def test_submit_returns_before_preparation_finishes(tmp_path, speech_client):
+    speech_client(FakeOperations())
+    manager = _manager(tmp_path, result_handler=lambda metadata, _: metadata["key"])
+    release = threading.Event()
+
+    def prepare(metadata):
+        release.wait(5)
+        metadata["key"] = "abc"
+        return Recognition(config=None, audio=None)
+
+    job = manager.submit(prepare)
+    assert not job.done and job.operation_name is None
+    release.set()
+    assert job.wait(5)
+    assert (job.status, job.result) == (DONE, "abc")
+
+
+def test_prepare_can_return_the_result(tmp_path, speech_client):
+    client = speech_client(FakeOperations())
+    job = _manager(tmp_path).submit(lambda metadata: "cached transcript")
+    assert job.wait(5)
+    assert (job.status, job.result) == (DONE, "cached transcript")
+    assert client.started == 0
+
+
+def test_failed_preparation_fails_the_job(tmp_path, speech_client):
+    speech_client(FakeOperations())
+
+    def prepare(metadata):
+        raise RuntimeError("ffmpeg failed")
+
+    job = _manager(tmp_path).submit(prepare)
+    assert job.wait(5)
+    assert (job.status, job.error) == (FAILED, "ffmpeg failed")
+
+
+def test_slow_result_handler_does_not_stall_polling(tmp_path, speech_client):
+    speech_client(FakeOperations())
+    release = threading.Event()
+
+    def result_handler(metadata, response):
+        if metadata["slow"]:
+            release.wait(5)
+        return metadata["slow"]
+
+    manager = _manager(tmp_path, result_handler=result_handler)
+    slow = manager.submit(lambda m: Recognition(None, None), {"slow": True})
+    fast = manager.submit(lambda m: Recognition(None, None), {"slow": False})
+    assert fast.wait(5) and not slow.done
+    release.set()
+    assert slow.wait(5)
+
+
+def test_non_retryable_poll_error_fails_the_job(tmp_path, speech_client):
+    speech_client(FakeOperations(error=google_exceptions.NotFound("expired")))
+    job = _manager(tmp_path).track("operations/expired")
+    assert job.wait(5)
+    assert job.status == FAILED and "expired" in job.error
+
+
+def test_repeated_poll_errors_fail_the_job(tmp_path, speech_client):
+    speech_client(FakeOperations(error=RuntimeError("unavailable")))
+    job = _manager(tmp_path, max_poll_failures=3).track("operations/1")
+    assert job.wait(5)
+    assert (job.status, job.polls) == (FAILED, 3)
+
+
+def test_state_file_keeps_other_processes_jobs(tmp_path, speech_client):
+    speech_client(FakeOperations(polls=10**6))
+    first = _manager(tmp_path, initial_interval=100)
+    second = _manager(tmp_path, initial_interval=100)
+    first.track("operations/a")
+    second.track("operations/b")
+    with open(tmp_path / "jobs.json") as f:
+        saved = json.load(f)
+    assert sorted(entry["operation_name"] for entry in saved) == [
+        "operations/a",
+        "operations/b",
+    ]
+
+
+def test_resume_skips_jobs_of_live_processes(tmp_path, speech_client, monkeypatch):
+    speech_client(FakeOperations(polls=10**6))
+    monkeypatch.setattr(jobs, "_process_alive", lambda pid: pid == 1)
+    with open(tmp_path / "jobs.json", "w") as f:
+        json.dump(
+            [
+                {"id": "live", "operation_name": "operations/live", "pid": 1},
+                {"id": "dead", "operation_name": "operations/dead", "pid": 2},
+            ],
+            f,
+        )
+    resumed = _manager(tmp_path, initial_interval=100).resume()
+    assert [job.id for job in resumed] == ["dead"]
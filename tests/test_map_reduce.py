@@ -0,0 +1,61 @@
+"""
+map_reduce_summary: chunking and the rate limiter queue its calls share.
+"""
+
+import crewai.llm
+
+from crew_agents.llm_cache import CachedLLM
+from crew_agents.map_reduce import chunk_transcript, map_reduce_summary
+from crew_agents.rate_limit import RateLimiter
+
+MODEL = "gemini/gemini-2.0-flash"
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__()
+        self.keys = []
+
+    def acquire(self, tokens: int, key: str = "default") -> float:
+        self.keys.append(key)
+        return super().acquire(tokens, key)
+
+
+def test_chunks_keep_sentences_within_budget():
+    text = " ".join(f"Sentence number {i} is here." for i in range(200))
+    chunks = chunk_transcript(text, 100, MODEL)
+    assert len(chunks) > 1
+    assert " ".join(chunks) == text
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_long_unpunctuated_sentence_is_split():
+    text = " ".join(f"word{i}" for i in range(1000))
+    chunks = chunk_transcript(text, 100, MODEL)
+    assert len(chunks) > 1
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_each_run_has_its_own_rate_limiter_queue(monkeypatch):
+    original = crewai.llm.litellm.completion
+
+    def completion(*args, **kwargs):
+        kwargs.pop("stream", None)
+        return original(*args, **{**kwargs, "mock_response": "Notes."})
+
+    monkeypatch.setattr(crewai.llm.litellm, "completion", completion)
+    limiter = RecordingLimiter()
+    llm = CachedLLM(
+        model=MODEL, cache_enabled=False, rate_limiter=limiter, hedge_policy=None
+    )
+    transcript = " ".join(f"Point {i} was discussed." for i in range(100))
+
+    map_reduce_summary(transcript, llm, max_chunk_tokens=100)
+    first = set(limiter.keys)
+    limiter.keys.clear()
+    map_reduce_summary(transcript, llm, max_chunk_tokens=100)
+    second = set(limiter.keys)
+
+    assert len(first) == 1 and len(second) == 1
+    assert first != second
+    assert "direct" not in first | second
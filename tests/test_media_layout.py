@@ -0,0 +1,67 @@
+"""
+MP4 layout probing before a GCS video is piped through ffmpeg
+(scripts.utils.mp4_moov_at_end).
+"""
+
+import struct
+
+from scripts.utils import MAX_MP4_BOXES, mp4_moov_at_end
+
+
+def _box(kind: bytes, payload_bytes: int) -> bytes:
+    return struct.pack(">I4s", 8 + payload_bytes, kind) + b"\0" * payload_bytes
+
+
+def _large_box(kind: bytes, payload_bytes: int) -> bytes:
+    header = struct.pack(">I4sQ", 1, kind, 16 + payload_bytes)
+    return header + b"\0" * payload_bytes
+
+
+class FakeBlob:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.size = None
+        self.ranges = []
+
+    def reload(self):
+        self.size = len(self.data)
+
+    def download_as_bytes(self, start: int, end: int) -> bytes:
+        self.ranges.append((start, end))
+        return self.data[start : end + 1]
+
+
+def test_moov_before_mdat_is_streamable():
+    blob = FakeBlob(_box(b"ftyp", 16) + _box(b"moov", 500) + _box(b"mdat", 5000))
+    assert not mp4_moov_at_end(blob)
+
+
+def test_moov_after_mdat_is_detected_with_header_reads_only():
+    blob = FakeBlob(
+        _box(b"ftyp", 16)
+        + _box(b"free", 8)
+        + _box(b"mdat", 50_000)
+        + _box(b"moov", 500)
+    )
+    assert mp4_moov_at_end(blob)
+    assert len(blob.ranges) == 3
+    assert all(end - start < 16 for start, end in blob.ranges)
+
+
+def test_64_bit_box_sizes_are_followed():
+    blob = FakeBlob(
+        _box(b"ftyp", 16) + _large_box(b"free", 100) + _box(b"mdat", 10) + b"moov"
+    )
+    assert mp4_moov_at_end(blob)
+
+
+def test_other_containers_are_left_to_ffmpeg():
+    webm = b"\x1a\x45\xdf\xa3" + b"\0" * 100
+    assert not mp4_moov_at_end(FakeBlob(webm))
+    assert not mp4_moov_at_end(FakeBlob(b""))
+
+
+def test_walk_is_bounded():
+    blob = FakeBlob(_box(b"ftyp", 0) * (MAX_MP4_BOXES + 5) + _box(b"mdat", 10))
+    assert not mp4_moov_at_end(blob)
+    assert len(blob.ranges) == MAX_MP4_BOXES
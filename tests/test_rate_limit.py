@@ -0,0 +1,97 @@
+"""
+The adaptive, fair-queued rate limiter (crew_agents.rate_limit).
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from crew_agents.rate_limit import RateLimiter, is_rate_limit_error, retry_after_seconds
+
+
+class QuotaError(Exception):
+    status_code = 429
+
+
+def test_rate_limit_errors_are_recognized():
+    assert is_rate_limit_error(QuotaError())
+    assert is_rate_limit_error(RuntimeError("429 RESOURCE_EXHAUSTED"))
+    assert not is_rate_limit_error(RuntimeError("500 internal error"))
+
+
+def test_retry_after_from_header_or_message():
+    error = QuotaError()
+    error.response = SimpleNamespace(headers={"retry-after": "7"})
+    assert retry_after_seconds(error) == 7.0
+    assert retry_after_seconds(RuntimeError('"retryDelay": "12s"')) == 12.0
+    assert retry_after_seconds(RuntimeError("quota exceeded")) is None
+
+
+def test_requests_are_paced_once_the_bucket_is_empty():
+    limiter = RateLimiter(requests_per_minute=600)
+    limiter._requests = 0.0
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire(10)
+    assert time.monotonic() - start == pytest.approx(0.3, abs=0.1)
+    assert limiter.stats()["requests"] == 3
+
+
+def test_runs_are_served_round_robin():
+    limiter = RateLimiter(requests_per_minute=1200)
+    limiter._requests = 0.0
+    order = []
+
+    def request(key):
+        limiter.acquire(10, key)
+        order.append(key)
+
+    threads = []
+    for key, count in (("a", 4), ("b", 2)):
+        for _ in range(count):
+            threads.append(threading.Thread(target=request, args=(key,)))
+            threads[-1].start()
+        while limiter.queue_depth() < len(threads):
+            time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["a", "b", "a", "b", "a", "a"]
+
+
+def test_429_halves_the_rate_and_successes_recover_it():
+    limiter = RateLimiter(recovery_step=0.25)
+    assert limiter.record_rate_limited(retry_after=0.2) == 0.2
+    assert limiter.stats()["rate_factor"] == 0.5
+
+    start = time.monotonic()
+    limiter.acquire(10)
+    assert time.monotonic() - start >= 0.15  # everyone waits out the pause
+
+    limiter.record_success(10, 10)
+    limiter.record_success(10, 10)
+    limiter.record_success(10, 10)
+    assert limiter.stats()["rate_factor"] == 1.0
+
+
+def test_release_refunds_an_unsent_request():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=10_000)
+    limiter.acquire(400)
+    limiter.release(400)
+    stats = limiter.stats()
+    assert stats["requests"] == 0
+    assert stats["tokens"] == 0
+    assert limiter._tokens == pytest.approx(10_000, abs=1)
+
+
+def test_wait_histogram_is_exported():
+    limiter = RateLimiter()
+    limiter.acquire(10)
+    samples = {
+        (name, labels.get("le")): value for name, _, labels, value in limiter.samples()
+    }
+    assert samples[("meetingmind_llm_ratelimit_wait_seconds_bucket", "0.1")] == 1
+    assert samples[("meetingmind_llm_ratelimit_wait_seconds_bucket", "+Inf")] == 1
+    assert samples[("meetingmind_llm_ratelimit_requests_total", None)] == 1
@@ -0,0 +1,62 @@
+"""
+Transcript chunking and BM25 retrieval (crew_agents.retrieval).
+"""
+
+from crew_agents.retrieval import (
+    TranscriptIndex,
+    build_index,
+    chunk_spans,
+    sentence_spans,
+    terms,
+)
+
+MEETING = " ".join(
+    [f"Item {i} covered routine status updates from the team." for i in range(40)]
+    + ["Priya will migrate the billing database to Postgres by March."]
+    + [f"Item {i} covered more routine updates." for i in range(40, 60)]
+)
+
+
+def test_terms_drop_stopwords_and_single_letters():
+    assert terms("We will ship the new API in Q3, a big win!") == [
+        "ship",
+        "new",
+        "api",
+        "q3",
+        "big",
+        "win",
+    ]
+
+
+def test_sentence_spans_split_only_long_sentences():
+    text = "Short one. " + " ".join(["word"] * 25)
+    spans = sentence_spans(text, max_words=10)
+    assert spans[0] == (0, 10, 2)
+    assert [words for _, _, words in spans[1:]] == [9, 9, 7]
+    assert text[spans[-1][0] : spans[-1][1]].split() == ["word"] * 7
+
+
+def test_chunks_cover_the_text_and_overlap():
+    spans = chunk_spans(MEETING, chunk_words=60, overlap_words=20)
+    assert spans[0][0] == 0
+    assert spans[-1][1] == len(MEETING)
+    for (_, end), (next_start, _) in zip(spans, spans[1:]):
+        assert next_start < end  # consecutive chunks share sentences
+
+
+def test_search_ranks_the_matching_passage_first():
+    index = TranscriptIndex(MEETING, chunk_words=60, overlap_words=20)
+    passages = index.search("billing database migration", top_k=3)
+    assert passages
+    assert "billing database" in passages[0].text
+    assert MEETING[passages[0].start : passages[0].end].strip() == passages[0].text
+    assert all(a.score >= b.score for a, b in zip(passages, passages[1:]))
+
+
+def test_unknown_terms_and_empty_transcripts_return_nothing():
+    assert TranscriptIndex(MEETING).search("kubernetes") == []
+    assert TranscriptIndex("").search("billing") == []
+
+
+def test_build_index_defaults_to_bm25_only():
+    assert build_index(MEETING)._collection is None
@@ -0,0 +1,92 @@
+"""
+The columnar Transcript (scripts.transcript).
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+from scripts.transcript import TimedSegment, Transcript, Word, words_from_text
+
+
+def _transcript() -> Transcript:
+    return Transcript.from_segments(
+        [
+            TimedSegment(
+                [Word("Hello", 0.0, 0.4, 0.9), Word("everyone.", 0.5, 1.0, 0.8)],
+                0.0,
+                1.0,
+            ),
+            TimedSegment([], 1.0, 1.5),  # no words, dropped
+            TimedSegment(
+                [
+                    Word("Café", 2.0, 2.4, 0.7, speaker=2),
+                    Word("opens", 2.5, 2.9),
+                    Word("soon.", 3.0, 3.5),
+                ],
+                2.0,
+                3.5,
+            ),
+        ]
+    )
+
+
+def test_words_and_segments():
+    transcript = _transcript()
+    assert len(transcript) == 5
+    assert transcript.num_segments == 2
+    assert transcript.text == "Hello everyone. Café opens soon."
+    assert transcript.segments() == ["Hello everyone.", "Café opens soon."]
+    word = transcript.word(2)
+    assert (word.text, word.speaker) == ("Café", 2)
+    assert word.confidence == pytest.approx(0.7)
+
+
+def test_time_lookups():
+    transcript = _transcript()
+    assert transcript.segment_at(-1.0) == -1
+    assert transcript.segment_at(0.7) == 0
+    assert transcript.segment_at(2.0) == 1
+    assert transcript.word_at(2.6) == 3
+
+
+def test_slice_keeps_words_starting_in_range():
+    part = _transcript().slice(0.5, 2.6)
+    assert part.text == "everyone. Café opens"
+    assert part.segments() == ["everyone.", "Café opens"]
+    assert part.segment_start.tolist() == pytest.approx([0.5, 2.0])
+    assert part.segment_end.tolist() == pytest.approx([1.0, 2.6])
+    assert _transcript().slice(10, 20).text == ""
+
+
+def test_map_times():
+    shifted = _transcript().map_times(lambda t: np.asarray(t) + 10)
+    assert shifted.word(0).start_seconds == pytest.approx(10.0)
+    assert shifted.segment_end.tolist() == pytest.approx([11.0, 13.5])
+    assert shifted.text == _transcript().text
+
+
+def test_npz_round_trip():
+    transcript = _transcript()
+    restored = Transcript.from_bytes(transcript.to_bytes())
+    assert restored.text == transcript.text
+    assert restored.segments() == transcript.segments()
+    assert restored.word(2) == transcript.word(2)
+
+
+def test_unknown_npz_version_is_rejected():
+    transcript = _transcript()
+    data = dict(np.load(io.BytesIO(transcript.to_bytes())))
+    data["version"] = np.array(99)
+    patched = io.BytesIO()
+    np.savez(patched, **data)
+    with pytest.raises(ValueError, match="Unsupported transcript version"):
+        Transcript.from_bytes(patched.getvalue())
+
+
+def test_words_from_text_spreads_times_evenly():
+    words = words_from_text("one two three four", 0.0, 2.0)
+    assert [w.start_seconds for w in words] == pytest.approx([0.0, 0.5, 1.0, 1.5])
+    assert words[-1].end_seconds == pytest.approx(2.0)
+    assert words_from_text("   ", 0.0, 1.0) == []
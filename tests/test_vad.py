@@ -0,0 +1,66 @@
+"""
+Silence trimming (scripts.vad), in memory and streamed.
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+from scripts.vad import OffsetMap, speech_frames, trim_silence, trim_silence_stream
+
+RATE = 16000
+
+
+def _meeting(seconds: float, speech_every: float = 5.0, speech_for: float = 2.0):
+    """Tone bursts of `speech_for` seconds every `speech_every` seconds, over noise."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    noise = np.random.default_rng(0).normal(0, 30, len(t))
+    tone = np.sin(2 * np.pi * 220 * t) * 8000 * ((t % speech_every) < speech_for)
+    return (noise + tone).astype(np.int16)
+
+
+def _chunks(pcm: np.ndarray, chunk_bytes: int):
+    data = pcm.tobytes()
+    return [data[i : i + chunk_bytes] for i in range(0, len(data), chunk_bytes)]
+
+
+def test_speech_frames_follow_the_bursts():
+    speech = speech_frames(_meeting(10), RATE)
+    frame_seconds = 0.03
+    assert speech[int(1.0 / frame_seconds)]
+    assert not speech[int(3.5 / frame_seconds)]
+
+
+def test_long_silences_are_compressed_and_mapped_back():
+    pcm = _meeting(20)
+    trimmed, offset_map = trim_silence(pcm, RATE)
+    assert len(trimmed) < 0.7 * len(pcm)
+    # Each burst starts a kept span at its original time (minus the padding)
+    assert offset_map.original_starts[1] == pytest.approx(4.8, abs=0.05)
+    assert offset_map.to_original(0.5) == pytest.approx(0.5)
+    later = offset_map.trimmed_starts[2] + 1.0
+    assert offset_map.to_original(later) == pytest.approx(
+        offset_map.original_starts[2] + 1.0
+    )
+
+
+def test_offset_map_round_trips_through_dict():
+    offset_map = OffsetMap(np.array([0.0, 2.5]), np.array([0.0, 10.0]))
+    restored = OffsetMap.from_dict(offset_map.to_dict())
+    times = np.array([1.0, 3.0])
+    assert np.allclose(restored.to_original(times), [1.0, 10.5])
+
+
+@pytest.mark.parametrize("seconds", [0, 0.005, 0.15, 3.0107, 31])
+@pytest.mark.parametrize("chunk_bytes", [3200, 4099])
+def test_stream_matches_in_memory_trim(seconds, chunk_bytes):
+    pcm = _meeting(seconds)
+    expected, expected_map = trim_silence(pcm, RATE)
+
+    output = io.BytesIO()
+    offset_map = trim_silence_stream(_chunks(pcm, chunk_bytes), RATE, output)
+
+    assert np.array_equal(np.frombuffer(output.getvalue(), np.int16), expected)
+    assert np.allclose(offset_map.trimmed_starts, expected_map.trimmed_starts)
+    assert np.allclose(offset_map.original_starts, expected_map.original_starts)